@@ -31,16 +31,27 @@ import os
 from gymnasium.envs.registration import register
 
 # Exporting envs:
+from flappy_bird_gymnasium.envs.flappy_bird_async_vector_env import (
+    FlappyBirdAsyncVectorEnv,
+)
 from flappy_bird_gymnasium.envs.flappy_bird_env import FlappyBirdEnv
+from flappy_bird_gymnasium.envs.flappy_bird_threaded_vector_env import (
+    FlappyBirdThreadedVectorEnv,
+)
+from flappy_bird_gymnasium.envs.flappy_bird_vector_env import FlappyBirdVectorEnv
 
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
 
 register(
     id="FlappyBird-v0",
     entry_point="flappy_bird_gymnasium:FlappyBirdEnv",
+    vector_entry_point="flappy_bird_gymnasium:FlappyBirdVectorEnv",
 )
 
 # Main names:
 __all__ = [
+    FlappyBirdAsyncVectorEnv.__name__,
     FlappyBirdEnv.__name__,
+    FlappyBirdThreadedVectorEnv.__name__,
+    FlappyBirdVectorEnv.__name__,
 ]
@@ -0,0 +1,179 @@
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""Benchmarks the vector environments for each type of observation.
+
+Compares, in environment steps per second, gymnasium's synchronous and
+asynchronous (multiprocess) vector environments wrapping :class:`FlappyBirdEnv`
+with the natively vectorized, multiprocess and multithreaded Flappy Bird vector
+environments:
+
+    python -m flappy_bird_gymnasium.benchmark --num-envs 64 --steps 200
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import gymnasium
+import numpy as np
+
+from flappy_bird_gymnasium.envs.flappy_bird_async_vector_env import (
+    FlappyBirdAsyncVectorEnv,
+)
+from flappy_bird_gymnasium.envs.flappy_bird_env import FlappyBirdEnv
+from flappy_bird_gymnasium.envs.flappy_bird_threaded_vector_env import (
+    FlappyBirdThreadedVectorEnv,
+)
+from flappy_bird_gymnasium.envs.flappy_bird_vector_env import FlappyBirdVectorEnv
+
+#: Arguments of the environments, by type of observation.
+OBSERVATIONS: Dict[str, Dict[str, Any]] = {
+    "features": {},
+    "lidar": {"use_lidar": True},
+    "pixels": {"use_pixels": True, "pixels_size": (84, 84), "pixels_grayscale": True},
+}
+
+
+def _sync(num_envs: int, num_workers: int, **kwargs):
+    return gymnasium.vector.SyncVectorEnv(
+        [lambda: FlappyBirdEnv(**kwargs) for _ in range(num_envs)]
+    )
+
+
+def _async(num_envs: int, num_workers: int, **kwargs):
+    return gymnasium.vector.AsyncVectorEnv(
+        [lambda: FlappyBirdEnv(**kwargs) for _ in range(num_envs)], shared_memory=True
+    )
+
+
+def _native(num_envs: int, num_workers: int, **kwargs):
+    if kwargs.get("use_pixels", False):
+        return None  # pixel observations aren't natively vectorized
+    return FlappyBirdVectorEnv(num_envs, **kwargs)
+
+
+def _processes(num_envs: int, num_workers: int, **kwargs):
+    return FlappyBirdAsyncVectorEnv(num_envs, num_workers=num_workers, **kwargs)
+
+
+def _threads(num_envs: int, num_workers: int, **kwargs):
+    return FlappyBirdThreadedVectorEnv(num_envs, num_threads=num_workers, **kwargs)
+
+
+#: Constructors of the benchmarked vector environments, by name.
+VECTOR_ENVS: Dict[str, Callable[..., Optional[gymnasium.vector.VectorEnv]]] = {
+    "sync": _sync,
+    "async": _async,
+    "native": _native,
+    "processes": _processes,
+    "threads": _threads,
+}
+
+
+def measure(envs: gymnasium.vector.VectorEnv, steps: int, seed: int = 0) -> float:
+    """Returns the number of environment steps per second of a vector
+    environment, stepped with random actions.
+
+    Args:
+        envs (gymnasium.vector.VectorEnv): The vector environment.
+        steps (int): Number of steps measured, after a few warm-up steps.
+        seed (int): Seed of the environment and of the actions.
+    """
+    rng = np.random.default_rng(seed)
+    actions = (rng.random((steps + 5, envs.num_envs)) < 0.1).astype(np.int64)
+    envs.reset(seed=seed)
+    for step_actions in actions[:5]:
+        envs.step(step_actions)
+
+    start = time.perf_counter()
+    for step_actions in actions[5:]:
+        envs.step(step_actions)
+    return steps * envs.num_envs / (time.perf_counter() - start)
+
+
+def run(
+    num_envs: int = 16,
+    steps: int = 100,
+    num_workers: Optional[int] = None,
+    observations: Optional[List[str]] = None,
+    vector_envs: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, float]]:
+    """Benchmarks the vector environments, and prints a table of the results.
+
+    Args:
+        num_envs (int): Number of sub-environments.
+        steps (int): Number of steps measured.
+        num_workers (Optional[int]): Number of processes or threads of the
+            parallel vector environments. Defaults to the number of CPUs.
+        observations (Optional[List[str]]): The types of observations, from
+            :data:`OBSERVATIONS`. Defaults to all of them.
+        vector_envs (Optional[List[str]]): The vector environments, from
+            :data:`VECTOR_ENVS`. Defaults to all of them.
+
+    Returns:
+        The steps per second, by type of observation and vector environment.
+    """
+    observations = observations or list(OBSERVATIONS)
+    vector_envs = vector_envs or list(VECTOR_ENVS)
+    print(f"{num_envs} environments, {steps} steps (environment steps per second)")
+    print(f"{'':>10}" + "".join(f"{name:>12}" for name in vector_envs))
+
+    results = {}
+    for obs_type in observations:
+        results[obs_type] = {}
+        row = f"{obs_type:>10}"
+        for name in vector_envs:
+            envs = VECTOR_ENVS[name](num_envs, num_workers, **OBSERVATIONS[obs_type])
+            if envs is None:
+                row += f"{'-':>12}"
+                continue
+            try:
+                results[obs_type][name] = measure(envs, steps)
+            finally:
+                envs.close()
+            row += f"{results[obs_type][name]:>12.0f}"
+        print(row, flush=True)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-envs", type=int, default=16)
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=None,
+        help="Number of processes or threads (defaults to the number of CPUs).",
+    )
+    parser.add_argument("--obs", nargs="+", choices=list(OBSERVATIONS), default=None)
+    parser.add_argument(
+        "--vector-envs", nargs="+", choices=list(VECTOR_ENVS), default=None
+    )
+    args = parser.parse_args(argv)
+    run(args.num_envs, args.steps, args.num_workers, args.obs, args.vector_envs)
+
+
+if __name__ == "__main__":
+    main()
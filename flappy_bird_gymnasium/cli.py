@@ -22,55 +22,192 @@
 # SOFTWARE.
 # ==============================================================================
 
-""" Handles the initialization of the game through the command line interface.
-"""
+"""Handles the initialization of the game through the command line interface."""
 
 import argparse
+import functools
+import importlib.abc
+import sys
 import time
+from typing import Callable, Dict, List, NamedTuple, Optional
 
-import gymnasium
-import pygame
 
-import flappy_bird_gymnasium
-from flappy_bird_gymnasium.tests.test_dqn import play as dqn_agent_env
-from flappy_bird_gymnasium.tests.test_human import play as human_agent_env
-from flappy_bird_gymnasium.tests.test_random import play as random_agent_env
+class _Mode(NamedTuple):
+    load: Callable[[argparse.Namespace], Callable[[], None]]
+    help: str
 
 
-def _get_args():
+#: Execution modes of the CLI, by name.
+_MODES: Dict[str, _Mode] = {}
+
+
+def register_mode(name: str, help: str = "") -> Callable:
+    """Decorator registering an execution mode of the CLI.
+
+    The decorated function receives the parsed command line arguments. It must
+    import whatever the mode needs and return a callable that runs the mode.
+    Modes are only loaded when selected, so a mode's dependencies are never
+    imported by the other modes.
+
+    Args:
+        name (str): Name of the mode, as passed to `--mode`.
+        help (str): Short description of the mode.
+    """
+
+    def decorator(load):
+        _MODES[name] = _Mode(load, help)
+        return load
+
+    return decorator
+
+
+@register_mode("human", "Play the game with the keyboard.")
+def _load_human_mode(args):
+    from flappy_bird_gymnasium.tests.test_human import play
+
+    return play
+
+
+@register_mode("random", "Watch an agent taking random actions.")
+def _load_random_mode(args):
+    from flappy_bird_gymnasium.tests.test_random import play
+
+    return functools.partial(
+        play, audio_on=(not args.quiet), render_mode="human" if not args.quiet else None
+    )
+
+
+@register_mode("dqn", "Watch the pre-trained Deep Q Network agent.")
+def _load_dqn_mode(args):
+    from flappy_bird_gymnasium.tests.test_dqn import play
+
+    return functools.partial(
+        play, audio_on=(not args.quiet), render_mode="human" if not args.quiet else None
+    )
+
+
+@register_mode("benchmark", "Compare the speed of the vector environments.")
+def _load_benchmark_mode(args):
+    from flappy_bird_gymnasium.benchmark import run
+
+    return run
+
+
+class _ImportProfiler(importlib.abc.MetaPathFinder):
+    """Measures how long each module newly imported takes to execute."""
+
+    def __init__(self) -> None:
+        self.timings = []  # (module, self time, cumulative time)
+        self._children = [0.0]
+
+    def __enter__(self):
+        sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, *exc_info):
+        sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _exec_module(self, loader, module) -> None:
+        self._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._children.pop()
+            self._children[-1] += elapsed
+            self.timings.append((module.__name__, elapsed - children, elapsed))
+            # don't leave the wrapper behind in the module's metadata
+            module.__loader__ = loader
+            if module.__spec__ is not None:
+                module.__spec__.loader = loader
+
+    def report(self, file=sys.stderr, limit: int = 25) -> None:
+        """Prints the slowest imports, sorted by cumulative time."""
+        print(
+            f"Imported {len(self.timings)} modules in "
+            f"{self._children[0] * 1000:.1f} ms",
+            file=file,
+        )
+        print(f"{'self [ms]':>10} {'cumulative [ms]':>16}  module", file=file)
+        for name, self_time, cumulative in sorted(
+            self.timings, key=lambda timing: timing[2], reverse=True
+        )[:limit]:
+            print(
+                f"{self_time * 1000:>10.1f} {cumulative * 1000:>16.1f}  {name}",
+                file=file,
+            )
+
+
+class _TimedLoader:
+    """Wraps a module loader, timing the execution of the module."""
+
+    def __init__(self, loader, profiler: _ImportProfiler) -> None:
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._exec_module(self._loader, module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+def _get_args(argv: Optional[List[str]] = None):
     """Parses the command line arguments and returns them."""
     parser = argparse.ArgumentParser(description=__doc__)
 
-    # Argument for the mode of execution (human or random):
+    # Argument for the mode of execution:
     parser.add_argument(
         "--mode",
         "-m",
         type=str,
         default="human",
-        choices=["human", "random", "dqn"],
-        help="The execution mode for the game.",
+        choices=list(_MODES),
+        help="The execution mode for the game: "
+        + "; ".join(f"{name}: {mode.help}" for name, mode in _MODES.items()),
     )
     parser.add_argument(
         "--quiet",
         action="store_true",
         help="If set, the game will be executed without rendering it.",
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="If set, reports how long loading the mode took, per imported "
+        "module, before running it.",
+    )
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main():
-    args = _get_args()
+def main(argv: Optional[List[str]] = None):
+    args = _get_args(argv)
+    mode = _MODES[args.mode]
 
-    if args.mode == "human":
-        human_agent_env()
-    elif args.mode == "random":
-        random_agent_env(
-            audio_on=(not args.quiet), render_mode="human" if not args.quiet else None
-        )
-    elif args.mode == "dqn":
-        dqn_agent_env(
-            audio_on=(not args.quiet), render_mode="human" if not args.quiet else None
-        )
+    if args.profile_startup:
+        with _ImportProfiler() as profiler:
+            run = mode.load(args)
+        profiler.report()
     else:
-        print("Invalid mode!")
+        run = mode.load(args)
+
+    run()
@@ -0,0 +1,634 @@
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""Headless simulation core of the Flappy Bird environments.
+
+This module implements the game's physics, pipes, scoring and collisions with
+NumPy only, so the simulation can run (and be imported) without pygame. The
+state of a batch of games is kept as NumPy arrays, one row per game, and a
+single call to :meth:`FlappyBirdLogic.step` advances all of them.
+"""
+
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from gymnasium.utils import seeding
+
+from flappy_bird_gymnasium.envs.collision import player_hits_pipes
+from flappy_bird_gymnasium.envs.constants import (
+    BACKGROUND_WIDTH,
+    BASE_WIDTH,
+    PIPE_HEIGHT,
+    PIPE_VEL_X,
+    PIPE_WIDTH,
+    PLAYER_ACC_Y,
+    PLAYER_FLAP_ACC,
+    PLAYER_HEIGHT,
+    PLAYER_MAX_VEL_Y,
+    PLAYER_VEL_ROT,
+    PLAYER_WIDTH,
+)
+
+#: Sequence of sprite indices the player's wing cycles through.
+PLAYER_IDX_CYCLE = (0, 1, 2, 1)
+
+#: Possible y positions of the gap between an upper and a lower pipe, before
+#: being offset by a fifth of the ground's height.
+GAP_YS = (20, 30, 40, 50, 60, 70, 80, 90)
+
+_PLAYER_IDX_CYCLE = np.array(PLAYER_IDX_CYCLE)
+
+#: Layout of a snapshot of a game's state. The pipes are rows
+#: `(x, gap_top, gap_bottom)`, sorted from the oldest to the newest one. `rng`
+#: and `schedule_pos` are the state of the game's :class:`PipeSchedule`: the
+#: state of its PCG64 random generator when the current block of gaps was
+#: drawn (see :func:`get_rng_state`) and the position in that block.
+STATE_DTYPE = np.dtype(
+    [
+        ("player_y", np.float64),
+        ("player_vel_y", np.float64),
+        ("player_rot", np.float64),
+        ("player_idx", np.int64),
+        ("player_idx_pos", np.int64),
+        ("loop_iter", np.int64),
+        ("score", np.int64),
+        ("ground_x", np.float64),
+        ("pipes", np.float64, (3, 3)),
+        ("rng", np.uint64, (6,)),
+        ("schedule_pos", np.int64),
+    ]
+)
+
+_UINT64_MASK = (1 << 64) - 1
+
+
+def get_rng_state(np_random: np.random.Generator) -> Tuple[int, ...]:
+    """Returns the state of a PCG64 random generator as six 64-bit words."""
+    state = np_random.bit_generator.state
+    if state["bit_generator"] != "PCG64":
+        raise ValueError(
+            f"Only PCG64 generators are supported, got {state['bit_generator']}."
+        )
+    value, inc = state["state"]["state"], state["state"]["inc"]
+    return (
+        value & _UINT64_MASK,
+        value >> 64,
+        inc & _UINT64_MASK,
+        inc >> 64,
+        state["has_uint32"],
+        state["uinteger"],
+    )
+
+
+def set_rng_state(np_random: np.random.Generator, words: Sequence[int]) -> None:
+    """Restores the state returned by :func:`get_rng_state` into a PCG64
+    random generator."""
+    value_lo, value_hi, inc_lo, inc_hi, has_uint32, uinteger = (int(w) for w in words)
+    np_random.bit_generator.state = {
+        "bit_generator": "PCG64",
+        "state": {"state": value_lo | value_hi << 64, "inc": inc_lo | inc_hi << 64},
+        "has_uint32": has_uint32,
+        "uinteger": uinteger,
+    }
+
+
+class PipeSchedule:
+    """Gaps of the pipes to come.
+
+    The gaps are drawn from a random generator a block at a time, with a single
+    vectorized call. This yields exactly the same gaps, and leaves the
+    generator in the same state, as drawing them one by one.
+
+    A fixed course can be replayed instead of the generator's gaps, to pin
+    evaluation courses or to build curriculums. A course is either a seed, the
+    gaps being drawn from a generator seeded with it, or an explicit sequence
+    of indices into :data:`GAP_YS`, repeated cyclically. Courses restart from
+    their beginning on :meth:`restart`.
+
+    Args:
+        ground_y (float): Vertical position of the ground.
+        np_random (Optional[np.random.Generator]): The generator the gaps are
+            drawn from when there is no fixed course.
+        course (Optional[Union[int, Sequence[int]]]): A fixed course, either a
+            seed or a sequence of gap indices.
+        block_size (int): Number of gaps drawn at once.
+    """
+
+    def __init__(
+        self,
+        ground_y: float,
+        np_random: Optional[np.random.Generator] = None,
+        course: Optional[Union[int, Sequence[int]]] = None,
+        block_size: int = 64,
+    ) -> None:
+        self.block_size = block_size
+        self._gap_ys = np.array(GAP_YS) + int(ground_y * 0.2)
+        self._np_random = np_random
+        self._course_seed: Optional[int] = None
+        self._course_gaps: Optional[np.ndarray] = None
+        self._source = np_random  # generator the blocks are drawn from
+        self._block = np.empty(0, dtype=np.int64)
+        self._block_start = (0,) * 6
+        self._pos = 0
+        self.set_course(course)
+
+    @property
+    def np_random(self) -> Optional[np.random.Generator]:
+        """The generator the gaps are drawn from when there is no fixed course.
+
+        Replacing it discards the gaps drawn in advance from the previous one.
+        """
+        return self._np_random
+
+    @np_random.setter
+    def np_random(self, np_random: Optional[np.random.Generator]) -> None:
+        if np_random is self._np_random:
+            return
+        self._np_random = np_random
+        if self._course_seed is None and self._course_gaps is None:
+            self._source = np_random
+            self._block = self._block[:0]
+            self._pos = 0
+
+    @property
+    def course(self) -> Optional[Union[int, np.ndarray]]:
+        """The fixed course, `None` if the gaps are random."""
+        if self._course_gaps is not None:
+            return self._course_gaps
+        return self._course_seed
+
+    def set_course(self, course: Optional[Union[int, Sequence[int]]]) -> None:
+        """Replaces the fixed course, and restarts it.
+
+        Args:
+            course (Optional[Union[int, Sequence[int]]]): A seed, a sequence of
+                gap indices, or `None` to draw random gaps from
+                :attr:`np_random`.
+        """
+        self._course_seed = None
+        self._course_gaps = None
+        if course is None:
+            self._source = self._np_random
+        elif isinstance(course, (int, np.integer)):
+            self._course_seed = int(course)
+        else:
+            gaps = np.array(course, dtype=np.int64)
+            if gaps.ndim != 1 or len(gaps) == 0:
+                raise ValueError("A course must be a non-empty sequence of gaps.")
+            if np.any((gaps < 0) | (gaps >= len(GAP_YS))):
+                raise ValueError(
+                    f"The gap indices of a course must be in [0, {len(GAP_YS)})."
+                )
+            self._course_gaps = gaps
+            self._source = None
+        self._block = self._block[:0]
+        self._pos = 0
+        self.restart()
+
+    def restart(self) -> None:
+        """Goes back to the beginning of the fixed course, if there is one.
+
+        Random gaps are not affected: the next ones are drawn from where the
+        generator stopped.
+        """
+        if self._course_seed is not None:
+            self._source = np.random.Generator(np.random.PCG64(self._course_seed))
+            self._block = self._block[:0]
+            self._pos = 0
+        elif self._course_gaps is not None:
+            self._block = self._course_gaps
+            self._pos = 0
+
+    def next_gap_y(self) -> int:
+        """Returns the y position of the next pipe's gap."""
+        if self._pos >= len(self._block):
+            self._refill()
+        index = self._block[self._pos]
+        self._pos += 1
+        return int(self._gap_ys[index])
+
+    def upcoming(self, num_pipes: int) -> np.ndarray:
+        """Returns the y positions of the gaps of the next pipes, without
+        consuming them.
+
+        Args:
+            num_pipes (int): Number of pipes to look ahead.
+
+        Returns:
+            An array of shape `(num_pipes,)`.
+        """
+        if self._course_gaps is not None:
+            indices = self._pos + np.arange(num_pipes)
+            return self._gap_ys[np.take(self._course_gaps, indices, mode="wrap")]
+
+        window = slice(self._pos, self._pos + num_pipes)
+        if window.stop > len(self._block):
+            # extend the block, from where the generator stopped
+            missing = max(window.stop - len(self._block), self.block_size)
+            if len(self._block) == 0:
+                self._block_start = get_rng_state(self._generator())
+            self._block = np.concatenate((self._block, self._draw(missing)))
+        return self._gap_ys[self._block[window]]
+
+    def get_state(self) -> Tuple[Tuple[int, ...], int]:
+        """Returns the state of the generator when the current block was drawn
+        and the position in that block (in the course, for explicit courses).
+        """
+        if self._course_gaps is not None:
+            return (0,) * 6, self._pos
+        if len(self._block) == 0:
+            return get_rng_state(self._generator()), 0
+        return self._block_start, self._pos
+
+    def set_state(self, rng: Sequence[int], pos: int) -> None:
+        """Restores a state returned by :meth:`get_state`."""
+        pos = int(pos)
+        if self._course_gaps is not None:
+            self._pos = pos % len(self._course_gaps)
+            return
+
+        set_rng_state(self._generator(), rng)
+        self._block_start = tuple(int(word) for word in rng)
+        self._block = self._draw(max(self.block_size, pos))
+        self._pos = pos
+
+    def _refill(self) -> None:
+        """Draws a new block of gaps (or starts the explicit course over)."""
+        if self._course_gaps is not None:
+            self._pos = 0
+            return
+        self._block_start = get_rng_state(self._generator())
+        self._block = self._draw(self.block_size)
+        self._pos = 0
+
+    def _generator(self) -> np.random.Generator:
+        """Returns the generator the blocks are drawn from, creating a randomly
+        seeded one if there is none yet."""
+        if self._source is None:
+            self._source, _ = seeding.np_random()
+            self._np_random = self._source
+        return self._source
+
+    def _draw(self, size: int) -> np.ndarray:
+        return self._generator().integers(0, len(GAP_YS), size=size)
+
+
+class PipeRing:
+    """Fixed-size ring buffer holding the pipes of a game.
+
+    Each slot of the buffer is a row `(x, gap_top, gap_bottom)`: the pipe's
+    horizontal position, the y position of the upper pipe's bottom end and the y
+    position of the lower pipe's top end. A new pipe replaces the oldest one,
+    which is always the leftmost one since all the pipes move at the same speed.
+
+    The buffer is exposed through read-only views, :attr:`pipes` and its
+    columns :attr:`x`, :attr:`gap_top` and :attr:`gap_bottom`, that renderers
+    and sensors can use without copying it. The slots are stored twice, one
+    copy after the other, so :attr:`ordered` can also be a view.
+
+    Args:
+        size (int): Number of pipe slots.
+    """
+
+    def __init__(self, size: int = 3) -> None:
+        self.size = size
+        self._buffer = np.zeros((2 * size, 3))
+        self._x = self._buffer[:, 0]
+        self._head = 0  # slot of the oldest pipe
+
+        pipes = self._buffer.view()
+        pipes.flags.writeable = False
+        self.pipes = pipes[:size]
+        self.x = self.pipes[:, 0]
+        self.gap_top = self.pipes[:, 1]
+        self.gap_bottom = self.pipes[:, 2]
+
+        # slots sorted from the oldest to the newest pipe, for each head
+        self._orders = [np.roll(np.arange(size), -head) for head in range(size)]
+        for order in self._orders:
+            order.flags.writeable = False
+        self._ordered = [pipes[head:][:size] for head in range(size)]
+
+    @property
+    def oldest(self) -> int:
+        """Slot of the oldest (leftmost) pipe."""
+        return self._head
+
+    @property
+    def order(self) -> np.ndarray:
+        """Slots sorted from the oldest (leftmost) to the newest pipe."""
+        return self._orders[self._head]
+
+    @property
+    def ordered(self) -> np.ndarray:
+        """The pipes sorted from the oldest (leftmost) to the newest one."""
+        return self._ordered[self._head]
+
+    def clear(self) -> None:
+        """Makes slot 0 the next one to be filled."""
+        self._head = 0
+
+    def push(self, x: float, gap_top: float, gap_bottom: float) -> None:
+        """Replaces the oldest pipe with a new one."""
+        buffer, head = self._buffer, self._head
+        for row in (head, head + self.size):
+            buffer[row, 0] = x
+            buffer[row, 1] = gap_top
+            buffer[row, 2] = gap_bottom
+        self._head = (head + 1) % self.size
+
+    def move(self, dx: float) -> None:
+        """Moves all the pipes horizontally."""
+        self._x += dx
+
+
+class FlappyBirdLogic:
+    """Game logic of a batch of independent Flappy Bird games.
+
+    Every game follows exactly the rules of :class:`FlappyBirdEnv` and draws
+    its pipes from its own random generator, stored in :attr:`np_randoms`,
+    through its own :class:`PipeSchedule`, stored in :attr:`pipe_schedules`.
+    The ground's offset and the wing's cycle are not restarted by
+    :meth:`reset`, just like in :class:`FlappyBirdEnv`.
+
+    The pipes don't depend on the players' actions. Games started from the same
+    state, e.g. to evaluate several plans, can therefore share their pipes:
+    with `shared_pipes=True`, the pipe arrays, :attr:`np_randoms` and
+    :attr:`pipe_schedules` have a single row, used by all the games (and
+    updated while any game is active).
+
+    Args:
+        num_games (int): Number of games simulated together.
+        screen_size (Tuple[int, int]): The screen's width and height.
+        pipe_gap (int): Space between a lower and an upper pipe.
+        shared_pipes (bool): Whether all the games share the same pipes.
+        pipe_course (Optional[Union[int, Sequence[int]]]): If set, every game
+            replays this fixed course (see :class:`PipeSchedule`).
+    """
+
+    def __init__(
+        self,
+        num_games: int = 1,
+        screen_size: Tuple[int, int] = (288, 512),
+        pipe_gap: int = 100,
+        shared_pipes: bool = False,
+        pipe_course: Optional[Union[int, Sequence[int]]] = None,
+    ) -> None:
+        self.num_games = num_games
+        self.shared_pipes = shared_pipes
+        self.screen_width = screen_size[0]
+        self.screen_height = screen_size[1]
+        self.pipe_gap = pipe_gap
+
+        self.ground_y = self.screen_height * 0.79
+        self.base_shift = BASE_WIDTH - BACKGROUND_WIDTH
+        self.player_x = int(self.screen_width * 0.2)
+        self.pipe_spawn_x = self.screen_width + PIPE_WIDTH + (self.screen_width * 0.2)
+
+        num_pipe_rows = 1 if shared_pipes else num_games
+        self.np_randoms: List[Optional[np.random.Generator]] = [None] * num_pipe_rows
+        self.pipe_schedules = [
+            PipeSchedule(self.ground_y, course=pipe_course)
+            for _ in range(num_pipe_rows)
+        ]
+        self.player_y = np.zeros(num_games)
+        self.player_vel_y = np.zeros(num_games)
+        self.player_rot = np.zeros(num_games)
+        self.player_idx = np.zeros(num_games, dtype=np.int64)
+        self.player_idx_pos = np.zeros(num_games, dtype=np.int64)
+        self.loop_iter = np.zeros(num_games, dtype=np.int64)
+        self.score = np.zeros(num_games, dtype=np.int64)
+        self.ground_x = np.zeros(num_games)
+
+        # Pipes, one column per pipe slot:
+        self.pipes_x = np.zeros((num_pipe_rows, 3))
+        self.upper_pipes_y = np.zeros((num_pipe_rows, 3))
+        self.lower_pipes_y = np.zeros((num_pipe_rows, 3))
+
+    def reset(self, game_indices: Sequence[int]) -> None:
+        """Starts a new game in each of the given slots.
+
+        Games without a random generator get a randomly seeded one.
+        """
+        self.player_y[game_indices] = int((self.screen_height - PLAYER_HEIGHT) / 2)
+        self.player_vel_y[game_indices] = -9  # player"s velocity along Y
+        self.player_rot[game_indices] = 45  # player"s rotation
+        self.player_idx[game_indices] = 0
+        self.loop_iter[game_indices] = 0
+        self.score[game_indices] = 0
+
+        for row in self._pipe_rows(game_indices):
+            if self.np_randoms[row] is None:
+                self.np_randoms[row], _ = seeding.np_random()
+            self.pipe_schedules[row].np_random = self.np_randoms[row]
+            self.pipe_schedules[row].restart()
+
+            # Generate 3 new pipes
+            self._set_random_pipe(row, 0, self.screen_width)
+            self._set_random_pipe(row, 1, self.screen_width + (self.screen_width / 2))
+            self._set_random_pipe(row, 2, self.screen_width + self.screen_width)
+
+    def step(
+        self, flap: np.ndarray, active: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Advances all the games by one frame.
+
+        Args:
+            flap (np.ndarray): Boolean array, whether each player flaps.
+            active (Optional[np.ndarray]): Boolean array. The games that are not
+                active are about to be reset: their wing, ground and pipes are
+                not updated, so no random numbers are drawn for them.
+
+        Returns:
+            The number of pipes passed by each player in this frame and whether
+            each player crashed.
+        """
+        if active is None:
+            active = np.ones(self.num_games, dtype=np.bool_)
+
+        flapped = flap & (self.player_y > -2 * PLAYER_HEIGHT)
+        self.player_vel_y[flapped] = PLAYER_FLAP_ACC
+
+        # check for score
+        player_mid_pos = self.player_x + PLAYER_WIDTH / 2
+        pipe_mid_pos = self.pipes_x + PIPE_WIDTH / 2
+        passed = (pipe_mid_pos <= player_mid_pos) & (player_mid_pos < pipe_mid_pos + 4)
+        passed = np.count_nonzero(passed, axis=1)
+        if self.shared_pipes:
+            passed = np.repeat(passed, self.num_games)
+        self.score += passed
+
+        # player_index base_x change
+        change_idx = ((self.loop_iter + 1) % 3 == 0) & active
+        self.player_idx[change_idx] = _PLAYER_IDX_CYCLE[self.player_idx_pos[change_idx]]
+        self.player_idx_pos[change_idx] = (self.player_idx_pos[change_idx] + 1) % 4
+
+        self.loop_iter = (self.loop_iter + 1) % 30
+        self.ground_x = np.where(
+            active, -((-self.ground_x + 100) % self.base_shift), self.ground_x
+        )
+
+        # rotate the player
+        self.player_rot[self.player_rot > -90] -= PLAYER_VEL_ROT
+
+        # player's movement
+        self.player_vel_y[
+            (self.player_vel_y < PLAYER_MAX_VEL_Y) & ~flapped
+        ] += PLAYER_ACC_Y
+
+        # more rotation to cover the threshold (calculated in visible rotation)
+        self.player_rot[flapped] = 45
+
+        self.player_y += np.minimum(
+            self.player_vel_y, self.ground_y - self.player_y - PLAYER_HEIGHT
+        )
+
+        # move pipes to left
+        self.pipes_x += PIPE_VEL_X
+
+        # recycle the pipes that are out of the screen
+        if self.shared_pipes:
+            out_of_screen = (self.pipes_x < -PIPE_WIDTH) & np.any(active)
+        else:
+            out_of_screen = (self.pipes_x < -PIPE_WIDTH) & active[:, np.newaxis]
+        for row, slot in zip(*np.nonzero(out_of_screen)):
+            self._set_random_pipe(row, slot, self.pipe_spawn_x)
+
+        return passed, self.check_crash()
+
+    def check_crash(self) -> np.ndarray:
+        """Returns, for each game, whether the player collided with the ground
+        (base) or a pipe."""
+        # if player crashes into ground
+        crashed = self.player_y + PLAYER_HEIGHT >= self.ground_y - 1
+        # or into a pipe
+        crashed |= player_hits_pipes(
+            self.player_x,
+            self.player_y,
+            self.pipes_x,
+            self.upper_pipes_y,
+            self.lower_pipes_y,
+        )
+
+        return crashed
+
+    def get_state(self, game_indices: Sequence[int]) -> np.ndarray:
+        """Returns snapshots of the state of some games.
+
+        Args:
+            game_indices (Sequence[int]): The games' indices.
+
+        Returns:
+            A structured array of dtype :data:`STATE_DTYPE`, one snapshot per
+            game.
+        """
+        game_indices = np.asarray(game_indices, dtype=np.intp)
+        rows = self._pipe_rows(game_indices)
+
+        states = np.empty(len(game_indices), dtype=STATE_DTYPE)
+        states["player_y"] = self.player_y[game_indices]
+        states["player_vel_y"] = self.player_vel_y[game_indices]
+        states["player_rot"] = self.player_rot[game_indices]
+        states["player_idx"] = self.player_idx[game_indices]
+        states["player_idx_pos"] = self.player_idx_pos[game_indices]
+        states["loop_iter"] = self.loop_iter[game_indices]
+        states["score"] = self.score[game_indices]
+        states["ground_x"] = self.ground_x[game_indices]
+
+        # from the oldest (leftmost) pipe to the newest one
+        order = np.argsort(self.pipes_x[rows], axis=1, kind="stable")
+        pipes = np.stack(
+            (
+                self.pipes_x[rows],
+                self.upper_pipes_y[rows] + PIPE_HEIGHT,
+                self.lower_pipes_y[rows],
+            ),
+            axis=-1,
+        )
+        states["pipes"] = np.take_along_axis(pipes, order[..., np.newaxis], axis=1)
+        # with shared pipes, the single schedule's state is broadcast
+        schedule_states = [self.pipe_schedules[row].get_state() for row in rows]
+        states["rng"] = [rng for rng, _ in schedule_states]
+        states["schedule_pos"] = [pos for _, pos in schedule_states]
+        return states
+
+    def set_state(self, states: np.ndarray, game_indices: Sequence[int]) -> None:
+        """Restores snapshots of games' states.
+
+        With shared pipes, the pipes and the random generator are restored from
+        the first snapshot.
+
+        Args:
+            states (np.ndarray): Snapshots of dtype :data:`STATE_DTYPE`, one
+                per game.
+            game_indices (Sequence[int]): The games' indices.
+        """
+        states = np.asarray(states, dtype=STATE_DTYPE)
+        game_indices = np.asarray(game_indices, dtype=np.intp)
+
+        self.player_y[game_indices] = states["player_y"]
+        self.player_vel_y[game_indices] = states["player_vel_y"]
+        self.player_rot[game_indices] = states["player_rot"]
+        self.player_idx[game_indices] = states["player_idx"]
+        self.player_idx_pos[game_indices] = states["player_idx_pos"]
+        self.loop_iter[game_indices] = states["loop_iter"]
+        self.score[game_indices] = states["score"]
+        self.ground_x[game_indices] = states["ground_x"]
+
+        rows = self._pipe_rows(game_indices)
+        for row, state in zip(rows, states[: len(rows)]):
+            self.pipes_x[row] = state["pipes"][:, 0]
+            self.upper_pipes_y[row] = state["pipes"][:, 1] - PIPE_HEIGHT
+            self.lower_pipes_y[row] = state["pipes"][:, 2]
+            if self.np_randoms[row] is None:
+                self.np_randoms[row] = np.random.Generator(np.random.PCG64())
+            self.pipe_schedules[row].np_random = self.np_randoms[row]
+            self.pipe_schedules[row].set_state(state["rng"], state["schedule_pos"])
+
+    def upcoming_gaps(self, num_pipes: int) -> np.ndarray:
+        """Returns the y positions of the gaps of the next pipes to spawn.
+
+        Args:
+            num_pipes (int): Number of pipes to look ahead.
+
+        Returns:
+            An array of shape `(num_games, num_pipes)`, or `(1, num_pipes)`
+            with shared pipes.
+        """
+        return np.stack(
+            [schedule.upcoming(num_pipes) for schedule in self.pipe_schedules]
+        )
+
+    def _pipe_rows(self, game_indices: Sequence[int]) -> np.ndarray:
+        """Returns the rows of the pipe arrays used by the given games."""
+        if self.shared_pipes:
+            return np.zeros(min(len(game_indices), 1), dtype=np.intp)
+        return np.asarray(game_indices, dtype=np.intp)
+
+    def _set_random_pipe(self, row: int, slot: int, pipe_x: float) -> None:
+        """Places a randomly generated pipe in a pipe slot."""
+        gap_y = self.pipe_schedules[row].next_gap_y()
+
+        self.pipes_x[row, slot] = pipe_x
+        self.upper_pipes_y[row, slot] = gap_y - PIPE_HEIGHT
+        self.lower_pipes_y[row, slot] = gap_y + self.pipe_gap
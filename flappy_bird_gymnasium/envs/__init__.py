@@ -21,7 +21,14 @@
 # SOFTWARE.
 # ==============================================================================
 
-""" Exposes the environment class.
+""" Exposes the environment classes.
 """
 
+from flappy_bird_gymnasium.envs.flappy_bird_async_vector_env import (
+    FlappyBirdAsyncVectorEnv,
+)
 from flappy_bird_gymnasium.envs.flappy_bird_env import FlappyBirdEnv
+from flappy_bird_gymnasium.envs.flappy_bird_threaded_vector_env import (
+    FlappyBirdThreadedVectorEnv,
+)
+from flappy_bird_gymnasium.envs.flappy_bird_vector_env import FlappyBirdVectorEnv
@@ -0,0 +1,93 @@
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""Axis-aligned collision tests between the game's objects.
+
+The tests follow the semantics of `pygame.Rect.colliderect`: the rectangles'
+positions are truncated towards zero to integers and rectangles that only share
+an edge don't collide. The sizes of the rectangles must be positive.
+"""
+
+import numpy as np
+
+from flappy_bird_gymnasium.envs.constants import (
+    PIPE_HEIGHT,
+    PIPE_WIDTH,
+    PLAYER_HEIGHT,
+    PLAYER_WIDTH,
+)
+
+
+def rects_collide(x1, y1, w1, h1, x2, y2, w2, h2) -> bool:
+    """Returns True if two rectangles overlap.
+
+    Args:
+        x1, y1, w1, h1: Position and size of the first rectangle.
+        x2, y2, w2, h2: Position and size of the second rectangle.
+    """
+    x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+    return x1 < x2 + w2 and y1 < y2 + h2 and x1 + w1 > x2 and y1 + h1 > y2
+
+
+def rects_collide_batch(x1, y1, w1, h1, x2, y2, w2, h2) -> np.ndarray:
+    """Batched form of :func:`rects_collide`.
+
+    The arguments are arrays (or scalars) broadcast against each other.
+
+    Returns:
+        A boolean array with the broadcast shape of the arguments.
+    """
+    x1, y1, x2, y2 = np.trunc(x1), np.trunc(y1), np.trunc(x2), np.trunc(y2)
+    return (x1 < x2 + w2) & (y1 < y2 + h2) & (x1 + w1 > x2) & (y1 + h1 > y2)
+
+
+def player_hits_pipes(
+    player_x, player_y, pipes_x, upper_pipes_y, lower_pipes_y
+) -> np.ndarray:
+    """Checks whether players collide with any of their pipes.
+
+    Args:
+        player_x: The players' horizontal positions, shape `(N,)` or scalar.
+        player_y: The players' vertical positions, shape `(N,)`.
+        pipes_x: Horizontal positions of each player's pipes, shape `(N, P)`.
+        upper_pipes_y: Vertical positions of the upper pipes, shape `(N, P)`.
+        lower_pipes_y: Vertical positions of the lower pipes, shape `(N, P)`.
+
+    Returns:
+        A boolean array of shape `(N,)`.
+    """
+    player_x = np.asarray(player_x)
+    if player_x.ndim:
+        player_x = player_x[:, np.newaxis]
+    player_y = np.asarray(player_y)[:, np.newaxis]
+
+    overlap_x = rects_collide_batch(
+        player_x, 0, PLAYER_WIDTH, 1, pipes_x, 0, PIPE_WIDTH, 1
+    )
+    up_collide = rects_collide_batch(
+        0, player_y, 1, PLAYER_HEIGHT, 0, upper_pipes_y, 1, PIPE_HEIGHT
+    )
+    low_collide = rects_collide_batch(
+        0, player_y, 1, PLAYER_HEIGHT, 0, lower_pipes_y, 1, PIPE_HEIGHT
+    )
+    return np.any(overlap_x & (up_collide | low_collide), axis=1)
@@ -0,0 +1,406 @@
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""Multiprocess implementation of the Flappy Bird vector environment.
+
+The sub-environments are split into contiguous blocks, one per worker process.
+Each worker steps its whole block at once, with :class:`FlappyBirdVectorEnv`
+(or, for pixel observations, a batch of :class:`FlappyBirdEnv`), and writes the
+results directly into shared memory. Nothing is pickled on a step: the actions
+are read from shared memory too, and the commands are single bytes sent through
+pipes.
+
+The results are written into a ring of `num_slots` slots, one per step, so
+the arrays returned without copying by a step stay valid for the next
+`num_slots - 1` steps.
+"""
+
+import multiprocessing
+import os
+import pickle
+import traceback
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import gymnasium
+import numpy as np
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import batch_space
+
+from flappy_bird_gymnasium.envs.flappy_bird_env import FlappyBirdEnv
+from flappy_bird_gymnasium.envs.flappy_bird_vector_env import FlappyBirdVectorEnv
+
+# commands sent to the workers, as the first byte of a message
+_STEP, _RESET, _CLOSE = 0, 1, 2
+# replies of the workers
+_OK, _ERROR = b"\x00", b"\x01"
+
+# the arrays are aligned on cache lines
+_ALIGNMENT = 64
+
+
+class _SharedArrays:
+    """Layout of the arrays stored in a shared memory buffer.
+
+    Args:
+        num_envs (int): Number of sub-environments.
+        num_slots (int): Number of slots of the ring of results.
+        obs_shape (Tuple[int, ...]): Shape of an observation.
+        obs_dtype (np.dtype): Data type of the observations.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        num_slots: int,
+        obs_shape: Tuple[int, ...],
+        obs_dtype: np.dtype,
+    ) -> None:
+        fields = [
+            ("actions", np.int64, (num_envs,)),
+            ("observations", obs_dtype, (num_slots, num_envs, *obs_shape)),
+            ("rewards", np.float64, (num_slots, num_envs)),
+            ("terminations", np.bool_, (num_slots, num_envs)),
+            ("truncations", np.bool_, (num_slots, num_envs)),
+            ("scores", np.int64, (num_slots, num_envs)),
+        ]
+        self.fields = []
+        self.size = 0
+        for name, dtype, shape in fields:
+            dtype = np.dtype(dtype)
+            self.fields.append((name, dtype, shape, self.size))
+            nbytes = dtype.itemsize * int(np.prod(shape))
+            self.size += -(-nbytes // _ALIGNMENT) * _ALIGNMENT
+
+    def views(self, buffer: Any) -> Dict[str, np.ndarray]:
+        """Returns the arrays, as views of a buffer of :attr:`size` bytes."""
+        return {
+            name: np.frombuffer(
+                buffer, dtype=dtype, count=int(np.prod(shape)), offset=offset
+            ).reshape(shape)
+            for name, dtype, shape, offset in self.fields
+        }
+
+
+def _make_block_env(num_envs: int, env_kwargs: Dict[str, Any]):
+    """Creates the vector environment stepping a worker's block."""
+    if env_kwargs.get("use_pixels", False):
+        # the pixel observations are only drawn by the single environment
+        return gymnasium.vector.SyncVectorEnv(
+            [lambda: FlappyBirdEnv(**env_kwargs) for _ in range(num_envs)],
+            copy=False,
+        )
+    return FlappyBirdVectorEnv(num_envs, **env_kwargs)
+
+
+def _worker(
+    conn: Any,
+    buffer: Any,
+    layout: _SharedArrays,
+    block: slice,
+    env_kwargs: Dict[str, Any],
+) -> None:
+    """Steps a block of sub-environments on the commands of the main process."""
+    try:
+        env = _make_block_env(block.stop - block.start, env_kwargs)
+        arrays = layout.views(buffer)
+        actions = arrays["actions"][block]
+        observations = arrays["observations"][:, block]
+        rewards = arrays["rewards"][:, block]
+        terminations = arrays["terminations"][:, block]
+        truncations = arrays["truncations"][:, block]
+        scores = arrays["scores"][:, block]
+    except Exception:
+        conn.send_bytes(_ERROR + traceback.format_exc().encode())
+        conn.close()
+        return
+    conn.send_bytes(_OK)
+
+    while True:
+        command = conn.recv_bytes()
+        try:
+            if command[0] == _STEP:
+                slot = command[1]
+                obs, rewards[slot], terminations[slot], truncations[slot], info = (
+                    env.step(actions)
+                )
+            elif command[0] == _RESET:
+                slot = command[1]
+                seed, options = pickle.loads(command[2:])
+                obs, info = env.reset(seed=seed, options=options)
+            else:
+                env.close()
+                conn.send_bytes(_OK)
+                break
+            observations[slot] = obs
+            scores[slot] = info["score"]
+        except Exception:
+            conn.send_bytes(_ERROR + traceback.format_exc().encode())
+        else:
+            conn.send_bytes(_OK)
+    conn.close()
+
+
+class FlappyBirdAsyncVectorEnv(gymnasium.vector.VectorEnv):
+    """Multiprocess version of :class:`FlappyBirdVectorEnv`.
+
+    The sub-environments are stepped by `num_workers` processes, each one in
+    charge of a contiguous block of sub-environments, which it steps in a
+    single batch. The observations, rewards, terminations, truncations and
+    scores are written into shared memory, with the compact `obs_dtype`.
+    Resetting with `seed=s` yields the same trajectories as
+    :class:`FlappyBirdVectorEnv` reset with the same seed.
+
+    Args:
+        num_envs (int): Number of sub-environments.
+        num_workers (Optional[int]): Number of worker processes. Defaults to
+            the number of CPUs (but not more than `num_envs`).
+        obs_dtype (type): Data type of the features and LIDAR observations.
+            Pixel observations keep the `pixels_dtype` data type.
+        num_slots (int): Number of steps whose results are kept in shared
+            memory, from 1 to 256 (a slot is sent to the workers as one byte).
+        copy (bool): If `False`, the observations, rewards, terminations and
+            truncations are returned as views of the shared memory, which stay
+            valid for the next `num_slots - 1` steps.
+        context (Optional[str]): The multiprocessing start method, e.g.
+            `"fork"` or `"spawn"`. Defaults to the platform's default.
+        **env_kwargs: Arguments of the sub-environments, as for
+            :class:`FlappyBirdVectorEnv`, or, with `use_pixels=True`, for
+            :class:`FlappyBirdEnv`.
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(
+        self,
+        num_envs: int = 1,
+        num_workers: Optional[int] = None,
+        obs_dtype: type = np.float32,
+        num_slots: int = 2,
+        copy: bool = True,
+        context: Optional[str] = None,
+        **env_kwargs: Any,
+    ) -> None:
+        if not 1 <= num_slots <= 256:
+            raise ValueError(f"num_slots must be between 1 and 256, got {num_slots}")
+        self.num_envs = num_envs
+        self.render_mode = None
+        self._copy = copy
+        self._num_slots = num_slots
+        self._slot = 0
+        self._step_slot = 0
+        self._waiting = False
+        self._conns: List[Any] = []
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+
+        if env_kwargs.get("use_pixels", False):
+            space = FlappyBirdEnv(**env_kwargs).observation_space
+        else:
+            space = FlappyBirdVectorEnv(1, **env_kwargs).single_observation_space
+            space = gymnasium.spaces.Box(
+                space.low.astype(obs_dtype),
+                space.high.astype(obs_dtype),
+                shape=space.shape,
+                dtype=obs_dtype,
+            )
+        self.single_observation_space = space
+        self.single_action_space = gymnasium.spaces.Discrete(2)
+        self.observation_space = batch_space(space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        num_workers = max(1, min(num_workers, num_envs))
+        bounds = np.linspace(0, num_envs, num_workers + 1).astype(int)
+        self._blocks = [slice(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+        ctx = multiprocessing.get_context(context)
+        layout = _SharedArrays(num_envs, num_slots, space.shape, space.dtype)
+        self._buffer = ctx.RawArray("b", layout.size)
+        self._arrays = layout.views(self._buffer)
+
+        for index, block in enumerate(self._blocks):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                name=f"FlappyBirdWorker-{index}",
+                args=(child_conn, self._buffer, layout, block, env_kwargs),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+        self._wait(self._conns)
+
+    @property
+    def num_workers(self) -> int:
+        """Number of worker processes."""
+        return len(self._processes)
+
+    def reset(
+        self,
+        *,
+        seed: Optional[Union[int, Sequence[Optional[int]]]] = None,
+        options: Optional[Dict] = None,
+    ) -> Tuple[np.ndarray, Dict]:
+        """Resets the sub-environments (starts new games).
+
+        Args:
+            seed (Optional[Union[int, Sequence[Optional[int]]]]): Either a
+                single seed, in which case the sub-environments are seeded
+                with `seed, seed + 1, ...`, or one seed per sub-environment.
+            options (Optional[Dict]): If it contains a boolean `"reset_mask"`
+                array, only the masked sub-environments are reset.
+
+        Returns:
+            The batched observations and an info dictionary.
+        """
+        if self._waiting:
+            self.step_wait()
+        if seed is None:
+            seed = [None] * self.num_envs
+        elif isinstance(seed, int):
+            seed = [seed + i for i in range(self.num_envs)]
+        if len(seed) != self.num_envs:
+            raise ValueError(
+                "If seeds are passed as a list the length must match "
+                f"num_envs={self.num_envs} but got length={len(seed)}."
+            )
+        options = dict(options) if options is not None else {}
+        reset_mask = options.pop("reset_mask", None)
+
+        slot = self._next_slot()
+        conns = []
+        for block, conn in zip(self._blocks, self._conns):
+            block_options = dict(options)
+            if reset_mask is not None:
+                block_mask = np.asarray(reset_mask, dtype=np.bool_)[block]
+                if not np.any(block_mask):
+                    continue
+                block_options["reset_mask"] = block_mask
+            message = pickle.dumps((list(seed[block]), block_options or None))
+            conn.send_bytes(bytes((_RESET, slot)) + message)
+            conns.append(conn)
+        self._wait(conns)
+
+        if reset_mask is not None:
+            # the sub-environments that were not reset keep their last results
+            kept = ~np.asarray(reset_mask, dtype=np.bool_)
+            previous = (slot - 1) % self._num_slots
+            for name in ("observations", "scores"):
+                self._arrays[name][slot, kept] = self._arrays[name][previous, kept]
+        return self._result("observations", slot), self._info(slot)
+
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """Advances all the sub-environments by one frame.
+
+        Args:
+            actions (np.ndarray): One action per sub-environment.
+
+        Returns:
+            A tuple containing batched observations, rewards, terminations,
+            truncations and an info dictionary.
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """Sends the actions to the workers, without waiting for the results.
+
+        Args:
+            actions (np.ndarray): One action per sub-environment.
+        """
+        if self._waiting:
+            raise RuntimeError("Call step_wait() before sending new actions.")
+        self._arrays["actions"][:] = actions
+        self._step_slot = self._next_slot()
+        command = bytes((_STEP, self._step_slot))
+        for conn in self._conns:
+            conn.send_bytes(command)
+        self._waiting = True
+
+    def step_wait(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """Waits for the results of the actions sent by :meth:`step_async`.
+
+        Returns:
+            A tuple containing batched observations, rewards, terminations,
+            truncations and an info dictionary.
+        """
+        if not self._waiting:
+            raise RuntimeError("Call step_async() before step_wait().")
+        self._waiting = False
+        self._wait(self._conns)
+        slot = self._step_slot
+        return (
+            self._result("observations", slot),
+            self._result("rewards", slot),
+            self._result("terminations", slot),
+            self._result("truncations", slot),
+            self._info(slot),
+        )
+
+    def close_extras(self, **kwargs: Any) -> None:
+        """Stops the worker processes."""
+        if self._waiting:
+            try:
+                self.step_wait()
+            except RuntimeError:
+                pass
+        for conn, process in zip(self._conns, self._processes):
+            if process.is_alive():
+                try:
+                    conn.send_bytes(bytes((_CLOSE,)))
+                    conn.recv_bytes()
+                except (BrokenPipeError, EOFError):
+                    pass
+            conn.close()
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    def _next_slot(self) -> int:
+        slot = self._slot
+        self._slot = (slot + 1) % self._num_slots
+        return slot
+
+    def _wait(self, conns: List[Any]) -> None:
+        """Waits for the replies of some workers, and raises their errors."""
+        errors = []
+        for conn in conns:
+            reply = conn.recv_bytes()
+            if reply[:1] == _ERROR:
+                errors.append(reply[1:].decode())
+        if errors:
+            raise RuntimeError("A worker failed:\n" + "\n".join(errors))
+
+    def _result(self, name: str, slot: int) -> np.ndarray:
+        result = self._arrays[name][slot]
+        return result.copy() if self._copy else result
+
+    def _info(self, slot: int) -> Dict[str, np.ndarray]:
+        return {
+            "score": self._arrays["scores"][slot].copy(),
+            "_score": np.ones(self.num_envs, dtype=np.bool_),
+        }
@@ -30,14 +30,29 @@ released under the MIT license.
 """
 
 from enum import IntEnum
-from itertools import cycle
-from typing import Dict, Optional, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import gymnasium
 import numpy as np
-import pygame
 
+from flappy_bird_gymnasium.core import (
+    PLAYER_IDX_CYCLE,
+    STATE_DTYPE,
+    FlappyBirdLogic,
+    PipeRing,
+    PipeSchedule,
+)
 from flappy_bird_gymnasium.envs import utils
+from flappy_bird_gymnasium.envs.collision import rects_collide
 from flappy_bird_gymnasium.envs.constants import (
     BACKGROUND_WIDTH,
     BASE_WIDTH,
@@ -56,6 +71,51 @@ from flappy_bird_gymnasium.envs.constants import (
     PLAYER_WIDTH,
 )
 from flappy_bird_gymnasium.envs.lidar import LIDAR
+from flappy_bird_gymnasium.envs.rasterizer import PixelObservation, Rasterizer
+from flappy_bird_gymnasium.envs.sprites import VISIBLE_ROTATIONS, PlayerAtlas
+
+if TYPE_CHECKING:
+    from pygame import Surface
+
+
+def _near_obstacles(
+    player_x: float,
+    player_y: np.ndarray,
+    pipes_x: np.ndarray,
+    gap_top: np.ndarray,
+    gap_bottom: np.ndarray,
+    ground_y: float,
+) -> np.ndarray:
+    """Tells which of `N` players may have an obstacle in their private zone.
+
+    A LIDAR ray can't stop closer to the sensor than the obstacle's rect
+    (widened by a pixel, as the rects are truncated to integers), so the
+    players far from every rect don't need to be scanned.
+
+    Args:
+        player_x (float): The players' horizontal position.
+        player_y (np.ndarray): The players' vertical positions, shape `(N,)`.
+        pipes_x (np.ndarray): Horizontal positions of the pipes, shape `(N, P)`
+            or `(1, P)`.
+        gap_top (np.ndarray): y positions of the upper pipes' bottom ends.
+        gap_bottom (np.ndarray): y positions of the lower pipes' top ends.
+        ground_y (float): The ground's vertical position.
+
+    Returns:
+        A boolean array of shape `(N,)`.
+    """
+    radius = PLAYER_PRIVATE_ZONE + 1
+    sensor_x = player_x + PLAYER_WIDTH
+    sensor_y = player_y + PLAYER_HEIGHT / 2
+    near = ground_y - sensor_y < radius
+
+    pipes_dx = np.maximum(pipes_x - 1 - sensor_x, 0)
+    pipes_dx = np.maximum(pipes_dx, sensor_x - pipes_x - PIPE_WIDTH)
+    pipes_dy = np.minimum(
+        np.maximum(sensor_y[:, np.newaxis] - gap_top, 0),
+        np.maximum(gap_bottom - 1 - sensor_y[:, np.newaxis], 0),
+    )
+    return near | np.any(pipes_dx**2 + pipes_dy**2 < radius**2, axis=1)
 
 
 class Actions(IntEnum):
@@ -64,6 +124,23 @@ class Actions(IntEnum):
     IDLE, FLAP = 0, 1
 
 
+class SimulationResult(NamedTuple):
+    """Outcome of the action plans evaluated by :meth:`FlappyBirdEnv.simulate`.
+
+    Attributes:
+        rewards (np.ndarray): The rewards of each plan, of shape `(K, H)`. They
+            are zero after the plan's termination.
+        terminated_at (np.ndarray): The step at which each plan's game ended,
+            or `-1` if it lasted the whole plan.
+        final_states (np.ndarray): The state of each plan's game at its end, of
+            dtype :data:`flappy_bird_gymnasium.core.STATE_DTYPE`.
+    """
+
+    rewards: np.ndarray
+    terminated_at: np.ndarray
+    final_states: np.ndarray
+
+
 class FlappyBirdEnv(gymnasium.Env):
     """Flappy Bird Gymnasium environment that yields simple observations.
 
@@ -82,6 +159,28 @@ class FlappyBirdEnv(gymnasium.Env):
         screen_size (Tuple[int, int]): The screen's width and height.
         normalize_obs (bool): If `True`, the observations will be normalized
             before being returned.
+        obs_dtype (type): Data type of the features and LIDAR observations,
+            `np.float64` or `np.float32`.
+        copy_obs (bool): If `False`, the features and pixels observations are
+            returned as views of an internal buffer, which is overwritten by the
+            next call to :meth:`step` or :meth:`reset`. Saves a copy per step
+            when the observations are consumed right away.
+        use_lidar (bool): If `True`, the observations are the distances
+            measured by the LIDAR sensor instead of the game's features.
+        lidar_rays (int): Number of rays cast by the LIDAR sensor.
+        lidar_fov (float): The LIDAR sensor's field of view, in degrees. The
+            rays are spread evenly over it.
+        use_pixels (bool): If `True`, the observations are the game's frames.
+            They are drawn by a headless renderer, so no render mode (or
+            display) is needed.
+        pixels_size (Optional[Tuple[int, int]]): Width and height the frames
+            are downscaled to, e.g. `(84, 84)`. If `None`, the frames keep the
+            screen's size.
+        pixels_grayscale (bool): If `True`, the frames are converted to
+            grayscale, of shape `(height, width)` instead of
+            `(height, width, 3)`.
+        pixels_dtype (type): Data type of the frames: `np.uint8`, with values
+            in [0, 255], or a floating point type, with values in [0, 1].
         pipe_gap (int): Space between a lower and an upper pipe.
         bird_color (str): Color of the flappy bird. The currently available
             colors are "yellow", "blue" and "red".
@@ -90,17 +189,42 @@ class FlappyBirdEnv(gymnasium.Env):
         background (Optional[str]): Type of background image. The currently
             available types are "day" and "night". If `None`, no background will
             be drawn.
+        copy_frames (bool): If `False`, the frames returned by :meth:`render`
+            in `"rgb_array"` mode are views of an internal buffer, which is
+            overwritten by the next frame, instead of new arrays.
+        pipe_course (Optional[Union[int, Sequence[int]]]): If set, every
+            episode replays the same pipes: either the pipes drawn from this
+            seed, or this sequence of gap indices (into
+            :data:`flappy_bird_gymnasium.core.GAP_YS`), repeated. It can also be
+            changed on reset, with the `"pipe_course"` option.
+        frame_skip (int): Number of frames each action is repeated for. A step
+            sums the rewards of its frames and ends early if the game ends.
+            The observation, and the frame in `"rgb_array_list"` mode, are
+            only computed after the step's last frame.
     """
 
-    metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 30}
+    metadata = {
+        "render_modes": ["human", "rgb_array", "rgb_array_list"],
+        "render_fps": 30,
+    }
+
+    # `rgb_array_list` frames are stored in arrays of this many frames
+    _FRAMES_PER_CHUNK = 32
 
     def __init__(
         self,
         screen_size: Tuple[int, int] = (288, 512),
         audio_on: bool = False,
         normalize_obs: bool = True,
+        obs_dtype: type = np.float64,
+        copy_obs: bool = True,
         use_lidar: bool = False,
+        lidar_rays: int = 180,
+        lidar_fov: float = 180,
         use_pixels: bool = False,
+        pixels_size: Optional[Tuple[int, int]] = None,
+        pixels_grayscale: bool = False,
+        pixels_dtype: type = np.uint8,
         pipe_gap: int = 100,
         bird_color: str = "yellow",
         pipe_color: str = "green",
@@ -109,8 +233,14 @@ class FlappyBirdEnv(gymnasium.Env):
         score_limit: Optional[int] = None,
         training_mode: bool = False,
         debug: bool = False,
+        copy_frames: bool = True,
+        pipe_course: Optional[Union[int, Sequence[int]]] = None,
+        frame_skip: int = 1,
     ) -> None:
         assert render_mode is None or render_mode in self.metadata["render_modes"]
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip must be at least 1, got {frame_skip}")
+        self._frame_skip = frame_skip
         self.render_mode = render_mode
         self._debug = debug
         self._score_limit = score_limit
@@ -120,52 +250,88 @@ class FlappyBirdEnv(gymnasium.Env):
         if use_lidar:
             if normalize_obs:
                 self.observation_space = gymnasium.spaces.Box(
-                    0.0, 1.0, shape=(180,), dtype=np.float64
+                    0.0, 1.0, shape=(lidar_rays,), dtype=obs_dtype
                 )
             else:
                 self.observation_space = gymnasium.spaces.Box(
-                    0.0, np.inf, shape=(180,), dtype=np.float64
+                    0.0, np.inf, shape=(lidar_rays,), dtype=obs_dtype
                 )
         elif use_pixels:
+            self._pixel_observation = PixelObservation(
+                screen_size,
+                size=pixels_size,
+                grayscale=pixels_grayscale,
+                dtype=pixels_dtype,
+            )
             self.observation_space = gymnasium.spaces.Box(
-                0.0, 1.0, shape=(512, 288, 3), dtype=np.float64
+                0,
+                self._pixel_observation.high,
+                shape=self._pixel_observation.shape,
+                dtype=self._pixel_observation.dtype,
             )
         else:
             if normalize_obs:
                 self.observation_space = gymnasium.spaces.Box(
-                    -1.0, 1.0, shape=(12,), dtype=np.float64
+                    -1.0, 1.0, shape=(12,), dtype=obs_dtype
                 )
             else:
                 self.observation_space = gymnasium.spaces.Box(
-                    -np.inf, np.inf, shape=(12,), dtype=np.float64
+                    -np.inf, np.inf, shape=(12,), dtype=obs_dtype
                 )
 
         self._screen_width = screen_size[0]
         self._screen_height = screen_size[1]
         self._normalize_obs = normalize_obs
+        self._obs_dtype = np.dtype(obs_dtype)
+        self._copy_obs = copy_obs
         self._pipe_gap = pipe_gap
         self._audio_on = audio_on
         self._use_lidar = use_lidar
         self._sound_cache = None
         self._player_flapped = False
-        self._player_idx_gen = cycle([0, 1, 2, 1])
+        self._player_idx_pos = 0  # position in PLAYER_IDX_CYCLE
         self._bird_color = bird_color
         self._pipe_color = pipe_color
         self._bg_type = background
 
         self._ground = {"x": 0, "y": self._screen_height * 0.79}
         self._base_shift = BASE_WIDTH - BACKGROUND_WIDTH
+        self._pipes = PipeRing(3)
+        self._pipe_schedule = PipeSchedule(self._ground["y"], course=pipe_course)
+        self._pipe_spawn_x = (
+            self._screen_width + PIPE_WIDTH + (self._screen_width * 0.2)
+        )
+
+        # the pixel observations and the `rgb_array` frames are drawn headlessly
+        if use_pixels or render_mode in ("rgb_array", "rgb_array_list"):
+            self._rasterizer = Rasterizer(
+                screen_size,
+                bird_color=bird_color,
+                pipe_color=pipe_color,
+                background=background,
+            )
+        self._copy_frames = copy_frames
+        # frames collected for `rgb_array_list`, in chunks of `_FRAMES_PER_CHUNK`
+        self._frame_chunks: List[np.ndarray] = []
+        self._num_frames = 0
 
         if use_pixels:
             self._get_observation = self._get_observation_pixels
         else:
             if use_lidar:
-                self._lidar = LIDAR(LIDAR_MAX_DISTANCE)
+                self._lidar = LIDAR(
+                    LIDAR_MAX_DISTANCE,
+                    fov=lidar_fov,
+                    resolution=lidar_fov / lidar_rays,
+                )
                 self._get_observation = self._get_observation_lidar
             else:
+                self._init_features_buffers()
                 self._get_observation = self._get_observation_features
 
         if render_mode is not None:
+            import pygame
+
             self._fps_clock = pygame.time.Clock()
             self._display = None
             self._surface = pygame.Surface(screen_size)
@@ -175,6 +341,9 @@ class FlappyBirdEnv(gymnasium.Env):
                 pipe_color=pipe_color,
                 bg_type=background,
             )
+            self._player_atlas = PlayerAtlas(self._images["player"], decode=False)
+            # LIDAR's private zone overlays, by visible rotation
+            self._private_zones = {}
             if audio_on:
                 self._sounds = utils.load_sounds()
 
@@ -182,7 +351,8 @@ class FlappyBirdEnv(gymnasium.Env):
         self,
         action: Union[Actions, int],
     ) -> Tuple[np.ndarray, float, bool, Dict]:
-        """Given an action, updates the game state.
+        """Given an action, updates the game state. The action is repeated for
+        `frame_skip` frames.
 
         Args:
             action (Union[FlappyBirdLogic.Actions, int]): The action taken by
@@ -194,7 +364,8 @@ class FlappyBirdEnv(gymnasium.Env):
                 * an observation (horizontal distance to the next pipe
                   difference between the player's y position and the next hole's
                   y position)
-                * a reward (alive = +0.1, pipe = +1.0, dead = -1.0)
+                * a reward (alive = +0.1, pipe = +1.0, dead = -1.0), summed
+                  over the step's frames
                 * a status report (`True` if the game is over and `False`
                   otherwise)
                 * an info dictionary
@@ -208,149 +379,170 @@ class FlappyBirdEnv(gymnasium.Env):
         Returns:
             `True` if the player is alive and `False` otherwise.
         """
-        terminal = False
-        reward = None
+        terminal = truncated = False
+        total_reward = 0
 
-        self._sound_cache = None
-        if action == Actions.FLAP:
-            if self._player_y > -2 * PLAYER_HEIGHT:
-                self._player_vel_y = PLAYER_FLAP_ACC
-                self._player_flapped = True
-                self._sound_cache = "wing"
-
-        # check for score
-        player_mid_pos = self._player_x + PLAYER_WIDTH / 2
-        for pipe in self._upper_pipes:
-            pipe_mid_pos = pipe["x"] + PIPE_WIDTH / 2
-            if pipe_mid_pos <= player_mid_pos < pipe_mid_pos + 4:
-                self._score += 1
-                reward = 1  # reward for passed pipe
-                self._sound_cache = "point"
-
-        # player_index base_x change
-        if (self._loop_iter + 1) % 3 == 0:
-            self._player_idx = next(self._player_idx_gen)
-
-        self._loop_iter = (self._loop_iter + 1) % 30
-        self._ground["x"] = -((-self._ground["x"] + 100) % self._base_shift)
-
-        # rotate the player
-        if self._player_rot > -90:
-            self._player_rot -= PLAYER_VEL_ROT
-
-        # player's movement
-        if self._player_vel_y < PLAYER_MAX_VEL_Y and not self._player_flapped:
-            self._player_vel_y += PLAYER_ACC_Y
-
-        if self._player_flapped:
-            self._player_flapped = False
-
-            # more rotation to cover the threshold
-            # (calculated in visible rotation)
-            self._player_rot = 45
-
-        self._player_y += min(
-            self._player_vel_y, self._ground["y"] - self._player_y - PLAYER_HEIGHT
-        )
+        for frame in range(self._frame_skip):
+            reward = None
 
-        # move pipes to left
-        for up_pipe, low_pipe in zip(self._upper_pipes, self._lower_pipes):
-            up_pipe["x"] += PIPE_VEL_X
-            low_pipe["x"] += PIPE_VEL_X
+            self._sound_cache = None
+            if action == Actions.FLAP:
+                if self._player_y > -2 * PLAYER_HEIGHT:
+                    self._player_vel_y = PLAYER_FLAP_ACC
+                    self._player_flapped = True
+                    self._sound_cache = "wing"
+
+            # check for score
+            player_mid_pos = self._player_x + PLAYER_WIDTH / 2
+            for pipe_x in self._pipes.x.tolist():
+                pipe_mid_pos = pipe_x + PIPE_WIDTH / 2
+                if pipe_mid_pos <= player_mid_pos < pipe_mid_pos + 4:
+                    self._score += 1
+                    reward = 1  # reward for passed pipe
+                    self._sound_cache = "point"
+
+            # player_index base_x change
+            if (self._loop_iter + 1) % 3 == 0:
+                self._player_idx = PLAYER_IDX_CYCLE[self._player_idx_pos]
+                self._player_idx_pos = (self._player_idx_pos + 1) % len(
+                    PLAYER_IDX_CYCLE
+                )
 
-            # it is out of the screen
-            if up_pipe["x"] < -PIPE_WIDTH:
-                new_up_pipe, new_low_pipe = self._get_random_pipe()
-                up_pipe["x"] = new_up_pipe["x"]
-                up_pipe["y"] = new_up_pipe["y"]
-                low_pipe["x"] = new_low_pipe["x"]
-                low_pipe["y"] = new_low_pipe["y"]
+            self._loop_iter = (self._loop_iter + 1) % 30
+            self._ground["x"] = -((-self._ground["x"] + 100) % self._base_shift)
 
-        if self.render_mode == "human":
-            self.render()
+            # rotate the player
+            if self._player_rot > -90:
+                self._player_rot -= PLAYER_VEL_ROT
 
-        obs, reward_private_zone = self._get_observation()
-        if reward is None:
-            if reward_private_zone is not None:
-                reward = reward_private_zone
-            else:
-                reward = 0.1  # reward for staying alive
+            # player's movement
+            if self._player_vel_y < PLAYER_MAX_VEL_Y and not self._player_flapped:
+                self._player_vel_y += PLAYER_ACC_Y
 
-        # check
-        if self._debug and self._use_lidar:
-            # sort pipes by the distance between pipe and agent
-            up_pipe = sorted(
-                self._upper_pipes,
-                key=lambda x: np.sqrt(
-                    (self._player_x - x["x"]) ** 2
-                    + (self._player_y - (x["y"] + PIPE_HEIGHT)) ** 2
-                ),
-            )[0]
-            # find ray closest to the obstacle
-            min_index = np.argmin(obs)
-            min_value = obs[min_index] * LIDAR_MAX_DISTANCE
-            # mean approach to the obstacle
-            if "pipe_mean_value" in self._statistics:
-                self._statistics["pipe_mean_value"] = self._statistics[
-                    "pipe_mean_value"
-                ] * 0.99 + min_value * (1 - 0.99)
+            if self._player_flapped:
+                self._player_flapped = False
+
+                # more rotation to cover the threshold
+                # (calculated in visible rotation)
+                self._player_rot = 45
+
+            self._player_y += min(
+                self._player_vel_y, self._ground["y"] - self._player_y - PLAYER_HEIGHT
+            )
+
+            # move pipes to left
+            self._pipes.move(PIPE_VEL_X)
+
+            # the oldest (leftmost) pipe is out of the screen
+            if self._pipes.x[self._pipes.oldest] < -PIPE_WIDTH:
+                self._push_random_pipe(self._pipe_spawn_x)
+
+            if self.render_mode == "human":
+                self.render()
+
+            # check for crash
+            terminal = self._check_crash()
+            truncated = (self._score_limit is not None) and (
+                self._score >= self._score_limit
+            )
+            # the observation (and the frame) is only needed after the last frame
+            last = terminal or truncated or frame == self._frame_skip - 1
+            if last:
+                if self.render_mode == "rgb_array_list":
+                    self._collect_frame()
+                obs, reward_private_zone = self._get_observation()
             else:
-                self._statistics["pipe_mean_value"] = min_value
+                reward_private_zone = self._private_zone_reward()
+            if reward is None:
+                if reward_private_zone is not None:
+                    reward = reward_private_zone
+                else:
+                    reward = 0.1  # reward for staying alive
+
+            # check
+            if last and self._debug and self._use_lidar:
+                # find the pipe closest to the agent
+                closest_pipe_x = self._pipes.x[
+                    np.argmin(
+                        np.sqrt(
+                            (self._player_x - self._pipes.x) ** 2
+                            + (self._player_y - self._pipes.gap_top) ** 2
+                        )
+                    )
+                ]
+                # find ray closest to the obstacle
+                min_index = np.argmin(obs)
+                min_value = obs[min_index] * LIDAR_MAX_DISTANCE
+                # mean approach to the obstacle
+                if "pipe_mean_value" in self._statistics:
+                    self._statistics["pipe_mean_value"] = self._statistics[
+                        "pipe_mean_value"
+                    ] * 0.99 + min_value * (1 - 0.99)
+                else:
+                    self._statistics["pipe_mean_value"] = min_value
 
-            # Nearest to the pipe
-            if "pipe_min_value" in self._statistics:
-                if min_value < self._statistics["pipe_min_value"]:
+                # Nearest to the pipe
+                if "pipe_min_value" in self._statistics:
+                    if min_value < self._statistics["pipe_min_value"]:
+                        self._statistics["pipe_min_value"] = min_value
+                        self._statistics["pipe_min_index"] = min_index
+                else:
                     self._statistics["pipe_min_value"] = min_value
                     self._statistics["pipe_min_index"] = min_index
-            else:
-                self._statistics["pipe_min_value"] = min_value
-                self._statistics["pipe_min_index"] = min_index
 
-            # Nearest to the ground
-            diff = np.abs(self._player_y - self._ground["y"])
-            if "ground_min_value" in self._statistics:
-                if diff < self._statistics["ground_min_value"]:
+                # Nearest to the ground
+                diff = np.abs(self._player_y - self._ground["y"])
+                if "ground_min_value" in self._statistics:
+                    if diff < self._statistics["ground_min_value"]:
+                        self._statistics["ground_min_value"] = diff
+                else:
                     self._statistics["ground_min_value"] = diff
-            else:
-                self._statistics["ground_min_value"] = diff
 
-        # agent touch the top of the screen as punishment
-        if self._player_y < 0:
-            reward = -0.5
+            # agent touch the top of the screen as punishment
+            if self._player_y < 0:
+                reward = -0.5
 
-        # check for crash
-        if self._check_crash():
-            self._sound_cache = "hit"
-            reward = -1  # reward for dying
-            terminal = True
-            self._player_vel_y = 0
-            if self._debug and self._use_lidar:
-                if ((self._player_x + PLAYER_WIDTH) - up_pipe["x"]) > (0 + 5) and (
-                    self._player_x - up_pipe["x"]
-                ) < PIPE_WIDTH:
-                    print("BETWEEN PIPES")
-                elif ((self._player_x + PLAYER_WIDTH) - up_pipe["x"]) < (0 + 5):
-                    print("IN FRONT OF")
-                print(
-                    f"obs: [{self._statistics['pipe_min_index']},"
-                    f"{self._statistics['pipe_min_value']},"
-                    f"{self._statistics['pipe_mean_value']}],"
-                    f"Ground: {self._statistics['ground_min_value']}"
-                )
+            if terminal:
+                self._sound_cache = "hit"
+                reward = -1  # reward for dying
+                self._player_vel_y = 0
+                if self._debug and self._use_lidar:
+                    if ((self._player_x + PLAYER_WIDTH) - closest_pipe_x) > (
+                        0 + 5
+                    ) and (self._player_x - closest_pipe_x) < PIPE_WIDTH:
+                        print("BETWEEN PIPES")
+                    elif ((self._player_x + PLAYER_WIDTH) - closest_pipe_x) < (0 + 5):
+                        print("IN FRONT OF")
+                    print(
+                        f"obs: [{self._statistics['pipe_min_index']},"
+                        f"{self._statistics['pipe_min_value']},"
+                        f"{self._statistics['pipe_mean_value']}],"
+                        f"Ground: {self._statistics['ground_min_value']}"
+                    )
+
+            total_reward += reward
+            if last:
+                break
 
         info = {"score": self._score}
 
-        return (
-            obs,
-            reward,
-            terminal,
-            (self._score_limit is not None) and (self._score >= self._score_limit),
-            info,
-        )
+        return obs, total_reward, terminal, truncated, info
 
     def reset(self, seed=None, options=None):
-        """Resets the environment (starts a new game)."""
+        """Resets the environment (starts a new game).
+
+        Args:
+            seed (Optional[int]): Seed of the random generator.
+            options (Optional[Dict]): If it contains a `"pipe_course"` entry,
+                the fixed course replayed from now on (`None` for random
+                pipes), see the `pipe_course` argument.
+        """
         super().reset(seed=seed)
+        self._pipe_schedule.np_random = self.np_random
+        if options is not None and "pipe_course" in options:
+            self._pipe_schedule.set_course(options["pipe_course"])
+        else:
+            self._pipe_schedule.restart()
 
         # Player's info:
         self._player_x = int(self._screen_width * 0.2)
@@ -364,58 +556,266 @@ class FlappyBirdEnv(gymnasium.Env):
         if self._debug and self._use_lidar:
             self._statistics = {}
 
-        # Generate 3 new pipes to add to upper_pipes and lower_pipes lists
-        new_pipe1 = self._get_random_pipe()
-        new_pipe2 = self._get_random_pipe()
-        new_pipe3 = self._get_random_pipe()
-
-        # List of upper pipes:
-        self._upper_pipes = [
-            {"x": self._screen_width, "y": new_pipe1[0]["y"]},
-            {
-                "x": self._screen_width + (self._screen_width / 2),
-                "y": new_pipe2[0]["y"],
-            },
-            {
-                "x": self._screen_width + self._screen_width,
-                "y": new_pipe3[0]["y"],
-            },
-        ]
-
-        # List of lower pipes:
-        self._lower_pipes = [
-            {"x": self._screen_width, "y": new_pipe1[1]["y"]},
-            {
-                "x": self._screen_width + (self._screen_width / 2),
-                "y": new_pipe2[1]["y"],
-            },
-            {
-                "x": self._screen_width + self._screen_width,
-                "y": new_pipe3[1]["y"],
-            },
-        ]
+        # Generate 3 new pipes
+        self._pipes.clear()
+        self._push_random_pipe(self._screen_width)
+        self._push_random_pipe(self._screen_width + (self._screen_width / 2))
+        self._push_random_pipe(self._screen_width + self._screen_width)
 
         if self.render_mode == "human":
             self.render()
+        elif self.render_mode == "rgb_array_list":
+            self._num_frames = 0
+            self._frame_chunks = []
+            self._collect_frame()
 
         obs, _ = self._get_observation()
         info = {"score": self._score}
         return obs, info
 
-    def render(self) -> None:
-        """Renders the next frame."""
+    def get_state(self) -> np.ndarray:
+        """Returns a snapshot of the game's state.
+
+        The snapshot holds everything :meth:`step` depends on, including the
+        state of the random generator drawing the pipes, so stepping after
+        :meth:`set_state` reproduces the original trajectory exactly.
+
+        Returns:
+            A structured array of shape `()` and dtype
+            :data:`flappy_bird_gymnasium.core.STATE_DTYPE` (192 bytes).
+            Snapshots can be stacked into arrays of states.
+        """
+        self._pipe_schedule.np_random = self.np_random
+        return np.array(
+            (
+                self._player_y,
+                self._player_vel_y,
+                self._player_rot,
+                self._player_idx,
+                self._player_idx_pos,
+                self._loop_iter,
+                self._score,
+                self._ground["x"],
+                self._pipes.ordered,
+                *self._pipe_schedule.get_state(),
+            ),
+            dtype=STATE_DTYPE,
+        )
+
+    def set_state(self, state: np.ndarray) -> None:
+        """Restores a snapshot returned by :meth:`get_state`.
+
+        Args:
+            state (np.ndarray): The snapshot, of dtype
+                :data:`flappy_bird_gymnasium.core.STATE_DTYPE`.
+        """
+        (
+            self._player_y,
+            self._player_vel_y,
+            self._player_rot,
+            player_idx,
+            player_idx_pos,
+            loop_iter,
+            score,
+            self._ground["x"],
+            pipes,
+            rng,
+            schedule_pos,
+        ) = np.asarray(state, dtype=STATE_DTYPE).item()
+        self._player_x = int(self._screen_width * 0.2)
+        self._player_idx = int(player_idx)
+        self._player_idx_pos = int(player_idx_pos)
+        self._loop_iter = int(loop_iter)
+        self._score = int(score)
+        self._player_flapped = False
+
+        self._pipes.clear()
+        for pipe_x, gap_top, gap_bottom in pipes.tolist():
+            self._pipes.push(pipe_x, gap_top, gap_bottom)
+        self._pipe_schedule.np_random = self.np_random
+        self._pipe_schedule.set_state(rng, schedule_pos)
+
+    def upcoming_gaps(self, num_pipes: int) -> np.ndarray:
+        """Returns the y positions of the gaps (the upper pipes' bottom ends)
+        of the next pipes to appear, e.g. for lookahead observations.
+
+        Args:
+            num_pipes (int): Number of pipes to look ahead.
+
+        Returns:
+            An array of shape `(num_pipes,)`.
+        """
+        self._pipe_schedule.np_random = self.np_random
+        return self._pipe_schedule.upcoming(num_pipes)
+
+    def simulate(
+        self, state: Optional[np.ndarray], action_sequences: np.ndarray
+    ) -> SimulationResult:
+        """Plays several action plans from the same state, without rendering.
+
+        The plans are evaluated together, with vectorized physics, and don't
+        change the environment's own state. Since the pipes don't depend on
+        the player's actions, they are simulated once and shared by all the
+        plans. Each plan yields the rewards :meth:`step` would return if it was
+        played after :meth:`set_state`, each action being repeated for
+        `frame_skip` frames; the truncation at `score_limit` is not applied.
+
+        Args:
+            state (Optional[np.ndarray]): The starting state, as returned by
+                :meth:`get_state`. If `None`, the current state is used.
+            action_sequences (np.ndarray): The plans, an array of shape
+                `(K, H)` with `H` actions (steps) for each of the `K` plans.
+
+        Returns:
+            A :class:`SimulationResult`.
+        """
+        if state is None:
+            state = self.get_state()
+        action_sequences = np.asarray(action_sequences)
+        if action_sequences.ndim != 2:
+            raise ValueError(
+                "Expected action sequences of shape (K, H), got "
+                f"{action_sequences.shape}."
+            )
+        num_plans, horizon = action_sequences.shape
+
+        game = FlappyBirdLogic(
+            num_plans,
+            (self._screen_width, self._screen_height),
+            self._pipe_gap,
+            shared_pipes=True,
+            pipe_course=self._pipe_schedule.course,
+        )
+        all_plans = np.arange(num_plans)
+        game.set_state(np.broadcast_to(state, (num_plans,)), all_plans)
+
+        rewards = np.zeros((num_plans, horizon))
+        terminated_at = np.full(num_plans, -1, dtype=np.int64)
+        final_states = np.empty(num_plans, dtype=STATE_DTYPE)
+        alive = np.ones(num_plans, dtype=np.bool_)
+        flaps = action_sequences == Actions.FLAP
+        # the private zone's penalty only applies to the LIDAR observations
+        use_lidar = self._get_observation == self._get_observation_lidar
+
+        for t in range(horizon):
+            # each action is repeated for `frame_skip` frames, like in `step`
+            for _ in range(self._frame_skip):
+                passed, crashed = game.step(flaps[:, t], alive)
+                crashed &= alive
+
+                frame_rewards = np.where(passed > 0, 1.0, 0.1)
+                if use_lidar:
+                    in_private_zone = self._in_private_zone_batch(game, alive)
+                    frame_rewards[in_private_zone & (passed == 0)] = -0.5
+
+                # agent touch the top of the screen as punishment
+                frame_rewards[game.player_y < 0] = -0.5
+                frame_rewards[crashed] = -1.0  # reward for dying
+                rewards[alive, t] += frame_rewards[alive]
+
+                if np.any(crashed):
+                    game.player_vel_y[crashed] = 0
+                    crashed_plans = np.flatnonzero(crashed)
+                    terminated_at[crashed_plans] = t
+                    final_states[crashed_plans] = game.get_state(crashed_plans)
+                    alive &= ~crashed
+                    if not np.any(alive):
+                        break
+            if not np.any(alive):
+                break
+
+        if np.any(alive):
+            final_states[alive] = game.get_state(np.flatnonzero(alive))
+
+        return SimulationResult(rewards, terminated_at, final_states)
+
+    def _in_private_zone_batch(
+        self, game: FlappyBirdLogic, candidates: np.ndarray
+    ) -> np.ndarray:
+        """Tells which players of a :class:`FlappyBirdLogic` with shared pipes
+        have an obstacle in their private zone, as seen by the LIDAR sensor.
+
+        Scanning is expensive, so only the candidates lying near an obstacle
+        are scanned, see :func:`_near_obstacles`.
+        """
+        in_private_zone = np.zeros(game.num_games, dtype=np.bool_)
+        near = candidates & _near_obstacles(
+            game.player_x,
+            game.player_y,
+            game.pipes_x,
+            game.upper_pipes_y + PIPE_HEIGHT,
+            game.lower_pipes_y,
+            game.ground_y,
+        )
+
+        near = np.flatnonzero(near)
+        if len(near) > 0:
+            distances = self._lidar.scan_batch(
+                game.player_x,
+                game.player_y[near],
+                game.player_rot[near],
+                np.broadcast_to(game.pipes_x, (len(near), 3)),
+                np.broadcast_to(game.upper_pipes_y, (len(near), 3)),
+                np.broadcast_to(game.lower_pipes_y, (len(near), 3)),
+                game.ground_y,
+            )
+            in_private_zone[near] = np.any(distances < PLAYER_PRIVATE_ZONE, axis=1)
+        return in_private_zone
+
+    def _private_zone_reward(self) -> Optional[float]:
+        """The reward given by the LIDAR sensor when an obstacle is in the
+        player's private zone, without building an observation.
+
+        Used on the frames skipped by :meth:`step`. The sensor only scans when
+        an obstacle is near (see :meth:`_in_private_zone_batch`).
+        """
+        if self._get_observation != self._get_observation_lidar:
+            return None
+
+        near = _near_obstacles(
+            self._player_x,
+            np.array([self._player_y]),
+            self._pipes.x[np.newaxis],
+            self._pipes.gap_top[np.newaxis],
+            self._pipes.gap_bottom[np.newaxis],
+            self._ground["y"],
+        )
+        if not near[0]:
+            return None
+
+        distances = self._lidar.scan(
+            self._player_x,
+            self._player_y,
+            self._player_rot,
+            self._pipes.pipes,
+            self._ground,
+        )
+        return -0.5 if np.any(distances < PLAYER_PRIVATE_ZONE) else None
+
+    def render(self) -> Optional[Union[np.ndarray, List[np.ndarray]]]:
+        """Renders the next frame.
+
+        Returns:
+            In `"rgb_array"` mode, the current frame, of shape
+            `(height, width, 3)`. In `"rgb_array_list"` mode, the frames drawn
+            since the last call to :meth:`render` or :meth:`reset`. Otherwise,
+            `None`.
+        """
         ## If training mode is set, there will be no window in which the game is render
         if self.training_mode:
             self._draw_surface(show_score=False, show_rays=False)
             return
 
         if self.render_mode == "rgb_array":
-            # This is not used idk is with this code
-            self._draw_surface(show_score=False, show_rays=False)
-            # Flip the image to retrieve a correct aspect
-            v = np.transpose(pygame.surfarray.array3d(self._surface), axes=(1, 0, 2))
-            # print("Matricea din cod", v)
-            # return v
+            frame = self._draw_frame()
+            return frame.copy() if self._copy_frames else frame
+        elif self.render_mode == "rgb_array_list":
+            chunks, num_frames = self._frame_chunks, self._num_frames
+            self._frame_chunks, self._num_frames = [], 0
+            return [
+                chunks[i // self._FRAMES_PER_CHUNK][i % self._FRAMES_PER_CHUNK]
+                for i in range(num_frames)
+            ]
         else:
             self._draw_surface(show_score=False, show_rays=self._use_lidar)
             if self._display is None:
@@ -427,23 +827,17 @@ class FlappyBirdEnv(gymnasium.Env):
     def close(self):
         """Closes the environment."""
         if self.render_mode is not None:
+            import pygame
+
             pygame.display.quit()
             pygame.quit()
         super().close()
 
-    def _get_random_pipe(self) -> Dict[str, int]:
-        """Returns a randomly generated pipe."""
+    def _push_random_pipe(self, pipe_x: float) -> None:
+        """Replaces the oldest pipe with the next one of the schedule."""
         # y of gap between upper and lower pipe
-        gapYs = [20, 30, 40, 50, 60, 70, 80, 90]
-        index = self.np_random.integers(0, len(gapYs))
-        gap_y = gapYs[index]
-        gap_y += int(self._ground["y"] * 0.2)
-
-        pipe_x = self._screen_width + PIPE_WIDTH + (self._screen_width * 0.2)
-        return [
-            {"x": pipe_x, "y": gap_y - PIPE_HEIGHT},  # upper pipe
-            {"x": pipe_x, "y": gap_y + self._pipe_gap},  # lower pipe
-        ]
+        gap_y = self._pipe_schedule.next_gap_y()
+        self._pipes.push(pipe_x, gap_y, gap_y + self._pipe_gap)
 
     def _check_crash(self) -> bool:
         """Returns True if player collides with the ground (base) or a pipe."""
@@ -453,37 +847,43 @@ class FlappyBirdEnv(gymnasium.Env):
                 print("CRASH TO THE GROUND")
             return True
         else:
-            player_rect = pygame.Rect(
-                self._player_x, self._player_y, PLAYER_WIDTH, PLAYER_HEIGHT
-            )
-
-            for up_pipe, low_pipe in zip(self._upper_pipes, self._lower_pipes):
-                # upper and lower pipe rects
-                up_pipe_rect = pygame.Rect(
-                    up_pipe["x"], up_pipe["y"], PIPE_WIDTH, PIPE_HEIGHT
+            for pipe_x, gap_top, gap_bottom in self._pipes.pipes.tolist():
+                # check collision
+                up_collide = rects_collide(
+                    self._player_x,
+                    self._player_y,
+                    PLAYER_WIDTH,
+                    PLAYER_HEIGHT,
+                    pipe_x,
+                    gap_top - PIPE_HEIGHT,
+                    PIPE_WIDTH,
+                    PIPE_HEIGHT,
                 )
-                low_pipe_rect = pygame.Rect(
-                    low_pipe["x"], low_pipe["y"], PIPE_WIDTH, PIPE_HEIGHT
+                low_collide = rects_collide(
+                    self._player_x,
+                    self._player_y,
+                    PLAYER_WIDTH,
+                    PLAYER_HEIGHT,
+                    pipe_x,
+                    gap_bottom,
+                    PIPE_WIDTH,
+                    PIPE_HEIGHT,
                 )
 
-                # check collision
-                up_collide = player_rect.colliderect(up_pipe_rect)
-                low_collide = player_rect.colliderect(low_pipe_rect)
-
                 if self._debug and self._use_lidar:
                     if up_collide:
                         print("CRASH TO UPPER PIPE")
                         print(
-                            f"up_pipe: {[up_pipe['x'], up_pipe['y']+PIPE_HEIGHT]},"
-                            f"low_pipe: {low_pipe},"
+                            f"up_pipe: {[pipe_x, gap_top]},"
+                            f"low_pipe: {[pipe_x, gap_bottom]},"
                             f"player: [{self._player_x}, {self._player_y}]"
                         )
                         return True
                     if low_collide:
                         print("CRASH TO LOWER PIPE")
                         print(
-                            f"up_pipe: {[up_pipe['x'], up_pipe['y']+PIPE_HEIGHT]},"
-                            f"low_pipe: {low_pipe},"
+                            f"up_pipe: {[pipe_x, gap_top]},"
+                            f"low_pipe: {[pipe_x, gap_bottom]},"
                             f"player: [{self._player_x}, {self._player_y}]"
                         )
                         return True
@@ -493,67 +893,83 @@ class FlappyBirdEnv(gymnasium.Env):
 
         return False
 
+    def _draw_frame(self) -> np.ndarray:
+        """Draws the current frame (without the score and the LIDAR's rays)
+        into the rasterizer's buffer."""
+        return self._rasterizer.draw(
+            self._player_x,
+            self._player_y,
+            self._player_rot,
+            self._player_idx,
+            self._pipes.pipes,
+            self._ground["x"],
+            self._ground["y"],
+        )
+
+    def _collect_frame(self) -> None:
+        """Stores the current frame, to be returned by :meth:`render` in
+        `"rgb_array_list"` mode."""
+        chunk_idx, frame_idx = divmod(self._num_frames, self._FRAMES_PER_CHUNK)
+        if chunk_idx == len(self._frame_chunks):
+            frame_shape = self._rasterizer.frame.shape
+            self._frame_chunks.append(
+                np.empty((self._FRAMES_PER_CHUNK, *frame_shape), dtype=np.uint8)
+            )
+        self._frame_chunks[chunk_idx][frame_idx] = self._draw_frame()
+        self._num_frames += 1
+
     def _get_observation_pixels(self) -> Tuple[np.ndarray, None]:
-        res = np.transpose(pygame.surfarray.array3d(self._surface), axes=(1, 0, 2))
-        return (res, None)
-
-    def _get_observation_features(self) -> np.ndarray:
-        pipes = []
-        for up_pipe, low_pipe in zip(self._upper_pipes, self._lower_pipes):
-            # the pipe is behind the screen?
-            if low_pipe["x"] > self._screen_width:
-                pipes.append((self._screen_width, 0, self._screen_height))
-            else:
-                pipes.append(
-                    (low_pipe["x"], (up_pipe["y"] + PIPE_HEIGHT), low_pipe["y"])
-                )
+        obs = self._pixel_observation(self._draw_frame())
+        return (obs.copy() if self._copy_obs else obs), None
+
+    def _init_features_buffers(self) -> None:
+        """Preallocates the buffer the features observations are built in."""
+        self._obs_buffer = np.zeros(12, dtype=self._obs_dtype)
+        self._obs_scale = np.array(
+            3 * [self._screen_width, self._screen_height, self._screen_height]
+            + [self._screen_height, PLAYER_MAX_VEL_Y, 90],
+            dtype=np.float64,
+        )
+        # features of a pipe behind the screen
+        self._pipe_behind_screen = (self._screen_width, 0, self._screen_height)
 
-        pipes = sorted(pipes, key=lambda x: x[0])
-        pos_y = self._player_y
-        vel_y = self._player_vel_y
-        rot = self._player_rot
+    def _get_observation_features(self) -> Tuple[np.ndarray, None]:
+        obs = self._obs_buffer
 
-        if self._normalize_obs:
-            pipes = [
-                (
-                    h / self._screen_width,
-                    v1 / self._screen_height,
-                    v2 / self._screen_height,
-                )
-                for h, v1, v2 in pipes
-            ]
-            pos_y /= self._screen_height
-            vel_y /= PLAYER_MAX_VEL_Y
-            rot /= 90
-
-        return (
-            np.array(
-                [
-                    pipes[0][0],  # the last pipe's horizontal position
-                    pipes[0][1],  # the last top pipe's vertical position
-                    pipes[0][2],  # the last bottom pipe's vertical position
-                    pipes[1][0],  # the next pipe's horizontal position
-                    pipes[1][1],  # the next top pipe's vertical position
-                    pipes[1][2],  # the next bottom pipe's vertical position
-                    pipes[2][0],  # the next next pipe's horizontal position
-                    pipes[2][1],  # the next next top pipe's vertical position
-                    pipes[2][2],  # the next next bottom pipe's vertical position
-                    pos_y,  # player's vertical position
-                    vel_y,  # player's vertical velocity
-                    rot,  # player's rotation
-                ]
-            ),
-            None,
+        # the ring buffer keeps the pipes sorted from the last to the next next
+        # one, so they don't need to be sorted here
+        (x0, top0, bottom0), (x1, top1, bottom1), (x2, top2, bottom2) = [
+            pipe if pipe[0] <= self._screen_width else self._pipe_behind_screen
+            for pipe in self._pipes.ordered.tolist()
+        ]
+
+        obs[:] = (
+            x0,  # the last pipe's horizontal position
+            top0,  # the last top pipe's vertical position
+            bottom0,  # the last bottom pipe's vertical position
+            x1,  # the next pipe's horizontal position
+            top1,  # the next top pipe's vertical position
+            bottom1,  # the next bottom pipe's vertical position
+            x2,  # the next next pipe's horizontal position
+            top2,  # the next next top pipe's vertical position
+            bottom2,  # the next next bottom pipe's vertical position
+            self._player_y,  # player's vertical position
+            self._player_vel_y,  # player's vertical velocity
+            self._player_rot,  # player's rotation
         )
 
-    def _get_observation_lidar(self) -> np.ndarray:
+        if self._normalize_obs:
+            obs /= self._obs_scale
+
+        return (obs.copy() if self._copy_obs else obs), None
+
+    def _get_observation_lidar(self) -> Tuple[np.ndarray, Optional[float]]:
         # obstacles
         distances = self._lidar.scan(
             self._player_x,
             self._player_y,
             self._player_rot,
-            self._upper_pipes,
-            self._lower_pipes,
+            self._pipes.pipes,
             self._ground,
         )
 
@@ -565,13 +981,15 @@ class FlappyBirdEnv(gymnasium.Env):
         if self._normalize_obs:
             distances = distances / LIDAR_MAX_DISTANCE
 
-        return distances, reward
+        return distances.astype(self._obs_dtype, copy=False), reward
 
     def _make_display(self) -> None:
         """Initializes the pygame's display.
 
         Required for drawing images on the screen.
         """
+        import pygame
+
         self._display = pygame.display.set_mode(
             (self._screen_width, self._screen_height)
         )
@@ -585,6 +1003,7 @@ class FlappyBirdEnv(gymnasium.Env):
                 self._images[name] = (
                     value.convert() if name == "background" else value.convert_alpha()
                 )
+        self._player_atlas = PlayerAtlas(self._images["player"], decode=False)
 
     def _draw_score(self) -> None:
         """Draws the score in the center of the surface."""
@@ -602,48 +1021,24 @@ class FlappyBirdEnv(gymnasium.Env):
             )
             x_offset += self._images["numbers"][digit].get_width()
 
-    def _draw_surface(self, show_score: bool = True, show_rays: bool = True) -> None:
-        """Re-draws the renderer's surface.
-
-        This method updates the renderer's surface by re-drawing it according to
-        the current state of the game.
+    def _private_zone_surface(self, visible_rot: float) -> "Surface":
+        """Returns the LIDAR's private zone overlay, rotated like the player.
 
-        Args:
-            show_score (bool): Whether to draw the player's score or not.
+        The overlay is drawn and rotated for every visible rotation of the
+        player the first time it's needed, then reused.
         """
-        # Background
-        if self._images["background"] is not None:
-            self._surface.blit(self._images["background"], (0, 0))
-        else:
-            self._surface.fill(FILL_BACKGROUND_COLOR)
+        import pygame
 
-        # Pipes
-        for up_pipe, low_pipe in zip(self._upper_pipes, self._lower_pipes):
-            self._surface.blit(self._images["pipe"][0], (up_pipe["x"], up_pipe["y"]))
-            self._surface.blit(self._images["pipe"][1], (low_pipe["x"], low_pipe["y"]))
-
-        # Base (ground)
-        self._surface.blit(self._images["base"], (self._ground["x"], self._ground["y"]))
-
-        # Getting player's rotation
-        visible_rot = PLAYER_ROT_THR
-        if self._player_rot <= PLAYER_ROT_THR:
-            visible_rot = self._player_rot
-
-        # LIDAR
-        if show_rays:
-            self._lidar.draw(self._surface, self._player_x, self._player_y)
-
-            # Draw private zone
-            target_rect = pygame.Rect(
-                self._player_x - PLAYER_PRIVATE_ZONE,
-                self._player_y - PLAYER_PRIVATE_ZONE,
-                PLAYER_PRIVATE_ZONE * 2 + PLAYER_WIDTH,
-                PLAYER_PRIVATE_ZONE * 2 + PLAYER_HEIGHT,
+        if not self._private_zones:
+            zone_surf = pygame.Surface(
+                (
+                    int(PLAYER_PRIVATE_ZONE * 2 + PLAYER_WIDTH),
+                    int(PLAYER_PRIVATE_ZONE * 2 + PLAYER_HEIGHT),
+                ),
+                pygame.SRCALPHA,
             )
-            shape_surf = pygame.Surface(target_rect.size, pygame.SRCALPHA)
             pygame.draw.circle(
-                shape_surf,
+                zone_surf,
                 "blue",
                 (
                     PLAYER_PRIVATE_ZONE + PLAYER_WIDTH,
@@ -657,7 +1052,7 @@ class FlappyBirdEnv(gymnasium.Env):
                 draw_bottom_right=True,
             )
             pygame.draw.circle(
-                shape_surf,
+                zone_surf,
                 "blue",
                 (PLAYER_PRIVATE_ZONE, PLAYER_PRIVATE_ZONE + (PLAYER_HEIGHT / 2)),
                 PLAYER_PRIVATE_ZONE,
@@ -668,7 +1063,7 @@ class FlappyBirdEnv(gymnasium.Env):
                 draw_bottom_right=False,
             )
             pygame.draw.circle(
-                shape_surf,
+                zone_surf,
                 "blue",
                 (PLAYER_PRIVATE_ZONE + (PLAYER_WIDTH / 2), PLAYER_PRIVATE_ZONE),
                 PLAYER_PRIVATE_ZONE,
@@ -679,7 +1074,7 @@ class FlappyBirdEnv(gymnasium.Env):
                 draw_bottom_right=False,
             )
             pygame.draw.circle(
-                shape_surf,
+                zone_surf,
                 "blue",
                 (
                     PLAYER_PRIVATE_ZONE + (PLAYER_WIDTH / 2),
@@ -692,7 +1087,58 @@ class FlappyBirdEnv(gymnasium.Env):
                 draw_bottom_left=True,
                 draw_bottom_right=True,
             )
-            rotated_surf = pygame.transform.rotate(shape_surf, visible_rot)
+            self._private_zone = zone_surf
+            for rot in VISIBLE_ROTATIONS:
+                self._private_zones[rot] = pygame.transform.rotate(zone_surf, rot)
+
+        rotated_surf = self._private_zones.get(visible_rot)
+        if rotated_surf is None:
+            rotated_surf = pygame.transform.rotate(self._private_zone, visible_rot)
+            self._private_zones[visible_rot] = rotated_surf
+        return rotated_surf
+
+    def _draw_surface(self, show_score: bool = True, show_rays: bool = True) -> None:
+        """Re-draws the renderer's surface.
+
+        This method updates the renderer's surface by re-drawing it according to
+        the current state of the game.
+
+        Args:
+            show_score (bool): Whether to draw the player's score or not.
+        """
+        import pygame
+
+        # Background
+        if self._images["background"] is not None:
+            self._surface.blit(self._images["background"], (0, 0))
+        else:
+            self._surface.fill(FILL_BACKGROUND_COLOR)
+
+        # Pipes
+        for pipe_x, gap_top, gap_bottom in self._pipes.pipes:
+            self._surface.blit(self._images["pipe"][0], (pipe_x, gap_top - PIPE_HEIGHT))
+            self._surface.blit(self._images["pipe"][1], (pipe_x, gap_bottom))
+
+        # Base (ground)
+        self._surface.blit(self._images["base"], (self._ground["x"], self._ground["y"]))
+
+        # Getting player's rotation
+        visible_rot = PLAYER_ROT_THR
+        if self._player_rot <= PLAYER_ROT_THR:
+            visible_rot = self._player_rot
+
+        # LIDAR
+        if show_rays:
+            self._lidar.draw(self._surface, self._player_x, self._player_y)
+
+            # Draw private zone
+            target_rect = pygame.Rect(
+                self._player_x - PLAYER_PRIVATE_ZONE,
+                self._player_y - PLAYER_PRIVATE_ZONE,
+                PLAYER_PRIVATE_ZONE * 2 + PLAYER_WIDTH,
+                PLAYER_PRIVATE_ZONE * 2 + PLAYER_HEIGHT,
+            )
+            rotated_surf = self._private_zone_surface(visible_rot)
             self._surface.blit(
                 rotated_surf, rotated_surf.get_rect(center=target_rect.center)
             )
@@ -703,14 +1149,10 @@ class FlappyBirdEnv(gymnasium.Env):
             self._draw_score()
 
         # Player
-        player_surface = pygame.transform.rotate(
-            self._images["player"][self._player_idx],
-            visible_rot,
-        )
-        player_surface_rect = player_surface.get_rect(
-            topleft=(self._player_x, self._player_y)
+        self._surface.blit(
+            self._player_atlas.surface(self._player_idx, self._player_rot),
+            (self._player_x, self._player_y),
         )
-        self._surface.blit(player_surface, player_surface_rect)
 
     def _update_display(self) -> None:
         """Updates the display with the current surface of the renderer.
@@ -727,6 +1169,8 @@ class FlappyBirdEnv(gymnasium.Env):
                 "call the `make_display()` method."
             )
 
+        import pygame
+
         pygame.event.get()
         self._display.blit(self._surface, [0, 0])
         pygame.display.update()
@@ -0,0 +1,212 @@
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""Multithreaded implementation of the Flappy Bird vector environment.
+
+Most of the time of a batched step is spent in NumPy operations, which release
+the GIL. The sub-environments are thus split into contiguous blocks, stepped
+concurrently on a thread pool, which avoids the start-up cost and the
+communication of worker processes. Each block writes its results directly into
+preallocated arrays.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import gymnasium
+import numpy as np
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import batch_space
+
+from flappy_bird_gymnasium.envs.flappy_bird_async_vector_env import _make_block_env
+
+
+class FlappyBirdThreadedVectorEnv(gymnasium.vector.VectorEnv):
+    """Multithreaded version of :class:`FlappyBirdVectorEnv`.
+
+    The sub-environments are stepped by `num_threads` threads, each one in
+    charge of a contiguous block of sub-environments, which it steps in a
+    single batch. Resetting with `seed=s` yields the same trajectories as
+    :class:`FlappyBirdVectorEnv` reset with the same seed.
+
+    Args:
+        num_envs (int): Number of sub-environments.
+        num_threads (Optional[int]): Number of threads. Defaults to the number
+            of CPUs (but not more than `num_envs`).
+        copy (bool): If `False`, the observations, rewards, terminations and
+            truncations are returned as views of internal arrays, which are
+            overwritten by the next call to :meth:`step` or :meth:`reset`.
+        **env_kwargs: Arguments of the sub-environments, as for
+            :class:`FlappyBirdVectorEnv`, or, with `use_pixels=True`, for
+            :class:`FlappyBirdEnv`.
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(
+        self,
+        num_envs: int = 1,
+        num_threads: Optional[int] = None,
+        copy: bool = True,
+        **env_kwargs: Any,
+    ) -> None:
+        self.num_envs = num_envs
+        self.render_mode = None
+        self._copy = copy
+
+        if num_threads is None:
+            num_threads = os.cpu_count() or 1
+        num_threads = max(1, min(num_threads, num_envs))
+        bounds = np.linspace(0, num_envs, num_threads + 1).astype(int)
+        self._blocks = [slice(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])]
+        self._executor = ThreadPoolExecutor(
+            max_workers=num_threads, thread_name_prefix="FlappyBirdWorker"
+        )
+        self._envs: List[gymnasium.vector.VectorEnv] = []
+        for block in self._blocks:
+            self._envs.append(_make_block_env(block.stop - block.start, env_kwargs))
+
+        self.single_observation_space = self._envs[0].single_observation_space
+        self.single_action_space = gymnasium.spaces.Discrete(2)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        space = self.observation_space
+        self._observations = np.zeros(space.shape, dtype=space.dtype)
+        self._rewards = np.zeros(num_envs)
+        self._terminations = np.zeros(num_envs, dtype=np.bool_)
+        self._truncations = np.zeros(num_envs, dtype=np.bool_)
+        self._scores = np.zeros(num_envs, dtype=np.int64)
+
+    @property
+    def num_threads(self) -> int:
+        """Number of threads stepping the sub-environments."""
+        return len(self._blocks)
+
+    def reset(
+        self,
+        *,
+        seed: Optional[Union[int, Sequence[Optional[int]]]] = None,
+        options: Optional[Dict] = None,
+    ) -> Tuple[np.ndarray, Dict]:
+        """Resets the sub-environments (starts new games).
+
+        Args:
+            seed (Optional[Union[int, Sequence[Optional[int]]]]): Either a
+                single seed, in which case the sub-environments are seeded
+                with `seed, seed + 1, ...`, or one seed per sub-environment.
+            options (Optional[Dict]): If it contains a boolean `"reset_mask"`
+                array, only the masked sub-environments are reset.
+
+        Returns:
+            The batched observations and an info dictionary.
+        """
+        if seed is None:
+            seed = [None] * self.num_envs
+        elif isinstance(seed, int):
+            seed = [seed + i for i in range(self.num_envs)]
+        if len(seed) != self.num_envs:
+            raise ValueError(
+                "If seeds are passed as a list the length must match "
+                f"num_envs={self.num_envs} but got length={len(seed)}."
+            )
+        options = dict(options) if options is not None else {}
+        reset_mask = options.pop("reset_mask", None)
+
+        def reset_block(index: int) -> None:
+            block = self._blocks[index]
+            block_options = dict(options)
+            if reset_mask is not None:
+                block_mask = np.asarray(reset_mask, dtype=np.bool_)[block]
+                if not np.any(block_mask):
+                    return
+                block_options["reset_mask"] = block_mask
+            obs, info = self._envs[index].reset(
+                seed=list(seed[block]), options=block_options or None
+            )
+            self._observations[block] = obs
+            self._scores[block] = info["score"]
+
+        self._run(reset_block)
+        return self._result(self._observations), self._info()
+
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """Advances all the sub-environments by one frame.
+
+        Args:
+            actions (np.ndarray): One action per sub-environment.
+
+        Returns:
+            A tuple containing batched observations, rewards, terminations,
+            truncations and an info dictionary.
+        """
+        actions = np.asarray(actions)
+
+        def step_block(index: int) -> None:
+            block = self._blocks[index]
+            (
+                self._observations[block],
+                self._rewards[block],
+                self._terminations[block],
+                self._truncations[block],
+                info,
+            ) = self._envs[index].step(actions[block])
+            self._scores[block] = info["score"]
+
+        self._run(step_block)
+        return (
+            self._result(self._observations),
+            self._result(self._rewards),
+            self._result(self._terminations),
+            self._result(self._truncations),
+            self._info(),
+        )
+
+    def close_extras(self, **kwargs: Any) -> None:
+        """Stops the threads and closes the sub-environments."""
+        self._executor.shutdown()
+        for env in self._envs:
+            env.close()
+
+    def _run(self, function) -> None:
+        """Calls `function` with the index of every block, on the threads."""
+        if len(self._blocks) == 1:
+            function(0)
+            return
+        futures = [
+            self._executor.submit(function, index) for index in range(len(self._blocks))
+        ]
+        for future in futures:
+            future.result()
+
+    def _result(self, array: np.ndarray) -> np.ndarray:
+        return array.copy() if self._copy else array
+
+    def _info(self) -> Dict[str, np.ndarray]:
+        return {
+            "score": self._scores.copy(),
+            "_score": np.ones(self.num_envs, dtype=np.bool_),
+        }
@@ -0,0 +1,300 @@
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""Batched implementation of the Flappy Bird gymnasium environment.
+
+The game's state of all the sub-environments is kept as NumPy arrays (one array
+per quantity, one row per sub-environment) by :class:`FlappyBirdLogic`, so a
+single call to :meth:`step` advances every bird and every pipe with a handful of
+vectorized operations.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import gymnasium
+import numpy as np
+from gymnasium.utils import seeding
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import batch_space
+
+from flappy_bird_gymnasium.core import FlappyBirdLogic
+from flappy_bird_gymnasium.envs.constants import (
+    LIDAR_MAX_DISTANCE,
+    PIPE_HEIGHT,
+    PLAYER_MAX_VEL_Y,
+    PLAYER_PRIVATE_ZONE,
+)
+from flappy_bird_gymnasium.envs.lidar import LIDAR
+
+
+class FlappyBirdVectorEnv(gymnasium.vector.VectorEnv):
+    """Natively vectorized version of :class:`FlappyBirdEnv`.
+
+    Each sub-environment follows exactly the same rules as a standalone
+    :class:`FlappyBirdEnv`: resetting with `seed=s` yields the same
+    trajectories as `N` independent environments reset with the seeds
+    `s, s + 1, ..., s + N - 1`. Sub-environments are automatically reset on the
+    step following the end of their episode (`"next-step"` autoreset).
+
+    Args:
+        num_envs (int): Number of sub-environments.
+        screen_size (Tuple[int, int]): The screen's width and height.
+        normalize_obs (bool): If `True`, the observations will be normalized
+            before being returned.
+        use_lidar (bool): If `True`, the observations are the distances
+            measured by the LIDAR sensor instead of the game's features.
+        lidar_rays (int): Number of rays cast by the LIDAR sensor.
+        lidar_fov (float): The LIDAR sensor's field of view, in degrees. The
+            rays are spread evenly over it.
+        pipe_gap (int): Space between a lower and an upper pipe.
+        score_limit (Optional[int]): If set, an episode is truncated once its
+            score reaches this value.
+        pipe_course (Optional[Union[int, Sequence[int]]]): If set, every
+            episode replays the same pipes: either the pipes drawn from this
+            seed, or this sequence of gap indices, repeated. See
+            :class:`FlappyBirdEnv`.
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(
+        self,
+        num_envs: int = 1,
+        screen_size: Tuple[int, int] = (288, 512),
+        normalize_obs: bool = True,
+        use_lidar: bool = False,
+        lidar_rays: int = 180,
+        lidar_fov: float = 180,
+        pipe_gap: int = 100,
+        score_limit: Optional[int] = None,
+        pipe_course: Optional[Union[int, Sequence[int]]] = None,
+    ) -> None:
+        self.num_envs = num_envs
+        self.render_mode = None
+        self._score_limit = score_limit
+
+        self.single_action_space = gymnasium.spaces.Discrete(2)
+        if use_lidar:
+            if normalize_obs:
+                self.single_observation_space = gymnasium.spaces.Box(
+                    0.0, 1.0, shape=(lidar_rays,), dtype=np.float64
+                )
+            else:
+                self.single_observation_space = gymnasium.spaces.Box(
+                    0.0, np.inf, shape=(lidar_rays,), dtype=np.float64
+                )
+        else:
+            if normalize_obs:
+                self.single_observation_space = gymnasium.spaces.Box(
+                    -1.0, 1.0, shape=(12,), dtype=np.float64
+                )
+            else:
+                self.single_observation_space = gymnasium.spaces.Box(
+                    -np.inf, np.inf, shape=(12,), dtype=np.float64
+                )
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        self._screen_width = screen_size[0]
+        self._screen_height = screen_size[1]
+        self._normalize_obs = normalize_obs
+
+        if use_lidar:
+            self._lidar = LIDAR(
+                LIDAR_MAX_DISTANCE, fov=lidar_fov, resolution=lidar_fov / lidar_rays
+            )
+            self._get_observation = self._get_observation_lidar
+        else:
+            self._get_observation = self._get_observation_features
+
+        self._game = FlappyBirdLogic(
+            num_envs, screen_size, pipe_gap, pipe_course=pipe_course
+        )
+        self._autoreset_envs = np.zeros(num_envs, dtype=np.bool_)
+
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """Advances all the sub-environments by one frame.
+
+        Sub-environments whose episode ended in the previous call are reset
+        instead of stepped; their reward is zero and their observation is the
+        first observation of the new episode.
+
+        Args:
+            actions (np.ndarray): One action per sub-environment. Zero (0)
+                means "do nothing" and one (1) means "flap".
+
+        Returns:
+            A tuple containing batched observations, rewards, terminations,
+            truncations and an info dictionary.
+        """
+        actions = np.asarray(actions)
+        autoreset = self._autoreset_envs
+        active = ~autoreset
+
+        game = self._game
+        passed, terminations = game.step(actions == 1, active)
+        touched_top = game.player_y < 0
+
+        if self._score_limit is not None:
+            truncations = game.score >= self._score_limit
+        else:
+            truncations = np.zeros(self.num_envs, dtype=np.bool_)
+
+        if np.any(autoreset):
+            game.reset(np.flatnonzero(autoreset))
+            terminations[autoreset] = False
+            truncations[autoreset] = False
+
+        # the observation is taken before the crashed players are stopped
+        obs, in_private_zone = self._get_observation()
+        game.player_vel_y[terminations] = 0
+        self._autoreset_envs = terminations | truncations
+
+        rewards = np.where(passed > 0, 1.0, 0.1)
+        if in_private_zone is not None:
+            rewards[in_private_zone & (passed == 0)] = -0.5
+
+        # agent touch the top of the screen as punishment
+        rewards[touched_top] = -0.5
+        rewards[terminations] = -1.0  # reward for dying
+        rewards[autoreset] = 0.0
+
+        return obs, rewards, terminations, truncations, self._get_info()
+
+    def reset(
+        self,
+        *,
+        seed: Optional[Union[int, Sequence[Optional[int]]]] = None,
+        options: Optional[Dict] = None,
+    ) -> Tuple[np.ndarray, Dict]:
+        """Resets the sub-environments (starts new games).
+
+        Args:
+            seed (Optional[Union[int, Sequence[Optional[int]]]]): Either a
+                single seed, in which case the sub-environments are seeded
+                with `seed, seed + 1, ...`, or one seed per sub-environment.
+            options (Optional[Dict]): If it contains a boolean `"reset_mask"`
+                array, only the masked sub-environments are reset. A
+                `"pipe_course"` entry replaces the fixed course of the reset
+                sub-environments.
+
+        Returns:
+            The batched observations and an info dictionary.
+        """
+        if seed is None:
+            seed = [None] * self.num_envs
+        elif isinstance(seed, int):
+            seed = [seed + i for i in range(self.num_envs)]
+        if len(seed) != self.num_envs:
+            raise ValueError(
+                "If seeds are passed as a list the length must match "
+                f"num_envs={self.num_envs} but got length={len(seed)}."
+            )
+
+        if options is not None and "reset_mask" in options:
+            env_indices = np.flatnonzero(options["reset_mask"])
+        else:
+            env_indices = np.arange(self.num_envs)
+
+        for env_idx in env_indices:
+            if seed[env_idx] is not None:
+                self._game.np_randoms[env_idx], _ = seeding.np_random(seed[env_idx])
+            if options is not None and "pipe_course" in options:
+                self._game.pipe_schedules[env_idx].set_course(options["pipe_course"])
+
+        self._game.reset(env_indices)
+        self._autoreset_envs[env_indices] = False
+
+        obs, _ = self._get_observation()
+        return obs, self._get_info()
+
+    def upcoming_gaps(self, num_pipes: int) -> np.ndarray:
+        """Returns the y positions of the gaps of the next pipes to appear in
+        each sub-environment.
+
+        Args:
+            num_pipes (int): Number of pipes to look ahead.
+
+        Returns:
+            An array of shape `(num_envs, num_pipes)`.
+        """
+        return self._game.upcoming_gaps(num_pipes)
+
+    def _get_observation_features(self) -> Tuple[np.ndarray, None]:
+        game = self._game
+        # the pipe is behind the screen?
+        behind = game.pipes_x > self._screen_width
+        pipes_h = np.where(behind, self._screen_width, game.pipes_x)
+        pipes_v1 = np.where(behind, 0, game.upper_pipes_y + PIPE_HEIGHT)
+        pipes_v2 = np.where(behind, self._screen_height, game.lower_pipes_y)
+        pos_y = game.player_y
+        vel_y = game.player_vel_y
+        rot = game.player_rot
+
+        if self._normalize_obs:
+            pipes_h = pipes_h / self._screen_width
+            pipes_v1 = pipes_v1 / self._screen_height
+            pipes_v2 = pipes_v2 / self._screen_height
+            pos_y = pos_y / self._screen_height
+            vel_y = vel_y / PLAYER_MAX_VEL_Y
+            rot = rot / 90
+
+        # sort pipes from the last to the next next one
+        order = np.argsort(pipes_h, axis=1, kind="stable")
+
+        obs = np.empty((self.num_envs, 12))
+        obs[:, 0:9:3] = np.take_along_axis(pipes_h, order, axis=1)
+        obs[:, 1:9:3] = np.take_along_axis(pipes_v1, order, axis=1)
+        obs[:, 2:9:3] = np.take_along_axis(pipes_v2, order, axis=1)
+        obs[:, 9] = pos_y  # player's vertical position
+        obs[:, 10] = vel_y  # player's vertical velocity
+        obs[:, 11] = rot  # player's rotation
+        return obs, None
+
+    def _get_observation_lidar(self) -> Tuple[np.ndarray, np.ndarray]:
+        game = self._game
+        # obstacles
+        distances = self._lidar.scan_batch(
+            game.player_x,
+            game.player_y,
+            game.player_rot,
+            game.pipes_x,
+            game.upper_pipes_y,
+            game.lower_pipes_y,
+            game.ground_y,
+        )
+
+        in_private_zone = np.any(distances < PLAYER_PRIVATE_ZONE, axis=1)
+
+        if self._normalize_obs:
+            distances = distances / LIDAR_MAX_DISTANCE
+
+        return distances, in_private_zone
+
+    def _get_info(self) -> Dict[str, np.ndarray]:
+        return {
+            "score": self._game.score.copy(),
+            "_score": np.ones(self.num_envs, dtype=np.bool_),
+        }
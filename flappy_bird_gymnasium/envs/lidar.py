@@ -1,5 +1,6 @@
+import os
+
 import numpy as np
-import pygame
 
 from flappy_bird_gymnasium.envs.constants import (
     BASE_HEIGHT,
@@ -11,95 +12,284 @@ from flappy_bird_gymnasium.envs.constants import (
     PLAYER_WIDTH,
 )
 
+# Cohen-Sutherland region codes
+_CODE_BOTTOM, _CODE_TOP, _CODE_LEFT, _CODE_RIGHT = 1, 2, 4, 8
+
+# The player's visible rotation is an integer in this range (in degrees)
+_MIN_VISIBLE_ROT = -90
+_MAX_VISIBLE_ROT = PLAYER_ROT_THR
+
 
 class LIDAR:
-    def __init__(self, max_distance):
+    """LIDAR sensor casting rays from the player's torso.
+
+    The rays are spread evenly over the field of view, starting straight
+    above the player and turning clockwise. Their directions for every
+    visible rotation of the player are computed once, at construction time.
+
+    Args:
+        max_distance: Length of the rays.
+        fov: Field of view, in degrees.
+        resolution: Angle between two neighbouring rays, in degrees.
+        table_path: If set, the table of ray directions is loaded from this
+            `.npz` file, or written to it when the file doesn't exist yet or
+            was built for a different configuration.
+    """
+
+    def __init__(self, max_distance, fov=180, resolution=1, table_path=None):
         self._max_distance = max_distance
-        self.collisions = np.zeros((180, 2))
+        self._fov = fov
+        self._resolution = resolution
+        self.num_rays = int(round(fov / resolution))
+        self.collisions = np.zeros((self.num_rays, 2))
+
+        self._ray_directions = None
+        if table_path is not None and os.path.exists(table_path):
+            self._load_table(table_path)
+        if self._ray_directions is None:
+            self._build_table()
+            if table_path is not None:
+                self._save_table(table_path)
+
+        # end points of the rays relative to the LIDAR's position
+        self._ray_ends = self._max_distance * self._ray_directions
+
+    def _build_table(self):
+        """Computes the unit direction of every ray for each visible
+        rotation, shape `(rotations, rays, 2)`."""
+        angles = np.arange(self.num_rays) * self._resolution - self._fov / 2
+        rotations = np.arange(_MIN_VISIBLE_ROT, _MAX_VISIBLE_ROT + 1)
+        rad = np.radians(angles - rotations[:, np.newaxis])
+        self._ray_directions = np.stack([np.cos(rad), np.sin(rad)], axis=-1)
+
+    def _load_table(self, path):
+        with np.load(path) as table:
+            if (
+                table["fov"] == self._fov
+                and table["resolution"] == self._resolution
+                and table["directions"].shape
+                == (_MAX_VISIBLE_ROT - _MIN_VISIBLE_ROT + 1, self.num_rays, 2)
+            ):
+                self._ray_directions = table["directions"]
+
+    def _save_table(self, path):
+        np.savez(
+            path,
+            fov=self._fov,
+            resolution=self._resolution,
+            directions=self._ray_directions,
+        )
 
     def draw(self, surface, player_x, player_y):
-        for i in range(self.collisions.shape[0]):
-            pygame.draw.line(
-                surface,
-                "red",
-                (
-                    player_x + PLAYER_WIDTH,
-                    player_y + (PLAYER_HEIGHT / 2),
-                ),
-                (
-                    self.collisions[i][0],
-                    self.collisions[i][1],
-                ),
-                1,
-            )
+        import pygame
+
+        # a single polyline going back and forth between the player's torso
+        # and the rays' ends draws all the rays in one call
+        points = np.empty((2 * len(self.collisions), 2))
+        points[0::2] = (player_x + PLAYER_WIDTH, player_y + (PLAYER_HEIGHT / 2))
+        points[1::2] = self.collisions
+        pygame.draw.lines(surface, "red", False, points.tolist(), 1)
 
     def scan(
         self,
         player_x,
         player_y,
         player_rot,
-        upper_pipes,
-        lower_pipes,
+        pipes,
         ground,
     ):
-        result = np.empty([180])
+        distances, self.collisions = self.scan_batch(
+            player_x,
+            np.array([player_y]),
+            np.array([player_rot]),
+            pipes[np.newaxis, :, 0],
+            pipes[np.newaxis, :, 1] - PIPE_HEIGHT,
+            pipes[np.newaxis, :, 2],
+            ground["y"],
+            return_collisions=True,
+        )
+        self.collisions = self.collisions[0]
+        return distances[0]
+
+    def scan_batch(
+        self,
+        player_x,
+        player_y,
+        player_rot,
+        pipes_x,
+        upper_pipes_y,
+        lower_pipes_y,
+        ground_y,
+        return_collisions=False,
+    ):
+        """Scans the surroundings of `N` players at once.
+
+        Args:
+            player_x: The players' horizontal positions, a scalar or an array
+                of shape `(N,)`.
+            player_y: The players' vertical positions, shape `(N,)`.
+            player_rot: The players' rotations, shape `(N,)`.
+            pipes_x: Horizontal positions of each player's pipes, shape
+                `(N, P)`.
+            upper_pipes_y: Vertical positions of the upper pipes, shape
+                `(N, P)`.
+            lower_pipes_y: Vertical positions of the lower pipes, shape
+                `(N, P)`.
+            ground_y: Vertical position of the ground, a scalar or an array
+                of shape `(N,)`.
+            return_collisions: Whether to also return the point where each
+                ray stopped.
+
+        Returns:
+            The `(N, num_rays)` distances measured by the rays and, if
+            requested, the `(N, num_rays, 2)` collision points.
+        """
+        player_x = np.broadcast_to(player_x, player_y.shape)[:, np.newaxis]
+        ground_y = np.broadcast_to(ground_y, player_y.shape)[:, np.newaxis]
 
         # LIDAR position on torso
         offset_x = player_x + PLAYER_WIDTH
-        offset_y = player_y + (PLAYER_HEIGHT / 2)
+        offset_y = player_y[:, np.newaxis] + (PLAYER_HEIGHT / 2)
 
         # Getting player's rotation
-        visible_rot = PLAYER_ROT_THR
-        if player_rot <= PLAYER_ROT_THR:
-            visible_rot = player_rot
+        visible_rot = np.minimum(player_rot, PLAYER_ROT_THR).astype(np.intp)
+
+        # end points of the rays
+        collisions = self._ray_ends[visible_rot - _MIN_VISIBLE_ROT]
+        collisions[..., 0] += offset_x
+        collisions[..., 1] += offset_y
 
         # sort pipes from nearest to farthest
-        upper_pipes = sorted(upper_pipes, key=lambda pipe: pipe["x"])
-        lower_pipes = sorted(lower_pipes, key=lambda pipe: pipe["x"])
-
-        # get collisions with precision 1 degree
-        for i, angle in enumerate(range(0, 180, 1)):
-            rad = np.radians(angle - 90 - visible_rot)
-            x = self._max_distance * np.cos(rad) + offset_x
-            y = self._max_distance * np.sin(rad) + offset_y
-            line = (offset_x, offset_y, x, y)
-            self.collisions[i] = (x, y)
-
-            # check ground collision
-            ground_rect = pygame.Rect(0, ground["y"], BASE_WIDTH, BASE_HEIGHT)
-            collision = ground_rect.clipline(line)
-            if collision:
-                self.collisions[i] = collision[0]
-
-            # check pipe collision
-            for up_pipe, low_pipe in zip(upper_pipes, lower_pipes):
-                # upper and lower pipe rects
-                up_pipe_rect = pygame.Rect(
-                    up_pipe["x"], up_pipe["y"], PIPE_WIDTH, PIPE_HEIGHT
-                )
-                low_pipe_rect = pygame.Rect(
-                    low_pipe["x"], low_pipe["y"], PIPE_WIDTH, PIPE_HEIGHT
-                )
-
-                # check collision
-                collision_A = up_pipe_rect.clipline(line)
-                collision_B = low_pipe_rect.clipline(line)
-
-                if collision_A:
-                    self.collisions[i] = collision_A[0]
-                    break
-                elif collision_B:
-                    self.collisions[i] = collision_B[0]
-                    break
-
-            # check if collision is below ground
-            if self.collisions[i][1] > ground["y"]:
-                self.collisions[i][1] = ground["y"]
-
-            # calculate distance
-            result[i] = np.sqrt(
-                (offset_x - self.collisions[i][0]) ** 2
-                + (offset_y - self.collisions[i][1]) ** 2
-            )
-
-        return result
+        order = np.argsort(pipes_x, axis=1, kind="stable")
+        pipes_x = np.take_along_axis(pipes_x, order, axis=1)
+        upper_pipes_y = np.take_along_axis(upper_pipes_y, order, axis=1)
+        lower_pipes_y = np.take_along_axis(lower_pipes_y, order, axis=1)
+
+        # obstacles: the upper and lower rect of every pipe, then the ground
+        # (pygame truncates the rects' coordinates to integers)
+        num_pipes = pipes_x.shape[1]
+        rects_x = np.zeros((player_y.shape[0], 2 * num_pipes + 1), dtype=np.int64)
+        rects_y = np.empty_like(rects_x)
+        rects_x[:, 0:-1:2] = rects_x[:, 1:-1:2] = pipes_x
+        rects_y[:, 0:-1:2] = upper_pipes_y
+        rects_y[:, 1:-1:2] = lower_pipes_y
+        rects_y[:, -1:] = ground_y
+        rects_w = np.full(rects_x.shape[1], PIPE_WIDTH)
+        rects_h = np.full(rects_x.shape[1], PIPE_HEIGHT)
+        rects_w[-1] = BASE_WIDTH
+        rects_h[-1] = BASE_HEIGHT
+
+        env_idx, ray_idx, hit_x, hit_y = _clip_rays(
+            np.trunc(offset_x[:, 0]).astype(np.int64),
+            np.trunc(offset_y[:, 0]).astype(np.int64),
+            np.trunc(collisions[..., 0]).astype(np.int64),
+            np.trunc(collisions[..., 1]).astype(np.int64),
+            rects_x,
+            rects_y,
+            rects_w,
+            rects_h,
+        )
+
+        # the first pipe hit by a ray wins over the ground
+        first = np.ones(env_idx.shape, dtype=np.bool_)
+        first[1:] = (env_idx[1:] != env_idx[:-1]) | (ray_idx[1:] != ray_idx[:-1])
+        env_idx, ray_idx = env_idx[first], ray_idx[first]
+        collisions[env_idx, ray_idx, 0] = hit_x[first]
+        collisions[env_idx, ray_idx, 1] = hit_y[first]
+
+        # check if collision is below ground
+        np.minimum(collisions[..., 1], ground_y, out=collisions[..., 1])
+
+        # calculate distance
+        distances = np.sqrt(
+            (offset_x - collisions[..., 0]) ** 2 + (offset_y - collisions[..., 1]) ** 2
+        )
+
+        if return_collisions:
+            return distances, collisions
+        return distances
+
+
+def _trunc_div(num, den):
+    """Integer division rounding towards zero, like C's `/` operator."""
+    quotient = num // den
+    return quotient + ((num % den != 0) & ((num < 0) != (den < 0)))
+
+
+def _clip_rays(x1, y1, x2, y2, rects_x, rects_y, rects_w, rects_h):
+    """Clips rays against rects with the same integer arithmetic as
+    `pygame.Rect.clipline` (SDL's Cohen-Sutherland implementation).
+
+    Args:
+        x1, y1: Start point of the rays of each of the `N` environments, shape
+            `(N,)`.
+        x2, y2: End points of the `R` rays of each environment, shape `(N, R)`.
+        rects_x, rects_y: Top left corner of the `M` rects of each
+            environment, shape `(N, M)`.
+        rects_w, rects_h: Size of the rects, shape `(M,)`.
+
+    Returns:
+        The environment and ray indices of every ray that crosses a rect,
+        together with the first clipped point, ordered by environment, ray and
+        rect.
+    """
+    right = rects_x + rects_w - 1
+    bottom = rects_y + rects_h - 1
+
+    # entire ray is to one side of rect
+    min_x = np.minimum(x1[:, np.newaxis], x2)[..., np.newaxis]
+    max_x = np.maximum(x1[:, np.newaxis], x2)[..., np.newaxis]
+    min_y = np.minimum(y1[:, np.newaxis], y2)[..., np.newaxis]
+    max_y = np.maximum(y1[:, np.newaxis], y2)[..., np.newaxis]
+    candidates = (
+        (max_x >= rects_x[:, np.newaxis])
+        & (min_x <= right[:, np.newaxis])
+        & (max_y >= rects_y[:, np.newaxis])
+        & (min_y <= bottom[:, np.newaxis])
+    )
+
+    # only the remaining (few) ray and rect pairs need to be clipped
+    env_idx, ray_idx, rect_idx = np.nonzero(candidates)
+    x1 = x1[env_idx]
+    y1 = y1[env_idx]
+    x2 = x2[env_idx, ray_idx]
+    y2 = y2[env_idx, ray_idx]
+    left = rects_x[env_idx, rect_idx]
+    top = rects_y[env_idx, rect_idx]
+    right = right[env_idx, rect_idx]
+    bottom = bottom[env_idx, rect_idx]
+
+    def outcode(x, y):
+        code = np.where(y < top, _CODE_TOP, np.where(y > bottom, _CODE_BOTTOM, 0))
+        code |= np.where(x < left, _CODE_LEFT, np.where(x > right, _CODE_RIGHT, 0))
+        return code
+
+    hit = np.ones(x1.shape, dtype=np.bool_)
+    dx = x2 - x1
+    dy = y2 - y1
+    code2 = outcode(x2, y2)
+
+    # move the start point onto the rect's edges until it lies inside
+    while True:
+        code1 = outcode(x1, y1)
+        outside = hit & (code1 != 0)
+        if not np.any(outside):
+            break
+        hit &= ~(outside & ((code1 & code2) != 0))
+        outside &= hit
+
+        clip_top = (code1 & _CODE_TOP) != 0
+        clip_bottom = ~clip_top & ((code1 & _CODE_BOTTOM) != 0)
+        clip_y = outside & (clip_top | clip_bottom)
+        clip_x = outside & ~clip_y
+        new_y = np.where(clip_top, top, bottom)
+        new_x = np.where((code1 & _CODE_LEFT) != 0, left, right)
+
+        x_at_y = x1 + _trunc_div(dx * (new_y - y1), np.where(dy == 0, 1, dy))
+        y_at_x = y1 + _trunc_div(dy * (new_x - x1), np.where(dx == 0, 1, dx))
+        x1 = np.where(clip_y, x_at_y, np.where(clip_x, new_x, x1))
+        y1 = np.where(clip_y, new_y, np.where(clip_x, y_at_x, y1))
+        dx = x2 - x1
+        dy = y2 - y1
+
+    return env_idx[hit], ray_idx[hit], x1[hit], y1[hit]
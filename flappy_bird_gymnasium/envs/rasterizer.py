@@ -0,0 +1,258 @@
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""Headless renderer drawing the game's frames into NumPy arrays.
+
+The sprites (including the player's rotated ones, see :class:`PlayerAtlas`) are
+decoded once, when the renderer is created, into RGB arrays and opacity masks.
+Drawing a frame then only copies the opaque pixels of each sprite into a
+preallocated frame buffer, without any pygame surface, display or SDL video
+driver involved. The frames are pixel-identical to the ones drawn on a
+pygame surface by :class:`FlappyBirdEnv`.
+
+:class:`PixelObservation` turns the frames into smaller observations
+(grayscale, downscaled, `uint8` or floating point).
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from flappy_bird_gymnasium.envs import utils
+from flappy_bird_gymnasium.envs.constants import FILL_BACKGROUND_COLOR, PIPE_HEIGHT
+from flappy_bird_gymnasium.envs.sprites import PlayerAtlas, Sprite
+
+#: Weights of the red, green and blue channels in the grayscale frames.
+GRAYSCALE_WEIGHTS = (0.2989, 0.5870, 0.1140)
+
+
+def _area_taps(size_in: int, size_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the taps resampling `size_in` pixels into `size_out` ones, each
+    output pixel averaging the input pixels it covers (area interpolation).
+
+    Output pixel `i` is the sum over `j` of `weights[j, i] * input[indices[j, i]]`;
+    unused taps have a zero weight.
+    """
+    scale = size_in / size_out
+    edges = np.arange(size_out + 1) * scale
+    pixels = np.arange(size_in)
+    overlap = np.minimum(edges[1:, np.newaxis], pixels + 1) - np.maximum(
+        edges[:-1, np.newaxis], pixels
+    )
+    weights = np.clip(overlap, 0, None) / scale
+
+    covered = weights > 0
+    num_taps = covered.sum(axis=1).max()
+    first = covered.argmax(axis=1)
+    indices = np.minimum(first + np.arange(num_taps)[:, np.newaxis], size_in - 1)
+    tap_weights = np.take_along_axis(weights, indices.T, axis=1).T
+    tap_weights[indices != first + np.arange(num_taps)[:, np.newaxis]] = 0
+    return indices, tap_weights.astype(np.float32)
+
+
+def _resample(pixels: np.ndarray, taps: Tuple, axis: int) -> np.ndarray:
+    indices, weights = taps
+    shape = [1] * pixels.ndim
+    shape[axis] = -1
+    out = np.take(pixels, indices[0], axis=axis)
+    out *= weights[0].reshape(shape)
+    for tap_indices, tap_weights in zip(indices[1:], weights[1:]):
+        tap = np.take(pixels, tap_indices, axis=axis)
+        tap *= tap_weights.reshape(shape)
+        out += tap
+    return out
+
+
+class PixelObservation:
+    """Converts frames into pixel observations.
+
+    Args:
+        frame_size (Tuple[int, int]): The frames' width and height.
+        size (Optional[Tuple[int, int]]): The observations' width and height.
+            The frames are downscaled with area interpolation. If `None`, the
+            frames keep their size.
+        grayscale (bool): If `True`, the observations have a single channel,
+            and the shape `(height, width)`. Otherwise, they are RGB and of
+            shape `(height, width, 3)`.
+        dtype (type): Either `np.uint8`, for values in [0, 255], or a floating
+            point type, for values in [0, 1].
+    """
+
+    def __init__(
+        self,
+        frame_size: Tuple[int, int],
+        size: Optional[Tuple[int, int]] = None,
+        grayscale: bool = False,
+        dtype: type = np.uint8,
+    ) -> None:
+        self.dtype = np.dtype(dtype)
+        if self.dtype != np.uint8 and self.dtype.kind != "f":
+            raise ValueError(f"Unsupported pixel observations dtype: {self.dtype}")
+
+        width, height = frame_size if size is None else size
+        self.shape = (height, width) if grayscale else (height, width, 3)
+        self.high = 255 if self.dtype == np.uint8 else 1.0
+
+        self._grayscale = (
+            np.array(GRAYSCALE_WEIGHTS, dtype=np.float32) if grayscale else None
+        )
+        self._resize = None
+        if size is not None and tuple(size) != tuple(frame_size):
+            self._resize = (
+                _area_taps(frame_size[1], height),
+                _area_taps(frame_size[0], width),
+            )
+        self._identity = (
+            self._grayscale is None and self._resize is None and self.dtype == np.uint8
+        )
+        self._buffer = None if self._identity else np.empty(self.shape, self.dtype)
+
+    def __call__(self, frame: np.ndarray) -> np.ndarray:
+        """Converts a frame, of shape `(height, width, 3)`, into an observation.
+
+        The observation is written in a buffer overwritten by the next call
+        (or, if no conversion is needed, is the frame itself).
+        """
+        if self._identity:
+            return frame
+
+        pixels = frame.astype(np.float32)
+        if self._grayscale is not None:
+            pixels = pixels @ self._grayscale
+
+        if self._resize is not None:
+            rows, cols = self._resize
+            pixels = _resample(_resample(pixels, rows, axis=0), cols, axis=1)
+
+        if self.dtype == np.uint8:
+            np.rint(pixels, out=pixels)
+            np.clip(pixels, 0, 255, out=pixels)
+            self._buffer[...] = pixels
+        else:
+            np.multiply(pixels, 1 / 255, out=self._buffer, casting="unsafe")
+            np.clip(self._buffer, 0.0, 1.0, out=self._buffer)
+        return self._buffer
+
+
+class Rasterizer:
+    """Draws the frames of a Flappy Bird game into a NumPy array.
+
+    The frames are the ones shown by :class:`FlappyBirdEnv`, without the score
+    and the LIDAR's rays.
+
+    Args:
+        screen_size (Tuple[int, int]): The screen's width and height.
+        bird_color (str): Color of the flappy bird.
+        pipe_color (str): Color of the pipes.
+        background (Optional[str]): Type of background image, or `None` for a
+            plain background.
+    """
+
+    def __init__(
+        self,
+        screen_size: Tuple[int, int] = (288, 512),
+        bird_color: str = "yellow",
+        pipe_color: str = "green",
+        background: Optional[str] = "day",
+    ) -> None:
+        self._images = utils.load_images(
+            convert=False,
+            bird_color=bird_color,
+            pipe_color=pipe_color,
+            bg_type=background,
+        )
+        self._background = (
+            None
+            if self._images["background"] is None
+            else Sprite.from_surface(self._images["background"])
+        )
+        self._upper_pipe = Sprite.from_surface(self._images["pipe"][0])
+        self._lower_pipe = Sprite.from_surface(self._images["pipe"][1])
+        self._base = Sprite.from_surface(self._images["base"])
+        self._players = PlayerAtlas(self._images["player"])
+
+        # pygame's surfaces start black
+        self.frame = np.zeros((screen_size[1], screen_size[0], 3), dtype=np.uint8)
+
+    def draw(
+        self,
+        player_x: float,
+        player_y: float,
+        player_rot: float,
+        player_idx: int,
+        pipes: np.ndarray,
+        ground_x: float,
+        ground_y: float,
+    ) -> np.ndarray:
+        """Draws a frame of the game.
+
+        Args:
+            player_x (float): The player's horizontal position.
+            player_y (float): The player's vertical position.
+            player_rot (float): The player's rotation, in degrees.
+            player_idx (int): The player's flap frame.
+            pipes (np.ndarray): The pipes, as rows `(x, gap_top, gap_bottom)`.
+            ground_x (float): The ground's horizontal offset.
+            ground_y (float): The ground's vertical position.
+
+        Returns:
+            The frame buffer, of shape `(height, width, 3)`. It is overwritten
+            by the next call.
+        """
+        # Background
+        if self._background is not None:
+            self._blit(self._background, 0, 0)
+        else:
+            self.frame[...] = FILL_BACKGROUND_COLOR
+
+        # Pipes
+        for pipe_x, gap_top, gap_bottom in pipes.tolist():
+            self._blit(self._upper_pipe, pipe_x, gap_top - PIPE_HEIGHT)
+            self._blit(self._lower_pipe, pipe_x, gap_bottom)
+
+        # Base (ground)
+        self._blit(self._base, ground_x, ground_y)
+
+        # Player
+        self._blit(self._players.sprite(player_idx, player_rot), player_x, player_y)
+
+        return self.frame
+
+    def _blit(self, sprite: Sprite, x: float, y: float) -> None:
+        """Copies a sprite's opaque pixels into the frame, clipped to it."""
+        # like pygame, the position is truncated to integers
+        x, y = int(x), int(y)
+        frame_h, frame_w = self.frame.shape[:2]
+        left, top = max(x, 0), max(y, 0)
+        right = min(x + sprite.width, frame_w)
+        bottom = min(y + sprite.height, frame_h)
+        if left >= right or top >= bottom:
+            return
+
+        dst = self.frame[top:bottom, left:right]
+        rows, cols = slice(top - y, bottom - y), slice(left - x, right - x)
+        if sprite.mask is None:
+            dst[...] = sprite.rgb[rows, cols]
+        else:
+            mask = sprite.mask[rows, cols, np.newaxis]
+            np.copyto(dst, sprite.rgb[rows, cols], where=mask)
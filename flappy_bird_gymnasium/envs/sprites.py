@@ -0,0 +1,153 @@
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""Decoded sprites and the atlas of the player's pre-rotated sprites.
+
+The player's sprite is tilted according to its rotation. Instead of rotating
+it every frame, :class:`PlayerAtlas` rotates each flap frame once for every
+rotation the player can be drawn with, when the sprites are loaded.
+"""
+
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from flappy_bird_gymnasium.envs.constants import PLAYER_ROT_THR, PLAYER_VEL_ROT
+
+# pygame is only imported when the sprites are built, so the simulation can run
+# without it
+if TYPE_CHECKING:
+    from pygame import Surface
+
+#: Rotation the player is given when it flaps (and starts a game with).
+PLAYER_FLAP_ROT = 45
+
+#: Rotation below which the player stops tilting.
+PLAYER_MIN_ROT = -90
+
+#: Every rotation the player is drawn with: the rotation goes from
+#: `PLAYER_FLAP_ROT` down to `PLAYER_MIN_ROT` by steps of `PLAYER_VEL_ROT`,
+#: and is drawn capped to `PLAYER_ROT_THR`.
+VISIBLE_ROTATIONS = tuple(
+    sorted(
+        {
+            min(rot, PLAYER_ROT_THR)
+            for rot in range(PLAYER_FLAP_ROT, PLAYER_MIN_ROT - 1, -PLAYER_VEL_ROT)
+        }
+    )
+)
+
+
+class Sprite:
+    """A decoded sprite.
+
+    Args:
+        rgb (np.ndarray): The sprite's colors, shape `(height, width, 3)`.
+        mask (np.ndarray): Which pixels of the sprite are drawn, shape
+            `(height, width)`. `None` if they all are.
+    """
+
+    def __init__(self, rgb: np.ndarray, mask: Optional[np.ndarray] = None) -> None:
+        self.rgb = rgb
+        self.mask = mask
+        self.height, self.width = rgb.shape[:2]
+
+    @classmethod
+    def from_surface(cls, surface) -> "Sprite":
+        """Decodes a pygame surface.
+
+        The pixels are either drawn or not, according to the surface's colorkey
+        or per-pixel alpha, as the game's sprites are never translucent.
+        """
+        import pygame
+
+        rgb = np.ascontiguousarray(pygame.surfarray.array3d(surface).swapaxes(0, 1))
+        if surface.get_colorkey() is None and not (
+            surface.get_flags() & pygame.SRCALPHA
+        ):
+            return cls(rgb)
+
+        mask = pygame.mask.from_surface(surface, 127)
+        mask = pygame.surfarray.array_red(
+            mask.to_surface(setcolor=(255, 255, 255), unsetcolor=(0, 0, 0))
+        )
+        mask = np.ascontiguousarray(mask.swapaxes(0, 1) > 0)
+        return cls(rgb, None if mask.all() else mask)
+
+
+class PlayerAtlas:
+    """The player's sprites, rotated for every flap frame and visible rotation.
+
+    The game anchors the rotated sprites at their top-left corner (not their
+    center), so the bounding rect of the player drawn at `(x, y)` is
+    `(x, y, width, height)`, with the size of the rotated sprite.
+
+    Rotations missing from :data:`VISIBLE_ROTATIONS` (e.g. after a state was
+    set by hand) are rotated when first requested, then cached as well.
+
+    Args:
+        frames (Sequence[Surface]): The player's flap frames.
+        decode (bool): If `True`, the rotated sprites are also decoded into
+            :class:`Sprite` arrays right away, for headless rendering or
+            pixel-perfect collisions. Otherwise, they are decoded when first
+            requested.
+    """
+
+    def __init__(self, frames: Sequence["Surface"], decode: bool = True) -> None:
+        import pygame
+
+        self._frames = tuple(frames)
+        self._decode = decode
+        self._rotate = pygame.transform.rotate
+        self.surfaces: Dict[Tuple[int, int], "Surface"] = {}
+        self.sprites: Dict[Tuple[int, int], Sprite] = {}
+        for player_idx in range(len(self._frames)):
+            for visible_rot in VISIBLE_ROTATIONS:
+                surface = self.surface(player_idx, visible_rot)
+                if decode:
+                    self.sprites[(player_idx, visible_rot)] = Sprite.from_surface(
+                        surface
+                    )
+
+    @staticmethod
+    def visible_rotation(player_rot: float) -> int:
+        """Returns the rotation the player is drawn with."""
+        return int(min(player_rot, PLAYER_ROT_THR))
+
+    def surface(self, player_idx: int, player_rot: float) -> "Surface":
+        """Returns the player's rotated pygame surface."""
+        key = (player_idx, self.visible_rotation(player_rot))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self._rotate(self._frames[player_idx], key[1])
+            self.surfaces[key] = surface
+        return surface
+
+    def sprite(self, player_idx: int, player_rot: float) -> Sprite:
+        """Returns the player's rotated sprite, decoded."""
+        key = (player_idx, self.visible_rotation(player_rot))
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = Sprite.from_surface(self.surface(player_idx, player_rot))
+            self.sprites[key] = sprite
+        return sprite
@@ -32,12 +32,13 @@ released under the MIT license.
 import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from pygame import Rect
-from pygame import image as pyg_image
-from pygame import mixer as pyg_mixer
-from pygame.transform import flip as img_flip
+# pygame is only imported when assets are actually loaded, so the simulation
+# can run without it
+if TYPE_CHECKING:
+    from pygame import Rect
+    from pygame.mixer import Sound
 
 _BASE_DIR = Path(os.path.dirname(os.path.realpath(__file__))).parent
 
@@ -47,7 +48,7 @@ MODEL_PATH = str(_BASE_DIR / "assets/model")
 
 
 def pixel_collision(
-    rect1: Rect, rect2: Rect, hitmask1: List[List[bool]], hitmask2: List[List[bool]]
+    rect1: "Rect", rect2: "Rect", hitmask1: List[List[bool]], hitmask2: List[List[bool]]
 ) -> bool:
     """Checks if two objects collide and not just their rects."""
     rect = rect1.clip(rect2)
@@ -76,6 +77,8 @@ def get_hitmask(image) -> List[List[bool]]:
 
 
 def _load_sprite(filename, convert, alpha=True):
+    from pygame import image as pyg_image
+
     img = pyg_image.load(f"{SPRITES_PATH}/{filename}")
     return (
         img.convert_alpha() if convert and alpha else img.convert() if convert else img
@@ -89,6 +92,8 @@ def load_images(
     pipe_color: str = "green",
 ) -> Dict[str, Any]:
     """Loads and returns the image assets of the game."""
+    from pygame.transform import flip as img_flip
+
     images = {}
 
     try:
@@ -135,8 +140,10 @@ def load_images(
     return images
 
 
-def load_sounds() -> Dict[str, pyg_mixer.Sound]:
+def load_sounds() -> Dict[str, "Sound"]:
     """Loads and returns the audio assets of the game."""
+    from pygame import mixer as pyg_mixer
+
     pyg_mixer.init()
     sounds = {}
 
@@ -0,0 +1,46 @@
+"""Heuristic policy used by the tests that need long and varied episodes."""
+
+import numpy as np
+
+from flappy_bird_gymnasium.envs.constants import PIPE_WIDTH, PLAYER_HEIGHT
+
+# the bird's horizontal position on the default 288 pixels wide screen
+PLAYER_X = int(288 * 0.2)
+
+
+def heuristic_actions(player_y, pipes_x, gap_bottom, margin=12, rng=None, noise=0.0):
+    """Flaps when the bird's bottom drops within `margin` pixels of the next
+    gap's bottom, i.e. the bottom of the leftmost pipe whose right end is still
+    ahead of the bird.
+
+    Args:
+        player_y: The birds' vertical positions, a scalar or shape `(N,)`.
+        pipes_x: The pipes' horizontal positions, shape `(P,)` or `(N, P)`.
+        gap_bottom: The y positions of the lower pipes' top ends, same shape as
+            `pipes_x`.
+        margin (float): Distance to the gap's bottom at which the bird flaps.
+        rng (Optional[np.random.Generator]): If set, each action is flipped
+            with probability `noise`, so the episodes end at various points.
+        noise (float): Probability of flipping an action.
+
+    Returns:
+        The actions, with the shape of `player_y`.
+    """
+    ahead = np.where(pipes_x + PIPE_WIDTH > PLAYER_X, pipes_x, np.inf)
+    next_pipe = np.argmin(ahead, axis=-1)[..., np.newaxis]
+    next_gap_bottom = np.take_along_axis(gap_bottom, next_pipe, axis=-1)[..., 0]
+    actions = (player_y + PLAYER_HEIGHT > next_gap_bottom - margin).astype(np.int64)
+    if rng is not None:
+        actions = np.where(rng.random(np.shape(actions)) < noise, 1 - actions, actions)
+    return actions
+
+
+def heuristic_action(env, margin=12, rng=None, noise=0.0):
+    """:func:`heuristic_actions` for a :class:`FlappyBirdEnv`, from its state."""
+    state = env.get_state()
+    pipes = state["pipes"]
+    return int(
+        heuristic_actions(
+            state["player_y"], pipes[:, 0], pipes[:, 2], margin, rng, noise
+        )
+    )
@@ -0,0 +1,127 @@
+"""Tests that the multiprocess and multithreaded vector environments reproduce
+the trajectories of the natively vectorized environment.
+"""
+
+import gymnasium
+import numpy as np
+import pytest
+
+from flappy_bird_gymnasium import (
+    FlappyBirdAsyncVectorEnv,
+    FlappyBirdEnv,
+    FlappyBirdThreadedVectorEnv,
+    FlappyBirdVectorEnv,
+)
+from flappy_bird_gymnasium.benchmark import VECTOR_ENVS, run
+
+
+def check_same_trajectories(async_env, expected_env, steps):
+    rng = np.random.default_rng(0)
+    obs, info = async_env.reset(seed=42)
+    expected_obs, expected_info = expected_env.reset(seed=42)
+    assert obs.dtype == async_env.observation_space.dtype
+    assert np.array_equal(obs, expected_obs.astype(obs.dtype))
+
+    episodes = 0
+    for _ in range(steps):
+        actions = (rng.random(async_env.num_envs) < 0.08).astype(np.int64)
+        obs, reward, terminated, truncated, info = async_env.step(actions)
+        expected = expected_env.step(actions)
+
+        assert np.array_equal(obs, expected[0].astype(obs.dtype))
+        assert np.array_equal(reward, expected[1])
+        assert np.array_equal(terminated, expected[2])
+        assert np.array_equal(truncated, expected[3])
+        assert np.array_equal(info["score"], expected[4]["score"])
+        episodes += np.count_nonzero(terminated | truncated)
+    assert episodes > 0
+
+    reset_mask = np.zeros(async_env.num_envs, dtype=np.bool_)
+    reset_mask[1] = True
+    obs, info = async_env.reset(options={"reset_mask": reset_mask})
+    expected_obs, expected_info = expected_env.reset(options={"reset_mask": reset_mask})
+    assert np.array_equal(obs, expected_obs.astype(obs.dtype))
+    assert np.array_equal(info["score"], expected_info["score"])
+
+    async_env.close()
+    expected_env.close()
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"use_lidar": True, "obs_dtype": np.float64}])
+def test_same_trajectories(kwargs):
+    async_env = FlappyBirdAsyncVectorEnv(
+        num_envs=7, num_workers=3, score_limit=5, **kwargs
+    )
+    assert async_env.num_workers == 3
+    assert async_env.observation_space.dtype == kwargs.get("obs_dtype", np.float32)
+
+    kwargs.pop("obs_dtype", None)
+    expected_env = FlappyBirdVectorEnv(num_envs=7, score_limit=5, **kwargs)
+    check_same_trajectories(async_env, expected_env, steps=300)
+
+
+def test_same_trajectories_pixels():
+    kwargs = {"use_pixels": True, "pixels_size": (42, 42), "pixels_grayscale": True}
+    async_env = FlappyBirdAsyncVectorEnv(num_envs=3, num_workers=2, **kwargs)
+    assert async_env.single_observation_space.shape == (42, 42)
+    assert async_env.observation_space.dtype == np.uint8
+
+    expected_env = gymnasium.vector.SyncVectorEnv(
+        [lambda: FlappyBirdEnv(**kwargs) for _ in range(3)]
+    )
+    check_same_trajectories(async_env, expected_env, steps=60)
+
+
+def test_ring_of_results():
+    envs = FlappyBirdAsyncVectorEnv(num_envs=4, num_workers=2, num_slots=3, copy=False)
+    envs.reset(seed=0)
+    obs, *_ = envs.step(np.ones(4, dtype=np.int64))
+    expected = obs.copy()
+    envs.step(np.zeros(4, dtype=np.int64))
+    envs.step(np.zeros(4, dtype=np.int64))
+    assert np.array_equal(obs, expected)
+    envs.close()
+
+
+def test_worker_errors():
+    envs = FlappyBirdAsyncVectorEnv(num_envs=2, num_workers=2)
+    envs.reset(seed=0)
+    with pytest.raises(RuntimeError, match="worker failed"):
+        envs.reset(seed=0, options={"pipe_course": [99]})
+    envs.close()
+
+
+@pytest.mark.parametrize("num_slots", [0, 257])
+def test_invalid_num_slots(num_slots):
+    with pytest.raises(ValueError, match="num_slots"):
+        FlappyBirdAsyncVectorEnv(num_envs=2, num_slots=num_slots)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"use_lidar": True}])
+def test_threaded_same_trajectories(kwargs):
+    threaded_env = FlappyBirdThreadedVectorEnv(
+        num_envs=7, num_threads=3, score_limit=5, **kwargs
+    )
+    assert threaded_env.num_threads == 3
+    expected_env = FlappyBirdVectorEnv(num_envs=7, score_limit=5, **kwargs)
+    check_same_trajectories(threaded_env, expected_env, steps=300)
+
+
+def test_threaded_same_trajectories_pixels():
+    kwargs = {"use_pixels": True, "pixels_size": (42, 42), "pixels_grayscale": True}
+    threaded_env = FlappyBirdThreadedVectorEnv(
+        num_envs=3, num_threads=2, copy=False, **kwargs
+    )
+    assert threaded_env.observation_space.shape == (3, 42, 42)
+
+    expected_env = gymnasium.vector.SyncVectorEnv(
+        [lambda: FlappyBirdEnv(**kwargs) for _ in range(3)]
+    )
+    check_same_trajectories(threaded_env, expected_env, steps=60)
+
+
+def test_benchmark(capsys):
+    results = run(num_envs=2, steps=3, num_workers=2, observations=["lidar"])
+    assert set(results["lidar"]) == set(VECTOR_ENVS)
+    assert all(steps_per_second > 0 for steps_per_second in results["lidar"].values())
+    assert "processes" in capsys.readouterr().out
@@ -0,0 +1,34 @@
+"""Tests that the command line interface only loads the selected mode."""
+
+import subprocess
+import sys
+
+
+def run_python(code):
+    return subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+
+
+def test_cli_imports_lazily():
+    run_python(
+        "import sys\n"
+        "from flappy_bird_gymnasium import cli\n"
+        "cli._get_args(['--mode', 'dqn'])\n"
+        "for name in ('tensorflow', 'matplotlib', 'pygame'):\n"
+        "    assert name not in sys.modules, name\n"
+    )
+
+
+def test_profile_startup():
+    result = run_python(
+        "import sys\n"
+        "from flappy_bird_gymnasium import cli\n"
+        "@cli.register_mode('test')\n"
+        "def load(args):\n"
+        "    from flappy_bird_gymnasium.tests import test_random\n"
+        "    return lambda: print('ran')\n"
+        "cli.main(['--mode', 'test', '--profile-startup'])\n"
+    )
+    assert result.stdout == "ran\n"
+    assert "flappy_bird_gymnasium.tests.test_random" in result.stderr
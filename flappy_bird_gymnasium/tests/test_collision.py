@@ -0,0 +1,74 @@
+"""Tests the collision tests against `pygame.Rect.colliderect`."""
+
+import numpy as np
+import pygame
+
+from flappy_bird_gymnasium.envs.collision import (
+    player_hits_pipes,
+    rects_collide,
+    rects_collide_batch,
+)
+from flappy_bird_gymnasium.envs.constants import (
+    PIPE_HEIGHT,
+    PIPE_WIDTH,
+    PLAYER_HEIGHT,
+    PLAYER_WIDTH,
+)
+
+
+def random_rects(rng, n):
+    positions = rng.uniform(-60, 60, size=(n, 2))
+    # include integral and half-integral positions, where truncation matters
+    quarter, half = n // 4, n // 2
+    positions[:quarter] = np.round(positions[:quarter])
+    positions[quarter:half] = np.round(positions[quarter:half]) + 0.5
+    sizes = rng.integers(1, 50, size=(n, 2))
+    return positions, sizes
+
+
+def test_rects_collide_matches_pygame():
+    rng = np.random.default_rng(0)
+    pos_a, size_a = random_rects(rng, 4000)
+    pos_b, size_b = random_rects(rng, 4000)
+
+    expected = np.array(
+        [
+            pygame.Rect(*a, *sa).colliderect(pygame.Rect(*b, *sb))
+            for a, sa, b, sb in zip(pos_a, size_a, pos_b, size_b)
+        ]
+    )
+    assert 0 < np.count_nonzero(expected) < len(expected)
+
+    scalar = [
+        rects_collide(*a, *sa, *b, *sb)
+        for a, sa, b, sb in zip(pos_a, size_a, pos_b, size_b)
+    ]
+    assert np.array_equal(scalar, expected)
+
+    batched = rects_collide_batch(*pos_a.T, *size_a.T, *pos_b.T, *size_b.T)
+    assert np.array_equal(batched, expected)
+
+
+def test_player_hits_pipes():
+    rng = np.random.default_rng(1)
+    n = 2000
+    player_y = rng.uniform(0, 400, size=n)
+    pipes_x = rng.uniform(0, 120, size=(n, 3))
+    upper_pipes_y = rng.uniform(-300, -200, size=(n, 3))
+    lower_pipes_y = upper_pipes_y + PIPE_HEIGHT + 100
+
+    expected = []
+    for i in range(n):
+        player = pygame.Rect(57, player_y[i], PLAYER_WIDTH, PLAYER_HEIGHT)
+        expected.append(
+            any(
+                player.colliderect(pygame.Rect(x, y, PIPE_WIDTH, PIPE_HEIGHT))
+                for x, y in zip(
+                    np.concatenate([pipes_x[i], pipes_x[i]]),
+                    np.concatenate([upper_pipes_y[i], lower_pipes_y[i]]),
+                )
+            )
+        )
+
+    result = player_hits_pipes(57, player_y, pipes_x, upper_pipes_y, lower_pipes_y)
+    assert np.array_equal(result, expected)
@@ -0,0 +1,69 @@
+"""Tests the headless simulation core."""
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from flappy_bird_gymnasium.core import FlappyBirdLogic, PipeRing
+
+
+def test_simulation_does_not_import_pygame():
+    code = (
+        "import sys\n"
+        "import gymnasium\n"
+        "import flappy_bird_gymnasium\n"
+        "for kwargs in ({}, {'use_lidar': True}):\n"
+        "    env = gymnasium.make('FlappyBird-v0', **kwargs)\n"
+        "    env.reset(seed=0)\n"
+        "    for _ in range(100):\n"
+        "        env.step(env.action_space.sample())\n"
+        "    env.close()\n"
+        "gymnasium.make_vec('FlappyBird-v0', num_envs=2).reset(seed=0)\n"
+        "assert 'pygame' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_logic_is_deterministic():
+    games = []
+    for _ in range(2):
+        game = FlappyBirdLogic(num_games=4)
+        game.np_randoms = [np.random.default_rng(seed) for seed in range(4)]
+        game.reset(np.arange(4))
+        games.append(game)
+
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        flap = rng.random(4) < 0.1
+        passed, crashed = games[0].step(flap)
+        assert np.array_equal((passed, crashed), games[1].step(flap))
+        for game in games:
+            game.reset(np.flatnonzero(crashed))
+
+    for name in ("player_y", "player_vel_y", "pipes_x", "lower_pipes_y", "score"):
+        assert np.array_equal(getattr(games[0], name), getattr(games[1], name))
+
+
+def test_pipe_ring():
+    ring = PipeRing(3)
+    for x in (10, 20, 30):
+        ring.push(x, x + 1, x + 2)
+    assert ring.oldest == 0
+    assert np.array_equal(ring.x[ring.order], [10, 20, 30])
+
+    ring.move(-5)
+    ring.push(40, 41, 42)
+    assert ring.oldest == 1
+    expected = [[15, 21, 22], [25, 31, 32], [40, 41, 42]]
+    assert np.array_equal(ring.pipes[ring.order], expected)
+    assert np.array_equal(ring.ordered, expected)
+    assert np.array_equal(ring.gap_bottom, [42, 22, 32])
+
+    # the views are read-only and follow the buffer
+    with pytest.raises(ValueError):
+        ring.x[0] = 0
+    ring.clear()
+    ring.push(0, 1, 2)
+    assert ring.pipes[0].tolist() == [0, 1, 2]
@@ -6,7 +6,7 @@ import flappy_bird_gymnasium
 from flappy_bird_gymnasium.envs.utils import MODEL_PATH
 from flappy_bird_gymnasium.tests.dueling import DuelingDQN
 from flappy_bird_gymnasium.tests.dueling_v2 import DuelingDQN as DuelingDQN_v2
-from flappy_bird_gymnasium.tests.framestack import FrameStack
+from flappy_bird_gymnasium.wrappers import FrameStack
 
 plt.ion()
 
@@ -24,7 +24,8 @@ def play(
 
     # init models
     if use_lidar:
-        env = FrameStack(env, 16)
+        # the stacked frames are consumed right away, no need to copy them
+        env = FrameStack(env, 16, copy_obs=False)
         q_model = DuelingDQN_v2(env.action_space.n, 2, 128, 4, 6)
         q_model.build((None, *env.observation_space.shape))
         q_model.load_weights(MODEL_PATH + "/LIDAR_AVG_16steps_15px.h5")
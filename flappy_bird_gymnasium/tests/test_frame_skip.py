@@ -0,0 +1,78 @@
+"""Tests that skipping frames inside the environment matches repeating the
+actions of a standalone environment.
+"""
+
+import numpy as np
+import pytest
+
+from flappy_bird_gymnasium import FlappyBirdEnv
+from flappy_bird_gymnasium.tests.heuristic import heuristic_action
+
+
+def repeat_action(env, action, frame_skip):
+    total_reward = 0
+    for _ in range(frame_skip):
+        obs, reward, terminated, truncated, info = env.step(action)
+        total_reward += reward
+        if terminated or truncated:
+            break
+    return obs, total_reward, terminated, truncated, info
+
+
+@pytest.mark.parametrize("frame_skip", [2, 4])
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"score_limit": 5},
+        {"use_lidar": True},
+        {"use_pixels": True, "pixels_size": (42, 42)},
+    ],
+)
+def test_same_trajectories(frame_skip, kwargs):
+    env = FlappyBirdEnv(frame_skip=frame_skip, **kwargs)
+    expected_env = FlappyBirdEnv(**kwargs)
+    rng = np.random.default_rng(0)
+
+    episodes = 0
+    for seed in range(3):
+        obs, _ = env.reset(seed=seed)
+        expected_obs, _ = expected_env.reset(seed=seed)
+        assert np.array_equal(obs, expected_obs)
+
+        for _ in range(1000):
+            # skipped frames call for an earlier flap
+            action = heuristic_action(env, margin=20, rng=rng, noise=0.01)
+            obs, reward, terminated, truncated, info = env.step(action)
+            expected = repeat_action(expected_env, action, frame_skip)
+            assert np.array_equal(obs, expected[0])
+            assert reward == expected[1]
+            assert (terminated, truncated) == expected[2:4]
+            assert info == expected[4]
+            assert env.get_state() == expected_env.get_state()
+            if terminated or truncated:
+                episodes += 1
+                break
+    assert episodes == 3
+
+
+def test_invalid_frame_skip():
+    with pytest.raises(ValueError):
+        FlappyBirdEnv(frame_skip=0)
+
+
+def test_one_observation_per_step():
+    env = FlappyBirdEnv(frame_skip=3, render_mode="rgb_array_list")
+    get_observation = env._get_observation
+    calls = []
+
+    def counted_get_observation():
+        calls.append(None)
+        return get_observation()
+
+    env._get_observation = counted_get_observation
+    env.reset(seed=0)
+    for _ in range(5):
+        env.step(0)
+    assert len(calls) == 6
+    # the reset's frame and one frame per step
+    assert len(env.render()) == 6
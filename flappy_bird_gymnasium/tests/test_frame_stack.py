@@ -0,0 +1,114 @@
+"""Tests the frame stacking wrappers."""
+
+import pickle
+from collections import deque
+
+import gymnasium
+import numpy as np
+import pytest
+from gymnasium.vector import AutoresetMode
+
+from flappy_bird_gymnasium import FlappyBirdEnv, FlappyBirdVectorEnv
+from flappy_bird_gymnasium.wrappers import FrameStack, LazyFrames, VectorFrameStack
+
+
+def play(env, steps):
+    """Yields the observations of random episodes, and whether each one is the
+    first of its episode."""
+    rng = np.random.default_rng(0)
+    obs, _ = env.reset(seed=0)
+    yield obs, True
+    for _ in range(steps):
+        obs, _, terminated, truncated, _ = env.step(int(rng.random() < 0.1))
+        yield obs, False
+        if terminated or truncated:
+            obs, _ = env.reset()
+            yield obs, True
+
+
+@pytest.mark.parametrize("num_stack", [1, 4])
+@pytest.mark.parametrize("kwargs", [{}, {"copy_obs": False}, {"lazy_frames": True}])
+def test_same_stacks(num_stack, kwargs):
+    env = FrameStack(FlappyBirdEnv(use_lidar=True), num_stack, **kwargs)
+    assert env.observation_space.shape == (num_stack, 180)
+
+    frames = deque(maxlen=num_stack)
+    stacks = []
+    for (stack, first), (obs, _) in zip(
+        play(env, 300), play(FlappyBirdEnv(use_lidar=True), 300)
+    ):
+        if first:
+            frames.extend([obs] * num_stack)
+        frames.append(obs)
+        assert np.array_equal(np.asarray(stack), np.stack(frames))
+        stacks.append((stack, np.stack(frames)))
+
+    if kwargs.get("lazy_frames"):
+        # the lazy stacks are never overwritten
+        for stack, expected in stacks:
+            assert isinstance(stack, LazyFrames)
+            assert stack.shape == expected.shape and len(stack) == num_stack
+            assert np.array_equal(stack, expected)
+            assert np.array_equal(stack[-1], expected[-1])
+        with pytest.raises(ValueError):
+            np.asarray(stacks[0][0])[0] = 0
+
+
+def test_view_is_overwritten():
+    env = FrameStack(FlappyBirdEnv(), 3, copy_obs=False)
+    stack, _ = env.reset(seed=0)
+    next_stack, *_ = env.step(0)
+    assert np.shares_memory(stack, next_stack)
+
+
+def test_pickle_lazy_frames():
+    env = FrameStack(FlappyBirdEnv(), 8, lazy_frames=True)
+    env.reset(seed=0)
+    stack, *_ = env.step(1)
+    restored = pickle.loads(pickle.dumps(stack))
+    assert np.array_equal(restored, stack)
+    assert len(pickle.dumps(stack)) < np.asarray(stack).nbytes + 1024
+
+
+@pytest.mark.parametrize("copy_obs", [True, False])
+@pytest.mark.parametrize(
+    "autoreset_mode", [AutoresetMode.NEXT_STEP, AutoresetMode.SAME_STEP]
+)
+def test_vector_frame_stack(copy_obs, autoreset_mode):
+    num_envs, num_stack = 4, 3
+    if autoreset_mode == AutoresetMode.NEXT_STEP:
+        envs = FlappyBirdVectorEnv(num_envs, use_lidar=True, lidar_rays=30)
+    else:
+        envs = gymnasium.vector.SyncVectorEnv(
+            [lambda: FlappyBirdEnv(use_lidar=True, lidar_rays=30)] * num_envs,
+            autoreset_mode=autoreset_mode,
+        )
+    envs = VectorFrameStack(envs, num_stack, copy_obs=copy_obs)
+    expected_envs = gymnasium.vector.SyncVectorEnv(
+        [lambda: FrameStack(FlappyBirdEnv(use_lidar=True, lidar_rays=30), num_stack)]
+        * num_envs,
+        autoreset_mode=autoreset_mode,
+    )
+    assert envs.single_observation_space == expected_envs.single_observation_space
+    assert envs.observation_space.shape == (num_envs, num_stack, 30)
+
+    stacks, _ = envs.reset(seed=0)
+    expected, _ = expected_envs.reset(seed=0)
+    assert np.array_equal(stacks, expected)
+
+    rng = np.random.default_rng(0)
+    episodes = 0
+    for _ in range(400):
+        actions = (rng.random(num_envs) < 0.1).astype(np.int64)
+        stacks, _, terminated, truncated, _ = envs.step(actions)
+        expected, *_ = expected_envs.step(actions)
+        assert stacks.flags.c_contiguous
+        assert np.array_equal(stacks, expected)
+        episodes += np.count_nonzero(terminated | truncated)
+    assert episodes > 0
+
+    # only the reset sub-environments have their stacks filled
+    reset_mask = np.array([True, False, True, False])
+    stacks, _ = envs.reset(options={"reset_mask": reset_mask})
+    expected, _ = expected_envs.reset(options={"reset_mask": reset_mask})
+    assert np.array_equal(stacks, expected)
@@ -74,8 +74,8 @@ def play(use_lidar=True):
     if use_lidar:
         fig = plt.figure(figsize=(6, 6))
         ax = fig.add_subplot(111, projection="polar")
-        x = np.linspace((np.pi / 2), -(np.pi / 2), 180)
         y = np.array(video_buffer)
+        x = np.linspace((np.pi / 2), -(np.pi / 2), y.shape[1])
         (line,) = ax.plot(x, y[0], "-")
         ax.set_ylim([0, 1])
         ax.set_title("LIDAR scan", fontdict={"fontweight": "bold"})
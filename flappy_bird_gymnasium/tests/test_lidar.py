@@ -0,0 +1,150 @@
+"""Tests the LIDAR sensor against the reference ray caster built on
+`pygame.Rect.clipline`.
+"""
+
+import numpy as np
+import pygame
+
+from flappy_bird_gymnasium import FlappyBirdEnv
+from flappy_bird_gymnasium.envs.constants import (
+    BASE_HEIGHT,
+    BASE_WIDTH,
+    LIDAR_MAX_DISTANCE,
+    PIPE_HEIGHT,
+    PIPE_WIDTH,
+    PLAYER_HEIGHT,
+    PLAYER_ROT_THR,
+    PLAYER_WIDTH,
+)
+from flappy_bird_gymnasium.envs.lidar import LIDAR
+
+
+def reference_scan(
+    player_x,
+    player_y,
+    player_rot,
+    upper_pipes,
+    lower_pipes,
+    ground,
+    num_rays=180,
+    fov=180,
+):
+    """The original per-ray LIDAR implementation."""
+    result = np.empty([num_rays])
+    offset_x = player_x + PLAYER_WIDTH
+    offset_y = player_y + (PLAYER_HEIGHT / 2)
+    visible_rot = min(player_rot, PLAYER_ROT_THR)
+    upper_pipes = sorted(upper_pipes, key=lambda pipe: pipe["x"])
+    lower_pipes = sorted(lower_pipes, key=lambda pipe: pipe["x"])
+
+    for i in range(num_rays):
+        angle = i * (fov / num_rays) - fov / 2
+        rad = np.radians(angle - visible_rot)
+        x = LIDAR_MAX_DISTANCE * np.cos(rad) + offset_x
+        y = LIDAR_MAX_DISTANCE * np.sin(rad) + offset_y
+        line = (offset_x, offset_y, x, y)
+        collision_point = (x, y)
+
+        ground_rect = pygame.Rect(0, ground["y"], BASE_WIDTH, BASE_HEIGHT)
+        collision = ground_rect.clipline(line)
+        if collision:
+            collision_point = collision[0]
+
+        for up_pipe, low_pipe in zip(upper_pipes, lower_pipes):
+            up_pipe_rect = pygame.Rect(
+                up_pipe["x"], up_pipe["y"], PIPE_WIDTH, PIPE_HEIGHT
+            )
+            low_pipe_rect = pygame.Rect(
+                low_pipe["x"], low_pipe["y"], PIPE_WIDTH, PIPE_HEIGHT
+            )
+            collision_A = up_pipe_rect.clipline(line)
+            collision_B = low_pipe_rect.clipline(line)
+            if collision_A:
+                collision_point = collision_A[0]
+                break
+            elif collision_B:
+                collision_point = collision_B[0]
+                break
+
+        collision_x, collision_y = collision_point
+        collision_y = min(collision_y, ground["y"])
+        result[i] = np.sqrt(
+            (offset_x - collision_x) ** 2 + (offset_y - collision_y) ** 2
+        )
+
+    return result
+
+
+def check_scan_matches_reference(steps, num_rays=180, fov=180):
+    env = FlappyBirdEnv(
+        use_lidar=True, normalize_obs=False, lidar_rays=num_rays, lidar_fov=fov
+    )
+    rng = np.random.default_rng(0)
+    obs, _ = env.reset(seed=0)
+    for _ in range(steps):
+        pipes = env._pipes.pipes
+        expected = reference_scan(
+            env._player_x,
+            env._player_y,
+            env._player_rot,
+            [{"x": x, "y": gap_top - PIPE_HEIGHT} for x, gap_top, _ in pipes],
+            [{"x": x, "y": gap_bottom} for x, _, gap_bottom in pipes],
+            env._ground,
+            num_rays,
+            fov,
+        )
+        assert obs.shape == env.observation_space.shape
+        assert np.max(np.abs(obs - expected)) <= 1.0
+
+        obs, _, terminated, _, _ = env.step(int(rng.random() < 0.15))
+        if terminated:
+            obs, _ = env.reset()
+    env.close()
+
+
+def test_scan_matches_reference():
+    check_scan_matches_reference(steps=600)
+
+
+def test_scan_matches_reference_few_rays():
+    check_scan_matches_reference(steps=300, num_rays=16, fov=120)
+
+
+def test_ray_direction_table(tmp_path):
+    table_path = str(tmp_path / "lidar_table.npz")
+    lidar = LIDAR(LIDAR_MAX_DISTANCE, fov=90, resolution=2, table_path=table_path)
+    assert lidar.num_rays == 45
+
+    loaded = LIDAR(LIDAR_MAX_DISTANCE, fov=90, resolution=2, table_path=table_path)
+    assert np.array_equal(loaded._ray_directions, lidar._ray_directions)
+
+    # a table built for another configuration is rebuilt
+    rebuilt = LIDAR(LIDAR_MAX_DISTANCE, table_path=table_path)
+    assert rebuilt._ray_directions.shape[1] == 180
+    assert np.allclose(np.linalg.norm(rebuilt._ray_directions, axis=-1), 1.0)
+
+
+def test_draw():
+    env = FlappyBirdEnv(render_mode="rgb_array", use_lidar=True)
+    env.reset(seed=0)
+    for i in range(40):
+        env.step(int(i % 9 == 0))
+
+    # every ray is drawn, from the player's torso to where it hits
+    surface = pygame.Surface((288, 512))
+    env._lidar.draw(surface, env._player_x, env._player_y)
+    pixels = pygame.surfarray.array3d(surface)
+    red = np.all(pixels == (255, 0, 0), axis=-1)
+    for end in np.trunc(env._lidar.collisions).astype(int).tolist():
+        if 0 <= end[0] < 288 and 0 <= end[1] < 512:
+            assert red[end[0], end[1]]
+    assert red[int(env._player_x + PLAYER_WIDTH), int(env._player_y + 12)]
+
+    # the private zone overlay is rotated once per visible rotation
+    overlay = env._private_zone_surface(-30)
+    assert env._private_zone_surface(-30) is overlay
+    expected = pygame.transform.rotate(env._private_zone, -30)
+    assert np.array_equal(
+        pygame.surfarray.array_alpha(overlay), pygame.surfarray.array_alpha(expected)
+    )
+    env.close()
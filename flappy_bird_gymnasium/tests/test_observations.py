@@ -0,0 +1,58 @@
+"""Tests the observations of the Flappy Bird environment."""
+
+import numpy as np
+
+from flappy_bird_gymnasium import FlappyBirdEnv
+from flappy_bird_gymnasium.envs.constants import PLAYER_MAX_VEL_Y
+
+
+def reference_features(env):
+    """The features observation, computed by sorting the pipes."""
+    pipes = []
+    for pipe_x, gap_top, gap_bottom in env._pipes.pipes.tolist():
+        if pipe_x > env._screen_width:
+            pipes.append((env._screen_width, 0, env._screen_height))
+        else:
+            pipes.append((pipe_x, gap_top, gap_bottom))
+    pipes = sorted(pipes, key=lambda pipe: pipe[0])
+
+    obs = np.array(
+        [value for pipe in pipes for value in pipe]
+        + [env._player_y, env._player_vel_y, env._player_rot]
+    )
+    if env._normalize_obs:
+        obs /= 3 * [env._screen_width, env._screen_height, env._screen_height] + [
+            env._screen_height,
+            PLAYER_MAX_VEL_Y,
+            90,
+        ]
+    return obs
+
+
+def test_features():
+    rng = np.random.default_rng(0)
+    for normalize_obs in (True, False):
+        env = FlappyBirdEnv(normalize_obs=normalize_obs)
+        obs, _ = env.reset(seed=0)
+        for _ in range(1000):
+            assert np.array_equal(obs, reference_features(env))
+            obs, _, terminated, _, _ = env.step(int(rng.random() < 0.1))
+            if terminated:
+                obs, _ = env.reset()
+
+
+def test_features_buffer():
+    env = FlappyBirdEnv(obs_dtype=np.float32, copy_obs=False)
+    obs, _ = env.reset(seed=0)
+    assert obs.dtype == env.observation_space.dtype == np.float32
+    assert env.observation_space.contains(obs)
+
+    # the returned observation is a view of a buffer updated in place
+    next_obs, _, _, _, _ = env.step(0)
+    assert next_obs is obs
+    assert np.allclose(obs, reference_features(env))
+
+    env = FlappyBirdEnv()
+    obs, _ = env.reset(seed=0)
+    next_obs, _, _, _, _ = env.step(0)
+    assert not np.shares_memory(obs, next_obs)
@@ -0,0 +1,91 @@
+"""Tests the schedule of the pipes' gaps."""
+
+import numpy as np
+import pytest
+
+from flappy_bird_gymnasium import FlappyBirdEnv, FlappyBirdVectorEnv
+from flappy_bird_gymnasium.core import GAP_YS, PipeSchedule
+
+GROUND_Y = 512 * 0.79
+
+
+def test_blocks_match_single_draws():
+    np_random = np.random.default_rng(3)
+    expected_random = np.random.default_rng(3)
+    schedule = PipeSchedule(GROUND_Y, np_random, block_size=16)
+
+    for _ in range(50):
+        index = expected_random.integers(0, len(GAP_YS))
+        assert schedule.next_gap_y() == GAP_YS[index] + int(GROUND_Y * 0.2)
+    # the generator is left where the last block ended
+    expected_random.integers(0, len(GAP_YS), size=14)
+    assert np_random.bit_generator.state == expected_random.bit_generator.state
+
+
+def test_upcoming():
+    schedule = PipeSchedule(GROUND_Y, np.random.default_rng(0), block_size=8)
+    schedule.next_gap_y()
+    upcoming = schedule.upcoming(20)
+    assert upcoming.shape == (20,)
+    assert [schedule.next_gap_y() for _ in range(20)] == upcoming.tolist()
+
+
+@pytest.mark.parametrize("course", [None, 5, [0, 7, 3]])
+def test_restore_state(course):
+    schedule = PipeSchedule(GROUND_Y, np.random.default_rng(1), course=course)
+    for _ in range(70):
+        schedule.next_gap_y()
+    schedule.upcoming(100)
+    state = schedule.get_state()
+    expected = [schedule.next_gap_y() for _ in range(200)]
+
+    other = PipeSchedule(GROUND_Y, course=course)
+    other.set_state(*state)
+    assert [other.next_gap_y() for _ in range(200)] == expected
+
+
+def test_courses():
+    offset = int(GROUND_Y * 0.2)
+    schedule = PipeSchedule(GROUND_Y, course=[2, 0, 5])
+    gaps = [schedule.next_gap_y() - offset for _ in range(7)]
+    assert gaps == [GAP_YS[i] for i in (2, 0, 5, 2, 0, 5, 2)]
+    schedule.restart()
+    assert schedule.next_gap_y() - offset == GAP_YS[2]
+
+    schedule.set_course(11)
+    gaps = [schedule.next_gap_y() for _ in range(100)]
+    schedule.restart()
+    assert [schedule.next_gap_y() for _ in range(100)] == gaps
+
+    with pytest.raises(ValueError):
+        schedule.set_course([0, len(GAP_YS)])
+
+
+def test_env_replays_course():
+    env = FlappyBirdEnv(pipe_course=42)
+    episodes = []
+    for seed in (0, 1):
+        env.reset(seed=seed)
+        upcoming = env.upcoming_gaps(10)
+        gaps = [env.get_state()["pipes"][:, 1].tolist()]
+        for _ in range(200):
+            env.step(0)
+            env.set_state(env.get_state())
+            gaps.append(env.get_state()["pipes"][:, 1].tolist())
+        episodes.append((upcoming.tolist(), gaps))
+    assert episodes[0] == episodes[1]
+
+    env.reset(options={"pipe_course": [1]})
+    assert np.all(env.get_state()["pipes"][:, 1] == env.upcoming_gaps(1))
+
+
+def test_vector_env_course():
+    envs = FlappyBirdVectorEnv(num_envs=3, pipe_course=[4, 6])
+    envs.reset(seed=0)
+    upcoming = envs.upcoming_gaps(4)
+    assert upcoming.shape == (3, 4)
+    assert np.all(upcoming == upcoming[0])
+
+    env = FlappyBirdEnv(pipe_course=[4, 6])
+    env.reset(seed=5)
+    assert np.array_equal(envs._game.lower_pipes_y[0], env._pipes.gap_bottom)
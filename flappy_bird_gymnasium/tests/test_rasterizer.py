@@ -0,0 +1,113 @@
+"""Tests that the headless renderer draws the same frames as pygame."""
+
+import gymnasium
+import numpy as np
+import pygame
+
+from flappy_bird_gymnasium import FlappyBirdEnv
+from flappy_bird_gymnasium.envs.rasterizer import GRAYSCALE_WEIGHTS, PixelObservation
+
+
+def check_same_frames(steps, **kwargs):
+    env = FlappyBirdEnv(render_mode="rgb_array", use_pixels=True, **kwargs)
+    rng = np.random.default_rng(0)
+    obs, _ = env.reset(seed=0)
+    for _ in range(steps):
+        env._draw_surface(show_score=False, show_rays=False)
+        expected = np.transpose(pygame.surfarray.array3d(env._surface), (1, 0, 2))
+        assert np.array_equal(obs, expected)
+
+        obs, _, terminated, _, _ = env.step(int(rng.random() < 0.12))
+        if terminated:
+            obs, _ = env.reset()
+    env.close()
+
+
+def test_same_frames():
+    check_same_frames(steps=300)
+
+
+def test_same_frames_other_sprites():
+    check_same_frames(steps=150, bird_color="red", pipe_color="red", background="night")
+    check_same_frames(steps=150, background=None)
+
+
+def test_pixels_without_render_mode():
+    env = FlappyBirdEnv(use_pixels=True)
+    obs, _ = env.reset(seed=0)
+    assert obs.shape == (512, 288, 3)
+    next_obs, _, _, _, _ = env.step(1)
+    assert not np.array_equal(obs, next_obs)
+
+
+def test_pixels_observation_space():
+    for kwargs in (
+        {},
+        {"pixels_size": (84, 84), "pixels_grayscale": True},
+        {"pixels_size": (144, 256), "pixels_dtype": np.float32},
+    ):
+        env = FlappyBirdEnv(use_pixels=True, **kwargs)
+        obs, _ = env.reset(seed=0)
+        assert env.observation_space.contains(obs)
+        for _ in range(20):
+            obs, _, _, _, _ = env.step(env.action_space.sample())
+            assert env.observation_space.contains(obs)
+    assert obs.shape == (256, 144, 3)
+
+
+def test_pixels_conversion():
+    frame = np.random.default_rng(0).integers(0, 256, (512, 288, 3), np.uint8)
+
+    gray = PixelObservation((288, 512), grayscale=True)(frame)
+    expected = np.rint(frame @ np.array(GRAYSCALE_WEIGHTS))
+    assert np.abs(gray.astype(np.int64) - expected).max() <= 1
+
+    # halving the size averages blocks of 2x2 pixels
+    half = PixelObservation((288, 512), size=(144, 256), dtype=np.float64)(frame)
+    expected = frame.reshape(256, 2, 144, 2, 3).mean(axis=(1, 3)) / 255
+    assert np.allclose(half, expected, atol=1e-6)
+
+    small = PixelObservation((288, 512), size=(84, 84), grayscale=True)(frame)
+    assert small.shape == (84, 84) and small.dtype == np.uint8
+
+
+def test_rgb_array_render():
+    env = FlappyBirdEnv(render_mode="rgb_array")
+    view_env = FlappyBirdEnv(render_mode="rgb_array", copy_frames=False)
+    env.reset(seed=0)
+    view_env.reset(seed=0)
+    for i in range(60):
+        frame = env.render()
+        view = view_env.render()
+        env._draw_surface(show_score=False, show_rays=False)
+        expected = np.transpose(pygame.surfarray.array3d(env._surface), (1, 0, 2))
+        assert np.array_equal(frame, expected)
+        assert np.array_equal(view, expected)
+        assert view is view_env.render()
+        env.step(int(i % 10 == 0))
+        view_env.step(int(i % 10 == 0))
+
+
+def test_rgb_array_list_render():
+    env = gymnasium.make("FlappyBird-v0", render_mode="rgb_array_list")
+    assert env.unwrapped.render_mode == "rgb_array_list"
+    frames_env = FlappyBirdEnv(render_mode="rgb_array")
+
+    env.reset(seed=0)
+    expected = [frames_env.reset(seed=0) and frames_env.render()]
+    for i in range(70):
+        env.step(int(i % 10 == 0))
+        frames_env.step(int(i % 10 == 0))
+        expected.append(frames_env.render())
+
+    frames = env.render()
+    assert len(frames) == len(expected)
+    for frame, expected_frame in zip(frames, expected):
+        assert np.array_equal(frame, expected_frame)
+    assert env.render() == []
+
+    # the returned frames are not overwritten by the next ones
+    first = frames[0].copy()
+    env.reset(seed=1)
+    assert len(env.render()) == 1
+    assert np.array_equal(frames[0], first)
@@ -0,0 +1,84 @@
+"""Tests that the batched simulation of action plans matches the plans played in
+a standalone environment.
+"""
+
+import numpy as np
+import pytest
+
+from flappy_bird_gymnasium import FlappyBirdEnv
+from flappy_bird_gymnasium.tests.heuristic import heuristic_action
+
+
+def heuristic_plan(env, state, horizon):
+    env.set_state(state)
+    plan = np.zeros(horizon, dtype=np.int64)
+    for step in range(horizon):
+        plan[step] = heuristic_action(env)
+        env.step(plan[step])
+    return plan
+
+
+def make_plans(env, state, rng, num_plans, horizon):
+    # the heuristic's plan, more and more perturbed so the plans end at
+    # various steps
+    plans = np.tile(heuristic_plan(env, state, horizon), (num_plans, 1))
+    flip_probs = np.linspace(0, 0.2, num_plans)[:, np.newaxis]
+    flip = rng.random((num_plans, horizon)) < flip_probs
+    return np.where(flip, 1 - plans, plans)
+
+
+@pytest.mark.parametrize(
+    "kwargs, horizon",
+    [
+        ({}, 200),
+        ({"use_lidar": True}, 200),
+        ({"frame_skip": 4}, 8),
+        ({"use_lidar": True, "frame_skip": 4}, 8),
+    ],
+)
+def test_simulate(kwargs, horizon):
+    env = FlappyBirdEnv(**kwargs)
+    rng = np.random.default_rng(0)
+    env.reset(seed=3)
+    for _ in range(30):
+        env.step(int(rng.random() < 0.1))
+    state = env.get_state()
+
+    plans = make_plans(FlappyBirdEnv(**kwargs), state, rng, 24, horizon)
+    rewards, terminated_at, final_states = env.simulate(None, plans)
+    assert rewards.shape == plans.shape
+    assert terminated_at.shape == final_states.shape == (24,)
+    assert np.any(terminated_at == -1) and np.any(terminated_at >= 0)
+    # the environment's own state is left untouched
+    assert env.get_state() == state
+
+    other_env = FlappyBirdEnv(**kwargs)
+    for plan_idx, plan in enumerate(plans):
+        other_env.set_state(state)
+        expected_rewards = np.zeros(len(plan))
+        expected_terminated_at = -1
+        for step, action in enumerate(plan):
+            _, reward, terminated, _, _ = other_env.step(action)
+            expected_rewards[step] = reward
+            if terminated:
+                expected_terminated_at = step
+                break
+
+        assert np.array_equal(rewards[plan_idx], expected_rewards)
+        assert terminated_at[plan_idx] == expected_terminated_at
+        assert final_states[plan_idx] == other_env.get_state()
+
+
+def test_simulate_from_state():
+    env = FlappyBirdEnv()
+    env.reset(seed=0)
+    state = env.get_state()
+    env.step(1)
+
+    plans = make_plans(FlappyBirdEnv(), state, np.random.default_rng(1), 8, 60)
+    result = env.simulate(state, plans)
+
+    env.set_state(state)
+    assert np.array_equal(env.simulate(None, plans).rewards, result.rewards)
+    with pytest.raises(ValueError):
+        env.simulate(state, plans[0])
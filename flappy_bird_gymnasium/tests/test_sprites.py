@@ -0,0 +1,44 @@
+"""Tests for the atlas of the player's pre-rotated sprites."""
+
+import numpy as np
+import pygame
+
+from flappy_bird_gymnasium import FlappyBirdEnv
+from flappy_bird_gymnasium.envs import utils
+from flappy_bird_gymnasium.envs.sprites import VISIBLE_ROTATIONS, PlayerAtlas
+
+
+def test_atlas_covers_visible_rotations():
+    env = FlappyBirdEnv()
+    atlas = PlayerAtlas(utils.load_images(convert=False)["player"])
+    num_sprites = len(atlas.sprites)
+    assert num_sprites == 3 * len(VISIBLE_ROTATIONS)
+
+    rng = np.random.default_rng(0)
+    env.reset(seed=0)
+    for _ in range(500):
+        _, _, terminated, _, _ = env.step(int(rng.random() < 0.1))
+        key = (env._player_idx, atlas.visible_rotation(env._player_rot))
+        assert key in atlas.sprites
+        if terminated:
+            env.reset()
+    assert len(atlas.sprites) == num_sprites
+
+
+def test_atlas_sprites():
+    frames = utils.load_images(convert=False)["player"]
+    atlas = PlayerAtlas(frames, decode=False)
+    assert not atlas.sprites
+
+    for player_idx, player_rot in ((0, 45), (1, 20), (2, -33), (1, -90), (0, 7)):
+        visible_rot = min(player_rot, 20)
+        expected = pygame.transform.rotate(frames[player_idx], visible_rot)
+        surface = atlas.surface(player_idx, player_rot)
+        assert surface.get_size() == expected.get_size()
+        assert np.array_equal(
+            pygame.surfarray.array3d(surface), pygame.surfarray.array3d(expected)
+        )
+
+        sprite = atlas.sprite(player_idx, player_rot)
+        assert (sprite.width, sprite.height) == expected.get_size()
+        assert atlas.sprite(player_idx, player_rot) is sprite
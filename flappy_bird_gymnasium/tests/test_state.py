@@ -0,0 +1,65 @@
+"""Tests that restoring a snapshot of the game's state reproduces the original
+trajectory.
+"""
+
+import numpy as np
+import pytest
+
+from flappy_bird_gymnasium import FlappyBirdEnv
+from flappy_bird_gymnasium.core import STATE_DTYPE
+
+
+def play(env, actions):
+    transitions = []
+    for action in actions:
+        obs, reward, terminated, truncated, info = env.step(action)
+        transitions.append((np.array(obs), reward, terminated, info["score"]))
+        if terminated:
+            env.reset()
+    return transitions
+
+
+def check_same_transitions(transitions, expected):
+    assert len(transitions) == len(expected)
+    for (obs, *rest), (expected_obs, *expected_rest) in zip(transitions, expected):
+        assert np.array_equal(obs, expected_obs)
+        assert rest == expected_rest
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"use_lidar": True}, {"use_pixels": True}])
+def test_restore_state(kwargs):
+    env = FlappyBirdEnv(**kwargs)
+    rng = np.random.default_rng(0)
+    env.reset(seed=0)
+    play(env, rng.random(90) < 0.1)
+
+    state = env.get_state()
+    assert state.dtype == STATE_DTYPE and state.shape == ()
+
+    # long enough to respawn pipes and to start new episodes
+    actions = rng.random(600) < 0.1
+    expected = play(env, actions)
+
+    env.set_state(state)
+    check_same_transitions(play(env, actions), expected)
+
+    other_env = FlappyBirdEnv(**kwargs)
+    other_env.set_state(state)
+    check_same_transitions(play(other_env, actions), expected)
+
+
+def test_branch_states():
+    env = FlappyBirdEnv()
+    env.reset(seed=1)
+    states = [env.get_state()]
+    for step in range(40):
+        env.step(int(step % 7 == 0))
+        states.append(env.get_state())
+
+    # the snapshots are independent of each other and can be stacked
+    states = np.stack(states)
+    assert states.shape == (41,)
+    env.set_state(states[10])
+    for step in range(10, 40):
+        env.step(int(step % 7 == 0))
+        assert env.get_state() == states[step + 1]
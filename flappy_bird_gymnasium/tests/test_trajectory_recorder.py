@@ -0,0 +1,83 @@
+"""Tests the wrapper recording trajectories into memory-mapped files."""
+
+import numpy as np
+import pytest
+from gymnasium.error import ResetNeeded
+
+from flappy_bird_gymnasium import FlappyBirdEnv
+from flappy_bird_gymnasium.wrappers import TrajectoryDataset, TrajectoryRecorder
+
+
+def play(env, num_episodes, max_steps):
+    rng = np.random.default_rng(0)
+    episodes = []
+    for episode in range(num_episodes):
+        obs, _ = env.reset(seed=episode)
+        trajectory = {"observations": [np.array(obs)], "actions": [], "rewards": []}
+        trajectory["scores"] = []
+        for _ in range(max_steps):
+            action = int(rng.random() < 0.1)
+            obs, reward, terminated, truncated, info = env.step(action)
+            trajectory["observations"].append(np.array(obs))
+            trajectory["actions"].append(action)
+            trajectory["rewards"].append(reward)
+            trajectory["scores"].append(info["score"])
+            if terminated or truncated:
+                break
+        episodes.append(trajectory)
+    return episodes
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"use_lidar": True}, {"use_pixels": True, "pixels_size": (72, 128)}]
+)
+def test_record_episodes(tmp_path, kwargs):
+    env = TrajectoryRecorder(FlappyBirdEnv(**kwargs), str(tmp_path), capacity=8)
+    # the episodes that are still running are ended by `reset` or `close`
+    expected = play(env, num_episodes=4, max_steps=150)
+    env.close()
+
+    dataset = TrajectoryDataset(str(tmp_path))
+    assert dataset.num_episodes == 4
+    assert len(dataset["rewards"]) == sum(len(e["rewards"]) for e in expected)
+    for index, trajectory in enumerate(expected):
+        episode = dataset.episode(index)
+        assert np.array_equal(episode["observations"], trajectory["observations"])
+        assert np.array_equal(episode["actions"], trajectory["actions"])
+        assert np.array_equal(episode["rewards"], trajectory["rewards"])
+        assert np.array_equal(episode["info.score"], trajectory["scores"])
+        assert episode["terminations"][:-1].sum() == 0
+    assert episode["observations"].dtype == env.observation_space.dtype
+
+
+def test_read_while_recording(tmp_path):
+    env = TrajectoryRecorder(FlappyBirdEnv(), str(tmp_path), capacity=4)
+    expected = play(env, num_episodes=2, max_steps=1000)
+
+    dataset = TrajectoryDataset(str(tmp_path))
+    assert dataset.num_episodes == 2
+    assert np.array_equal(dataset.episode(-1)["rewards"], expected[-1]["rewards"])
+    assert dataset.episode(-1)["terminations"][-1]
+
+    env.close()
+    with pytest.raises(FileExistsError):
+        TrajectoryRecorder(FlappyBirdEnv(), str(tmp_path))
+
+
+def test_step_outside_episode(tmp_path):
+    env = TrajectoryRecorder(FlappyBirdEnv(), str(tmp_path))
+    with pytest.raises(ResetNeeded):
+        env.step(0)
+
+    env.reset(seed=0)
+    terminated = False
+    while not terminated:
+        _, _, terminated, _, _ = env.step(0)
+    with pytest.raises(ResetNeeded):
+        env.step(0)
+    env.close()
+
+    dataset = TrajectoryDataset(str(tmp_path))
+    episode = dataset.episode(0)
+    assert len(episode["observations"]) == len(episode["actions"]) + 1
+    assert len(dataset["observations"]) == len(dataset["actions"]) + 1
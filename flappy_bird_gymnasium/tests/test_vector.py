@@ -0,0 +1,68 @@
+"""Tests that the natively vectorized environment reproduces the trajectories of
+independent Flappy Bird environments.
+"""
+
+import gymnasium
+import numpy as np
+
+from flappy_bird_gymnasium import FlappyBirdEnv, FlappyBirdVectorEnv
+from flappy_bird_gymnasium.tests.heuristic import heuristic_actions
+
+
+def heuristic_policy(env, rng):
+    game = env._game
+    return heuristic_actions(
+        game.player_y, game.pipes_x, game.lower_pipes_y, rng=rng, noise=0.03
+    )
+
+
+def check_same_trajectories(num_envs, steps, **kwargs):
+    vector_env = FlappyBirdVectorEnv(num_envs=num_envs, score_limit=5, **kwargs)
+    sync_env = gymnasium.vector.SyncVectorEnv(
+        [lambda: FlappyBirdEnv(score_limit=5, **kwargs) for _ in range(num_envs)]
+    )
+    rng = np.random.default_rng(0)
+
+    obs, info = vector_env.reset(seed=42)
+    expected_obs, expected_info = sync_env.reset(seed=42)
+    assert np.array_equal(obs, expected_obs)
+
+    episodes = 0
+    for _ in range(steps):
+        actions = heuristic_policy(vector_env, rng)
+        obs, reward, terminated, truncated, info = vector_env.step(actions)
+        expected = sync_env.step(actions)
+
+        assert np.array_equal(obs, expected[0])
+        assert np.array_equal(reward, expected[1])
+        assert np.array_equal(terminated, expected[2])
+        assert np.array_equal(truncated, expected[3])
+        assert np.array_equal(info["score"], expected[4]["score"])
+        episodes += np.count_nonzero(terminated | truncated)
+
+    vector_env.close()
+    sync_env.close()
+    assert episodes > 0
+
+
+def test_same_trajectories():
+    check_same_trajectories(num_envs=8, steps=1500)
+
+
+def test_same_trajectories_lidar():
+    check_same_trajectories(num_envs=4, steps=500, use_lidar=True)
+    check_same_trajectories(
+        num_envs=4, steps=300, use_lidar=True, lidar_rays=30, lidar_fov=240
+    )
+
+
+def test_make_vec():
+    envs = gymnasium.make_vec("FlappyBird-v0", num_envs=4)
+    assert isinstance(envs.unwrapped, FlappyBirdVectorEnv)
+
+    obs, _ = envs.reset(seed=0)
+    assert obs.shape == envs.observation_space.shape
+    obs, reward, _, _, _ = envs.step(envs.action_space.sample())
+    assert obs.shape == envs.observation_space.shape
+    assert reward.shape == (4,)
+    envs.close()
@@ -0,0 +1,107 @@
+"""Tests the wrapper streaming the recorded episodes into videos."""
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from flappy_bird_gymnasium import FlappyBirdEnv
+from flappy_bird_gymnasium.wrappers import VideoRecorder
+
+
+def run_episodes(env, num_episodes, max_steps=60):
+    frames = []
+    for episode in range(num_episodes):
+        env.reset(seed=episode)
+        episode_frames = [np.array(env.unwrapped.render())]
+        for step in range(max_steps):
+            _, _, terminated, _, _ = env.step(int(step % 8 == 0))
+            episode_frames.append(np.array(env.unwrapped.render()))
+            if terminated:
+                break
+        frames.append(episode_frames)
+    env.close()
+    return frames
+
+
+def test_record_gif(tmp_path):
+    env = VideoRecorder(
+        FlappyBirdEnv(render_mode="rgb_array", copy_frames=False),
+        str(tmp_path),
+        every_n_episodes=2,
+        frame_skip=3,
+        block=True,
+    )
+    frames = run_episodes(env, num_episodes=3)
+    assert sorted(os.listdir(tmp_path)) == ["episode-0.gif", "episode-2.gif"]
+    assert env.dropped_frames == 0
+
+    for episode in (0, 2):
+        with Image.open(tmp_path / f"episode-{episode}.gif") as video:
+            expected = frames[episode][::3]
+            assert video.n_frames == len(expected)
+            for i, frame in enumerate(expected):
+                video.seek(i)
+                decoded = np.asarray(video.convert("RGB"), dtype=np.int64)
+                assert np.abs(decoded - frame).mean() < 2
+
+
+def test_record_png(tmp_path):
+    env = VideoRecorder(
+        FlappyBirdEnv(render_mode="rgb_array"),
+        str(tmp_path),
+        video_format="png",
+        episode_trigger=lambda episode_id: episode_id == 1,
+        block=True,
+    )
+    frames = run_episodes(env, num_episodes=2, max_steps=20)
+    images = sorted(os.listdir(tmp_path / "episode-1"))
+    assert len(images) == len(frames[1])
+    for image, frame in zip(images, frames[1]):
+        assert np.array_equal(
+            np.asarray(Image.open(tmp_path / "episode-1" / image)), frame
+        )
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg isn't installed")
+def test_record_mp4(tmp_path):
+    env = VideoRecorder(
+        FlappyBirdEnv(render_mode="rgb_array"),
+        str(tmp_path),
+        video_format="mp4",
+        block=True,
+    )
+    run_episodes(env, num_episodes=1)
+    assert os.path.getsize(tmp_path / "episode-0.mp4") > 0
+
+
+def test_requires_rgb_array(tmp_path):
+    with pytest.raises(ValueError):
+        VideoRecorder(FlappyBirdEnv(), str(tmp_path))
+
+
+def test_failed_writer_is_closed(tmp_path):
+    writers = []
+
+    class FailingWriter:
+        extension = ".raw"
+
+        def __init__(self, path, fps):
+            self.file = open(path, "wb")
+            writers.append(self)
+
+        def write(self, frame):
+            raise OSError("disk full")
+
+        def close(self):
+            self.file.close()
+
+    env = VideoRecorder(
+        FlappyBirdEnv(render_mode="rgb_array"), str(tmp_path), block=True
+    )
+    env._writer = FailingWriter
+    with pytest.raises(RuntimeError, match="Encoding a video failed"):
+        run_episodes(env, num_episodes=2)
+    assert len(writers) == 1 and writers[0].file.closed
@@ -0,0 +1,44 @@
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""Exposes the wrappers of the Flappy Bird environments."""
+
+from flappy_bird_gymnasium.wrappers.frame_stack import (
+    FrameStack,
+    LazyFrames,
+    VectorFrameStack,
+)
+from flappy_bird_gymnasium.wrappers.trajectory_recorder import (
+    TrajectoryDataset,
+    TrajectoryRecorder,
+)
+from flappy_bird_gymnasium.wrappers.video_recorder import VideoRecorder
+
+__all__ = [
+    FrameStack.__name__,
+    LazyFrames.__name__,
+    TrajectoryDataset.__name__,
+    TrajectoryRecorder.__name__,
+    VectorFrameStack.__name__,
+    VideoRecorder.__name__,
+]
@@ -0,0 +1,287 @@
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""Wrappers stacking the last observations of an environment, or of all the
+sub-environments of a vector environment.
+
+The frames are written, one per step, into a preallocated buffer with room for
+twice the stack. The stack is always its last `num_stack` frames, a contiguous
+slice, so it's returned without stacking anything. When the buffer is full,
+its last `num_stack - 1` frames are moved to its front (or to a new buffer,
+when the stacks are handed out lazily), which costs about one frame per step.
+"""
+
+from typing import Any, Dict, Optional, Sequence, SupportsFloat, Tuple, Union
+
+import gymnasium
+import numpy as np
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import batch_space
+
+
+class LazyFrames:
+    """A stack of frames that is only copied into an array on demand.
+
+    It references a read-only slice of the buffer of :class:`FrameStack`,
+    which is never overwritten, so it stays valid indefinitely and
+    consecutive stacks share their frames (e.g. in a replay buffer). Use
+    `np.asarray(frames)` to get the stack as an array.
+
+    Args:
+        frames (np.ndarray): The stacked frames, of shape
+            `(num_stack, *obs_shape)`.
+    """
+
+    __slots__ = ("_frames",)
+
+    def __init__(self, frames: np.ndarray) -> None:
+        self._frames = frames
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if copy:
+            return np.array(self._frames, dtype=dtype)
+        return np.asarray(self._frames, dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __getitem__(self, index: Any) -> np.ndarray:
+        return self._frames[index]
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._frames.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._frames.dtype
+
+    def __getstate__(self) -> np.ndarray:
+        # only the stack is pickled, not the whole buffer it's a slice of
+        return np.array(self._frames)
+
+    def __setstate__(self, frames: np.ndarray) -> None:
+        self._frames = frames
+
+
+class FrameStack(gymnasium.Wrapper):
+    """Stacks the last `num_stack` observations of an environment.
+
+    The observations are stacked along a new first axis. On reset, the stack is
+    filled with the first observation.
+
+    Args:
+        env (gymnasium.Env): The environment. Its observation space must be a
+            :class:`gymnasium.spaces.Box`.
+        num_stack (int): Number of stacked observations.
+        lazy_frames (bool): If `True`, the stacks are returned as
+            :class:`LazyFrames`, which stay valid without copying.
+        copy_obs (bool): If `False` (and `lazy_frames` is `False`), the stacks
+            are returned as views of the internal buffer, which are overwritten
+            by the next call to :meth:`step` or :meth:`reset`. Saves a copy per
+            step when the stacks are consumed right away.
+    """
+
+    def __init__(
+        self,
+        env: gymnasium.Env,
+        num_stack: int,
+        lazy_frames: bool = False,
+        copy_obs: bool = True,
+    ) -> None:
+        super().__init__(env)
+        if num_stack < 1:
+            raise ValueError(f"num_stack must be positive, got {num_stack}.")
+        self.num_stack = num_stack
+        self._lazy_frames = lazy_frames
+        self._copy_obs = copy_obs
+
+        space = env.observation_space
+        low = np.repeat(space.low[np.newaxis, ...], num_stack, axis=0)
+        high = np.repeat(space.high[np.newaxis, ...], num_stack, axis=0)
+        self.observation_space = gymnasium.spaces.Box(
+            low=low, high=high, dtype=space.dtype
+        )
+
+        self._buffer = np.empty((2 * num_stack, *space.shape), dtype=space.dtype)
+        self._end = num_stack  # the stack is `_buffer[_end - num_stack:_end]`
+
+    def reset(
+        self, *, seed: Optional[int] = None, options: Optional[Dict] = None
+    ) -> Tuple[Union[np.ndarray, LazyFrames], Dict]:
+        """Resets the environment, and fills the stack with its observation."""
+        obs, info = self.env.reset(seed=seed, options=options)
+        if self._lazy_frames:
+            self._buffer = np.empty_like(self._buffer)
+        self._buffer[: self.num_stack] = obs
+        self._end = self.num_stack
+        return self._stack(), info
+
+    def step(
+        self, action: Any
+    ) -> Tuple[Union[np.ndarray, LazyFrames], SupportsFloat, bool, bool, Dict]:
+        """Steps the environment, and pushes its observation onto the stack."""
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        self._push(obs)
+        return self._stack(), reward, terminated, truncated, info
+
+    def _push(self, obs: Any) -> None:
+        if self._end == len(self._buffer):
+            # keep the newest frames, in front of the free slots
+            kept = slice(self._end - self.num_stack + 1, self._end)
+            if self._lazy_frames:
+                # the handed out stacks still reference the full buffer
+                buffer = np.empty_like(self._buffer)
+                buffer[: self.num_stack - 1] = self._buffer[kept]
+                self._buffer = buffer
+            else:
+                self._buffer[: self.num_stack - 1] = self._buffer[kept]
+            self._end = self.num_stack - 1
+
+        self._buffer[self._end] = obs
+        self._end += 1
+
+    def _stack(self) -> Union[np.ndarray, LazyFrames]:
+        stack = self._buffer[slice(self._end - self.num_stack, self._end)]
+        if self._lazy_frames:
+            stack.flags.writeable = False
+            return LazyFrames(stack)
+        if self._copy_obs:
+            return stack.copy()
+        return stack
+
+
+class VectorFrameStack(gymnasium.vector.VectorWrapper):
+    """Stacks the last `num_stack` observations of every sub-environment.
+
+    The observations of all the sub-environments are stacked together, in an
+    `(num_envs, 2 * num_stack, *obs_shape)` buffer, and returned as a single
+    contiguous array of shape `(num_envs, num_stack, *obs_shape)`. When a
+    sub-environment starts a new episode, only its row of the stack is filled
+    with the first observation, following the vector environment's autoreset
+    mode.
+
+    Args:
+        env (gymnasium.vector.VectorEnv): The vector environment. Its single
+            observation space must be a :class:`gymnasium.spaces.Box`.
+        num_stack (int): Number of stacked observations.
+        copy_obs (bool): If `False`, the stacks are returned in the same array,
+            which is overwritten by the next call to :meth:`step` or
+            :meth:`reset`, instead of new arrays.
+    """
+
+    def __init__(
+        self,
+        env: gymnasium.vector.VectorEnv,
+        num_stack: int,
+        copy_obs: bool = True,
+    ) -> None:
+        super().__init__(env)
+        if num_stack < 1:
+            raise ValueError(f"num_stack must be positive, got {num_stack}.")
+        self.num_stack = num_stack
+        self._copy_obs = copy_obs
+
+        space = env.single_observation_space
+        low = np.repeat(space.low[np.newaxis, ...], num_stack, axis=0)
+        high = np.repeat(space.high[np.newaxis, ...], num_stack, axis=0)
+        self.single_observation_space = gymnasium.spaces.Box(
+            low=low, high=high, dtype=space.dtype
+        )
+        self.observation_space = batch_space(
+            self.single_observation_space, self.num_envs
+        )
+
+        self._buffer = np.empty(
+            (self.num_envs, 2 * num_stack, *space.shape), dtype=space.dtype
+        )
+        self._end = num_stack  # the stacks are `_buffer[:, _end - num_stack:_end]`
+        self._stacks = np.empty(self.observation_space.shape, dtype=space.dtype)
+        self._autoreset_mode = env.metadata.get(
+            "autoreset_mode", AutoresetMode.NEXT_STEP
+        )
+        self._autoreset_envs = np.zeros(self.num_envs, dtype=np.bool_)
+
+    def reset(
+        self,
+        *,
+        seed: Optional[Union[int, Sequence[Optional[int]]]] = None,
+        options: Optional[Dict] = None,
+    ) -> Tuple[np.ndarray, Dict]:
+        """Resets the sub-environments, and fills their stacks with their
+        observations.
+
+        Only the sub-environments selected by a `"reset_mask"` option, if
+        there is one, have their stacks filled.
+        """
+        # read before resetting, as some vector environments pop the mask
+        if options is not None and "reset_mask" in options:
+            reset_envs = np.array(options["reset_mask"], dtype=np.bool_)
+        else:
+            reset_envs = np.ones(self.num_envs, dtype=np.bool_)
+        obs, info = self.env.reset(seed=seed, options=options)
+        self._fill(reset_envs, obs)
+        self._autoreset_envs[reset_envs] = False
+        return self._stack(), info
+
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """Steps the sub-environments, and pushes their observations onto the
+        stacks."""
+        obs, rewards, terminations, truncations, info = self.env.step(actions)
+
+        if self._end == self._buffer.shape[1]:
+            # keep the newest frames, in front of the free slots
+            kept = slice(self._end - self.num_stack + 1, self._end)
+            self._buffer[:, : self.num_stack - 1] = self._buffer[:, kept]
+            self._end = self.num_stack - 1
+        self._buffer[:, self._end] = obs
+        self._end += 1
+
+        # the sub-environments whose observation starts a new episode
+        if self._autoreset_mode == AutoresetMode.NEXT_STEP:
+            reset_envs = self._autoreset_envs
+            self._autoreset_envs = terminations | truncations
+        elif self._autoreset_mode == AutoresetMode.SAME_STEP:
+            reset_envs = terminations | truncations
+        else:
+            reset_envs = None
+        if reset_envs is not None and np.any(reset_envs):
+            self._fill(reset_envs, obs)
+
+        return self._stack(), rewards, terminations, truncations, info
+
+    def _fill(self, env_mask: np.ndarray, obs: np.ndarray) -> None:
+        """Fills the stacks of the masked sub-environments with their
+        observations."""
+        env_indices = np.flatnonzero(env_mask)
+        window = slice(self._end - self.num_stack, self._end)
+        self._buffer[env_indices, window] = obs[env_indices, np.newaxis]
+
+    def _stack(self) -> np.ndarray:
+        window = self._buffer[:, slice(self._end - self.num_stack, self._end)]
+        if self._copy_obs:
+            return np.ascontiguousarray(window)
+        np.copyto(self._stacks, window)
+        return self._stacks
@@ -0,0 +1,312 @@
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""Wrapper recording trajectories into memory-mapped columnar files.
+
+Every recorded quantity (observations, actions, rewards, ...) is a column,
+stored in its own raw binary file and appended to through a memory map. The
+files grow geometrically, so appending a step is only a few array writes. A
+`metadata.json` file describes the columns and an `episodes` column holds the
+episodes' boundaries; both are updated at the end of every episode, so a
+dataset can be read (with :class:`TrajectoryDataset`) while it's recorded,
+without loading it into memory.
+
+An episode of `T` steps has `T + 1` observations (the first one is returned by
+`reset`) and `T` actions, rewards, terminations, truncations and infos.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional, Sequence, SupportsFloat, Tuple
+
+import gymnasium
+import numpy as np
+from gymnasium.error import ResetNeeded
+
+_METADATA_FILE = "metadata.json"
+
+
+class _Column:
+    """A growable array backed by a memory-mapped file.
+
+    Args:
+        name (str): The column's name.
+        path (str): The file's path.
+        dtype (np.dtype): The elements' data type.
+        shape (Tuple[int, ...]): The shape of each row.
+        capacity (int): Number of rows allocated at first.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        dtype: np.dtype,
+        shape: Tuple[int, ...],
+        capacity: int,
+    ) -> None:
+        self.name = name
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.shape = tuple(shape)
+        self.length = 0
+        self._row_size = self.dtype.itemsize * int(np.prod(self.shape))
+        self._file = open(path, "w+b")
+        self._resize(max(capacity, 1))
+
+    def append(self, row: Any) -> None:
+        if self.length == len(self._rows):
+            self._resize(2 * len(self._rows))
+        self._rows[self.length] = row
+        self.length += 1
+
+    def flush(self) -> None:
+        self._array.flush()
+
+    def close(self) -> None:
+        """Flushes the rows and shrinks the file to them."""
+        self.flush()
+        del self._array, self._rows
+        self._file.truncate(self.length * self._row_size)
+        self._file.close()
+
+    def _resize(self, capacity: int) -> None:
+        # growing the file keeps the rows already written, and the new memory
+        # map doesn't copy them
+        self._file.truncate(capacity * self._row_size)
+        self._array = np.memmap(
+            self._file, dtype=self.dtype, mode="r+", shape=(capacity, *self.shape)
+        )
+        # writing through a plain view skips the memmap subclass's overhead
+        self._rows = self._array.view(np.ndarray)
+
+    def metadata(self) -> Dict[str, Any]:
+        return {
+            "file": os.path.basename(self.path),
+            "dtype": self.dtype.str,
+            "shape": list(self.shape),
+            "length": self.length,
+        }
+
+
+class TrajectoryRecorder(gymnasium.Wrapper):
+    """Records every step of an environment into memory-mapped columns.
+
+    The columns are `observations`, `actions`, `rewards`, `terminations`,
+    `truncations`, one `info.{key}` column per recorded info key, and
+    `episodes`, whose rows are the index of each episode's first step and its
+    number of steps. An episode ends when it's terminated or truncated, or when
+    the environment is reset or closed.
+
+    Args:
+        env (gymnasium.Env): The environment. Its observation and action spaces
+            must be :class:`gymnasium.spaces.Box` or `Discrete`.
+        path (str): Directory the dataset is written to. It must not contain a
+            dataset already.
+        info_keys (Sequence[str]): The entries of the info dictionaries to
+            record. Their values must have the same type and shape every step.
+        capacity (int): Number of steps the files are allocated for at first.
+    """
+
+    def __init__(
+        self,
+        env: gymnasium.Env,
+        path: str,
+        info_keys: Sequence[str] = ("score",),
+        capacity: int = 4096,
+    ) -> None:
+        super().__init__(env)
+        if os.path.exists(os.path.join(path, _METADATA_FILE)):
+            raise FileExistsError(f"{path} already contains a dataset.")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._info_keys = tuple(info_keys)
+        self._capacity = capacity
+
+        obs_space, action_space = env.observation_space, env.action_space
+        self._columns = {
+            "observations": self._column(
+                "observations", obs_space.dtype, obs_space.shape
+            ),
+            "actions": self._column("actions", action_space.dtype, action_space.shape),
+            "rewards": self._column("rewards", np.float64, ()),
+            "terminations": self._column("terminations", np.bool_, ()),
+            "truncations": self._column("truncations", np.bool_, ()),
+            "episodes": self._column("episodes", np.int64, (2,), capacity=64),
+        }
+        self._steps = self._columns["rewards"]
+        self._episode_start: Optional[int] = None
+
+    @property
+    def num_steps(self) -> int:
+        """Number of steps recorded."""
+        return self._steps.length
+
+    @property
+    def num_episodes(self) -> int:
+        """Number of episodes recorded, not counting the current one."""
+        return self._columns["episodes"].length
+
+    def reset(
+        self, *, seed: Optional[int] = None, options: Optional[Dict] = None
+    ) -> Tuple[Any, Dict]:
+        """Resets the environment, and starts recording a new episode."""
+        self._end_episode()
+        obs, info = super().reset(seed=seed, options=options)
+        self._columns["observations"].append(obs)
+        self._episode_start = self.num_steps
+        return obs, info
+
+    def step(self, action: Any) -> Tuple[Any, SupportsFloat, bool, bool, Dict]:
+        """Steps the environment, and records the step. Every recorded step
+        belongs to an episode, so the environment must be reset once an episode
+        is over."""
+        if self._episode_start is None:
+            raise ResetNeeded(
+                "Cannot record a step outside of an episode, reset the "
+                "environment first."
+            )
+        obs, reward, terminated, truncated, info = super().step(action)
+        columns = self._columns
+        columns["observations"].append(obs)
+        columns["actions"].append(action)
+        columns["rewards"].append(reward)
+        columns["terminations"].append(terminated)
+        columns["truncations"].append(truncated)
+        for key in self._info_keys:
+            column = columns.get(f"info.{key}")
+            if column is None:
+                value = np.asarray(info[key])
+                column = self._column(f"info.{key}", value.dtype, value.shape)
+                columns[column.name] = column
+            column.append(info[key])
+
+        if terminated or truncated:
+            self._end_episode()
+        return obs, reward, terminated, truncated, info
+
+    def close(self) -> None:
+        """Ends the current episode, shrinks the files to the recorded steps
+        and closes the environment."""
+        self._end_episode()
+        for column in self._columns.values():
+            column.close()
+        self._write_metadata()
+        super().close()
+
+    def _column(
+        self,
+        name: str,
+        dtype: np.dtype,
+        shape: Tuple[int, ...],
+        capacity: Optional[int] = None,
+    ) -> _Column:
+        return _Column(
+            name,
+            os.path.join(self.path, f"{name}.bin"),
+            dtype,
+            shape,
+            self._capacity if capacity is None else capacity,
+        )
+
+    def _end_episode(self) -> None:
+        if self._episode_start is None:
+            return
+        self._columns["episodes"].append(
+            (self._episode_start, self.num_steps - self._episode_start)
+        )
+        self._episode_start = None
+        # the rows written through the memory maps are already visible to the
+        # readers; they're only flushed to the disk when the recorder is closed
+        self._write_metadata()
+
+    def _write_metadata(self) -> None:
+        metadata = {
+            "columns": {
+                name: column.metadata() for name, column in self._columns.items()
+            }
+        }
+        # replaces the previous metadata at once, so readers never see half of it
+        tmp_path = os.path.join(self.path, _METADATA_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(metadata, f)
+        os.replace(tmp_path, os.path.join(self.path, _METADATA_FILE))
+
+
+class TrajectoryDataset:
+    """Reads a dataset written by :class:`TrajectoryRecorder`.
+
+    The columns are opened as read-only memory maps, so only the data that's
+    actually accessed is read from the disk. Only the complete episodes are
+    visible.
+
+    Args:
+        path (str): The dataset's directory.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(os.path.join(path, _METADATA_FILE)) as f:
+            metadata = json.load(f)
+
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, column in metadata["columns"].items():
+            shape = (column["length"], *column["shape"])
+            if column["length"] == 0:
+                array = np.empty(shape, dtype=column["dtype"])
+            else:
+                array = np.memmap(
+                    os.path.join(path, column["file"]),
+                    dtype=column["dtype"],
+                    mode="r",
+                    shape=shape,
+                )
+            self.columns[name] = array
+        self.episodes = self.columns.pop("episodes")
+
+    @property
+    def num_episodes(self) -> int:
+        """Number of complete episodes."""
+        return len(self.episodes)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def episode(self, index: int) -> Dict[str, np.ndarray]:
+        """Returns the columns of an episode, as views of the memory maps.
+
+        Args:
+            index (int): The episode's index.
+
+        Returns:
+            A dictionary from the columns' names to the episode's rows. It
+            contains one more observation than steps.
+        """
+        start, num_steps = self.episodes[index].tolist()
+        steps = slice(start, start + num_steps)
+        # each previous episode has one extra observation
+        obs_start = start + (index % len(self.episodes))
+        observations = slice(obs_start, obs_start + num_steps + 1)
+
+        episode = {name: column[steps] for name, column in self.columns.items()}
+        episode["observations"] = self.columns["observations"][observations]
+        return episode
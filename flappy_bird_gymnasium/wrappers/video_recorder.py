@@ -0,0 +1,338 @@
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""Wrapper recording episodes into videos without keeping their frames.
+
+The frames are handed over to a background thread through a bounded queue, and
+encoded while the episode goes on, so recording neither grows with the length
+of the episodes nor blocks the environment's steps on the encoder.
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import threading
+from typing import Any, Callable, Dict, Optional, SupportsFloat, Tuple
+
+import gymnasium
+import numpy as np
+from gymnasium import logger
+from gymnasium.error import DependencyNotInstalled
+
+
+class _PngWriter:
+    """Writes the frames into a directory of numbered PNG images."""
+
+    extension = ""
+
+    def __init__(self, path: str, fps: float) -> None:
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+        self._num_frames = 0
+
+    def write(self, frame: np.ndarray) -> None:
+        from PIL import Image
+
+        Image.fromarray(frame).save(
+            os.path.join(self._path, f"{self._num_frames:06d}.png"), compress_level=1
+        )
+        self._num_frames += 1
+
+    def close(self) -> None:
+        pass
+
+
+class _GifWriter:
+    """Writes the frames into an animated GIF, one frame at a time."""
+
+    extension = ".gif"
+
+    def __init__(self, path: str, fps: float) -> None:
+        self._file = open(path, "wb")
+        self._duration = 1000 / fps
+        self._started = False
+
+    def write(self, frame: np.ndarray) -> None:
+        from PIL import GifImagePlugin, Image
+
+        image = Image.fromarray(frame).quantize(
+            256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE
+        )
+        if not self._started:
+            header, _ = GifImagePlugin.getheader(image, info={"loop": 0})
+            self._file.writelines(header)
+            self._started = True
+        # every frame has its own palette
+        self._file.writelines(
+            GifImagePlugin.getdata(
+                image, duration=self._duration, include_color_table=True
+            )
+        )
+
+    def close(self) -> None:
+        try:
+            self._file.write(b";")  # trailer
+        finally:
+            self._file.close()
+
+
+class _FfmpegWriter:
+    """Pipes the raw frames into a local `ffmpeg` binary, which encodes them."""
+
+    extension = ".mp4"
+
+    def __init__(self, path: str, fps: float) -> None:
+        self._path = path
+        self._fps = fps
+        self._process = None
+
+    def write(self, frame: np.ndarray) -> None:
+        if self._process is None:
+            height, width = frame.shape[:2]
+            self._process = subprocess.Popen(
+                [
+                    shutil.which("ffmpeg"),
+                    "-y",
+                    "-loglevel",
+                    "error",
+                    "-f",
+                    "rawvideo",
+                    "-pix_fmt",
+                    "rgb24",
+                    "-s",
+                    f"{width}x{height}",
+                    "-r",
+                    str(self._fps),
+                    "-i",
+                    "-",
+                    "-pix_fmt",
+                    "yuv420p",
+                    self._path,
+                ],
+                stdin=subprocess.PIPE,
+            )
+        self._process.stdin.write(np.ascontiguousarray(frame).data)
+
+    def close(self) -> None:
+        if self._process is not None:
+            try:
+                self._process.stdin.close()
+            except OSError:
+                # e.g. ffmpeg exited early and the pipe is broken
+                self._process.kill()
+            if self._process.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed to encode {self._path}")
+
+
+_WRITERS = {"png": _PngWriter, "gif": _GifWriter, "mp4": _FfmpegWriter}
+
+# tells the encoding thread that the current video is over
+_END_OF_VIDEO = object()
+
+
+class VideoRecorder(gymnasium.Wrapper):
+    """Records some of the episodes of an environment into videos.
+
+    The frames are rendered in `"rgb_array"` mode, copied and queued; a
+    background thread encodes them into one video per recorded episode, named
+    `"{name_prefix}-{episode_id}"`. If the encoder falls behind and the queue
+    is full, frames are dropped (and counted in :attr:`dropped_frames`)
+    rather than slowing the environment down, unless `block` is `True`.
+
+    Args:
+        env (gymnasium.Env): The environment, created with
+            `render_mode="rgb_array"` (and preferably `copy_frames=False`,
+            since the recorder copies the frames anyway).
+        video_folder (str): Directory the videos are written to.
+        video_format (str): `"png"` (a directory of images per episode),
+            `"gif"` or `"mp4"` (encoded by a local `ffmpeg` binary).
+        every_n_episodes (int): Records one episode out of `every_n_episodes`,
+            starting with the first one.
+        episode_trigger (Optional[Callable[[int], bool]]): If set, decides
+            which episodes are recorded from their index, instead of
+            `every_n_episodes`.
+        frame_skip (int): Records one frame out of `frame_skip`.
+        fps (Optional[float]): Frame rate of the videos. Defaults to the
+            environment's frame rate divided by `frame_skip`.
+        queue_size (int): Number of frames waiting to be encoded, at most.
+        block (bool): If `True`, the environment waits for the encoder when
+            the queue is full, so no frame is dropped.
+        name_prefix (str): Prefix of the videos' names.
+    """
+
+    def __init__(
+        self,
+        env: gymnasium.Env,
+        video_folder: str,
+        video_format: str = "gif",
+        every_n_episodes: int = 1,
+        episode_trigger: Optional[Callable[[int], bool]] = None,
+        frame_skip: int = 1,
+        fps: Optional[float] = None,
+        queue_size: int = 64,
+        block: bool = False,
+        name_prefix: str = "episode",
+    ) -> None:
+        super().__init__(env)
+        if env.render_mode != "rgb_array":
+            raise ValueError(
+                "VideoRecorder requires render_mode='rgb_array', "
+                f"got render_mode={env.render_mode!r}."
+            )
+        if video_format not in _WRITERS:
+            raise ValueError(
+                f"Unsupported video format {video_format!r}, expected one of "
+                f"{list(_WRITERS)}."
+            )
+        if video_format == "mp4" and shutil.which("ffmpeg") is None:
+            raise DependencyNotInstalled(
+                "The ffmpeg binary is required to record mp4 videos."
+            )
+
+        os.makedirs(video_folder, exist_ok=True)
+        self.video_folder = video_folder
+        self._writer = _WRITERS[video_format]
+        self._episode_trigger = episode_trigger or (
+            lambda episode_id: episode_id % every_n_episodes == 0
+        )
+        self._frame_skip = frame_skip
+        self._fps = (
+            fps if fps is not None else env.metadata.get("render_fps", 30) / frame_skip
+        )
+        self._block = block
+        self._name_prefix = name_prefix
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+        self.episode_id = -1
+        self.recording = False
+        self.dropped_frames = 0
+        self._step_id = 0
+
+    def reset(
+        self, *, seed: Optional[int] = None, options: Optional[Dict] = None
+    ) -> Tuple[Any, Dict]:
+        """Resets the environment, and starts recording if the new episode
+        is selected."""
+        obs, info = super().reset(seed=seed, options=options)
+        self._stop_recording()
+
+        self.episode_id += 1
+        if self._episode_trigger(self.episode_id):
+            self._start_recording()
+        return obs, info
+
+    def step(self, action: Any) -> Tuple[Any, SupportsFloat, bool, bool, Dict]:
+        """Steps the environment, and records its frame if needed."""
+        result = super().step(action)
+        if self.recording:
+            self._step_id += 1
+            if self._step_id % self._frame_skip == 0:
+                self._capture_frame()
+        return result
+
+    def close(self) -> None:
+        """Finishes encoding the recorded videos, then closes the
+        environment."""
+        self._stop_recording()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        super().close()
+        self._raise_error()
+
+    def _start_recording(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._encode, daemon=True)
+            self._thread.start()
+
+        path = os.path.join(
+            self.video_folder,
+            f"{self._name_prefix}-{self.episode_id}{self._writer.extension}",
+        )
+        self._put(path, block=True)
+        self.recording = True
+        self._step_id = 0
+        self._capture_frame()
+
+    def _stop_recording(self) -> None:
+        if self.recording:
+            self._put(_END_OF_VIDEO, block=True)
+            self.recording = False
+
+    def _capture_frame(self) -> None:
+        # the frame may be a buffer the environment overwrites
+        self._put(np.array(self.env.render()), block=self._block)
+
+    def _put(self, item: Any, block: bool) -> None:
+        self._raise_error()
+        if block:
+            self._queue.put(item)
+        else:
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self.dropped_frames += 1
+                if self.dropped_frames == 1:
+                    logger.warn(
+                        "The video encoder can't keep up, frames are being "
+                        "dropped. Increase `queue_size` or pass `block=True` "
+                        "to keep them all."
+                    )
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Encoding a video failed.") from error
+
+    def _encode(self) -> None:
+        """Encodes the queued frames, until `None` is queued."""
+        writer = None
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            try:
+                if isinstance(item, str):
+                    writer = self._writer(item, self._fps)
+                elif writer is None:
+                    continue  # the rest of a video that failed
+                elif item is _END_OF_VIDEO:
+                    writer.close()
+                    writer = None
+                else:
+                    writer.write(item)
+            except Exception as error:
+                self._error = error
+                if writer is not None:
+                    # release the writer's file or ffmpeg process
+                    try:
+                        writer.close()
+                    except Exception:
+                        pass
+                writer = None
@@ -38,7 +38,7 @@ short_description = "A Gymnasium environment for the Flappy Bird game."
 # The compatible release operator (`~=`) is used to match any candidate version
 # that is expected to be compatible with the specified version.
 REQUIRED_PACKAGES = [
-    "gymnasium",
+    "gymnasium>=1.1",
     "numpy",
     "pygame",
     "matplotlib",